@@ -1,11 +1,28 @@
 import tracemalloc
 from others.performance import PerformanceCP
+from others.utils import as_instance
+from others.presolve import presolve_windows
+from others.heuristic import greedy_schedule, schedule_hints
+from others.pairs import min_separation, pair_separations
+from others.scaling import scale_objective, set_objective_scaling
 from ortools.sat.python import cp_model
 import psutil, time
+import numpy as np
+
+def _occupancy_covers(occupancy, i, S_ij):
+    # NoOverlap enforces x_j >= x_i + occupancy[i] once i lands first; zero-length
+    # intervals are left to the explicit constraints
+    return 0 < occupancy[i] and S_ij <= occupancy[i]
+
+def _as_var_list(variables):
+    # Pairwise variables are stored sparsely in dicts keyed by (i, j)
+    if isinstance(variables, dict):
+        return list(variables.values())
+    return variables
 
 # Single Runway
 # Model
-def create_cp_model_single_runway(num_planes, planes_data, separation_times):
+def create_cp_model_single_runway(num_planes, planes_data, separation_times, presolve=True):
     print("=" * 60)
     print("\t\t     Creating CP model")
     print("=" * 60, "\n")
@@ -14,17 +31,24 @@ def create_cp_model_single_runway(num_planes, planes_data, separation_times):
     model = cp_model.CpModel()
 
     # 1) EXTRACT RELEVANT DATA INTO ARRAYS (for convenience)
-    E = [p["earliest_landing_time"] for p in planes_data]  # Earliest landing times
-    T = [p["target_landing_time"]   for p in planes_data]  # Target landing times
-    L = [p["latest_landing_time"]   for p in planes_data]  # Latest landing times
-    cost_e = [p["penalty_early"]    for p in planes_data]  # Penalty for early_deviation
-    cost_l = [p["penalty_late"]     for p in planes_data]  # Penalty for late_deviation
+    instance = as_instance(planes_data, separation_times)
+    E = instance.earliest.tolist()           # Earliest landing times
+    T = instance.target.tolist()             # Target landing times
+    L = instance.latest.tolist()             # Latest landing times
+    scale = scale_objective(instance)        # Penalties as exact integers
+    cost_e = scale.penalty_early.tolist()    # Penalty for early_deviation
+    cost_l = scale.penalty_late.tolist()     # Penalty for late_deviation
+
+    # Tighten [E, L] along the mandatory precedence chains before building domains
+    windows = presolve_windows(instance, tighten=presolve)
+    E = windows.earliest.tolist()
+    L = windows.latest.tolist()
 
     # 2) VARIABLE CREATION
 
     # 'xi' is the time plane i actually lands
     landing_time = [
-        model.NewIntVar(0, 10_000_000, f"landing_time_{i}")
+        model.NewIntVar(E[i], L[i], f"landing_time_{i}")
         for i in range(num_planes)
     ]
 
@@ -44,65 +68,34 @@ def create_cp_model_single_runway(num_planes, planes_data, separation_times):
             f"late_deviation_{i}")
         for i in range(num_planes)]
 
-    # Boolean variables: before_ij = True if plane i lands before plane j (i < j).
-    # We'll store these in a 2D list for convenience.
-    before_ij = []
-    for i in range(num_planes):
-        row = []
-        for j in range(num_planes):
-            if j > i:
-                # Only define it for j > i to avoid duplication
-                row.append(model.NewBoolVar(f"before_ij_{i}_{j}"))
-            else:
-                # For j <= i, we can store None (or a dummy variable)
-                row.append(None)
-        before_ij.append(row)
-
     # 3) SETS U, V, W
     # Sets U, V, W
-    W, U, V = [], [], []
-    for i in range(num_planes):
-        for j in range(num_planes):
-            if i != j:
-                E_i, L_i = planes_data[i]['earliest_landing_time'], planes_data[i]['latest_landing_time']
-                E_j, L_j = planes_data[j]['earliest_landing_time'], planes_data[j]['latest_landing_time']
-                S_ij = separation_times[i][j]
+    pairs = windows.pairs
+    V = pairs.V.tolist()
+    U = pairs.U.tolist()
+    S_V = pair_separations(instance.separation, pairs.V)
+    S_U = pair_separations(instance.separation, pairs.U)
+    S_U_reverse = pair_separations(instance.separation, pairs.U[:, ::-1])
 
-                if L_i < E_j and L_i + S_ij <= E_j:
-                    W.append((i, j))
-                elif L_i < E_j and L_i + S_ij > E_j:
-                    V.append((i, j))
-                elif (E_j <= E_i <= L_j) or (E_j <= L_i <= L_j) or (E_i <= E_j <= L_i) or (E_i <= L_j <= L_i):
-                    U.append((i, j))
+    # Boolean variables: before_ij[(i, j)] = True if plane i lands before plane j.
+    # Only U pairs (i < j) have an open order; W and V pairs are fixed i -> j.
+    before_ij = {(i, j): model.NewBoolVar(f"before_ij_{i}_{j}") for i, j in U}
 
 
     # 4) CONSTRAINTS
+    # Landing time within [earliest, latest] is enforced by the variable domains
     for i in range(num_planes):
-        # Landing time must be within [earliest, latest]
-        model.Add(landing_time[i] >= E[i])
-        model.Add(landing_time[i] <= L[i])
-
         # Define early_deviation and late_deviation
         model.Add(early_deviation[i] >= T[i] - landing_time[i])
         model.Add(late_deviation[i] >= landing_time[i] - T[i])
 
-    for i in range(num_planes):
-        for j in range(num_planes):
-            if j > i:
-                before_ij_var = before_ij[i][j]
-                before_ji_var = before_ij_var.Not()
-
-    for i,j in V:
-        S_ij = separation_times[i][j]
+    for (i, j), S_ij in zip(V, S_V):
         model.Add(landing_time[j] >= landing_time[i] + S_ij)
 
-    for i,j in U:
-        if i < j:
-            S_ij = separation_times[i][j]
-            S_ji = separation_times[j][i]
-            before_ij_var = before_ij[i][j]
-            model.Add(landing_time[j] >= landing_time[i] + S_ij).OnlyEnforceIf(before_ij_var)
-            model.Add(landing_time[i] >= landing_time[j] + S_ji).OnlyEnforceIf(before_ij_var.Not())
+    for (i, j), S_ij, S_ji in zip(U, S_U, S_U_reverse):
+        before_ij_var = before_ij[(i, j)]
+        model.Add(landing_time[j] >= landing_time[i] + S_ij).OnlyEnforceIf(before_ij_var)
+        model.Add(landing_time[i] >= landing_time[j] + S_ji).OnlyEnforceIf(before_ij_var.Not())
 
     # 5) OBJECTIVE FUNCTION
     cost_terms = []
@@ -111,6 +104,8 @@ def create_cp_model_single_runway(num_planes, planes_data, separation_times):
         cost_terms.append(cost_l[i] * late_deviation[i])
 
     model.Minimize(sum(cost_terms))
+    # Report the objective in the original (fractional) penalty units
+    set_objective_scaling(model, scale)
 
     # 6) RETURN MODEL AND VARIABLES
     variables = {
@@ -122,18 +117,124 @@ def create_cp_model_single_runway(num_planes, planes_data, separation_times):
 
     return model, variables
 
+# Model (interval formulation)
+# Each plane occupies the runway for an interval of length min_j S_ij, so a
+# single NoOverlap already separates every pair whose separation equals that
+# minimum. Only the pairs with a larger separation keep a precedence literal.
+def create_cp_model_single_runway_interval(num_planes, planes_data, separation_times, presolve=True):
+    print("=" * 60)
+    print("\t\t     Creating CP model (intervals)")
+    print("=" * 60, "\n")
+
+    # Create the CP-SAT model
+    model = cp_model.CpModel()
+
+    # 1) EXTRACT RELEVANT DATA INTO ARRAYS (for convenience)
+    instance = as_instance(planes_data, separation_times)
+    T = instance.target.tolist()             # Target landing times
+    scale = scale_objective(instance)        # Penalties as exact integers
+    cost_e = scale.penalty_early.tolist()    # Penalty for early_deviation
+    cost_l = scale.penalty_late.tolist()     # Penalty for late_deviation
+    occupancy = min_separation(instance).tolist()
+
+    windows = presolve_windows(instance, tighten=presolve)
+    E = windows.earliest.tolist()
+    L = windows.latest.tolist()
+
+    # 2) VARIABLE CREATION
+    landing_time = [
+        model.NewIntVar(E[i], L[i], f"landing_time_{i}")
+        for i in range(num_planes)
+    ]
+
+    early_deviation = [
+        model.NewIntVar(0, max(T[i] - E[i], 0), f"early_deviation_{i}")
+        for i in range(num_planes)]
+
+    late_deviation = [
+        model.NewIntVar(0, max(L[i] - T[i], 0), f"late_deviation_{i}")
+        for i in range(num_planes)]
+
+    # Runway occupancy of plane i: [x_i, x_i + min_j S_ij)
+    occupation = [
+        model.NewFixedSizeIntervalVar(landing_time[i], occupancy[i], f"occupation_{i}")
+        for i in range(num_planes)
+    ]
+
+    # 3) SETS U, V, W
+    pairs = windows.pairs
+    V = pairs.V.tolist()
+    U = pairs.U.tolist()
+    S_V = pair_separations(instance.separation, pairs.V)
+    S_U = pair_separations(instance.separation, pairs.U)
+    S_U_reverse = pair_separations(instance.separation, pairs.U[:, ::-1])
+
+    # 4) CONSTRAINTS
+    model.AddNoOverlap(occupation)
+
+    for i in range(num_planes):
+        model.Add(early_deviation[i] >= T[i] - landing_time[i])
+        model.Add(late_deviation[i] >= landing_time[i] - T[i])
+
+    # V pairs land i -> j, so NoOverlap covers S_ij unless it exceeds the occupancy
+    for (i, j), S_ij in zip(V, S_V):
+        if not _occupancy_covers(occupancy, i, S_ij):
+            model.Add(landing_time[j] >= landing_time[i] + S_ij)
+
+    # U pairs only need an explicit order when NoOverlap is too weak in some direction
+    before_ij = {}
+    for (i, j), S_ij, S_ji in zip(U, S_U, S_U_reverse):
+        if _occupancy_covers(occupancy, i, S_ij) and _occupancy_covers(occupancy, j, S_ji):
+            continue
+        before_ij_var = model.NewBoolVar(f"before_ij_{i}_{j}")
+        before_ij[(i, j)] = before_ij_var
+        model.Add(landing_time[j] >= landing_time[i] + S_ij).OnlyEnforceIf(before_ij_var)
+        model.Add(landing_time[i] >= landing_time[j] + S_ji).OnlyEnforceIf(before_ij_var.Not())
+
+    # 5) OBJECTIVE FUNCTION
+    cost_terms = []
+    for i in range(num_planes):
+        cost_terms.append(cost_e[i] * early_deviation[i])
+        cost_terms.append(cost_l[i] * late_deviation[i])
+
+    model.Minimize(sum(cost_terms))
+    # Report the objective in the original (fractional) penalty units
+    set_objective_scaling(model, scale)
+
+    # 6) RETURN MODEL AND VARIABLES
+    variables = {
+        "landing_time": landing_time,
+        "early_deviation": early_deviation,
+        "late_deviation": late_deviation,
+        "before_ij": before_ij,
+        "occupation": occupation
+    }
+
+    return model, variables
+
 # Solver
 def solve_single_runway_cp(num_planes, planes_data, separation_times,
                            decision_strategies=None, hint=False,
-                           search_strategy=cp_model.AUTOMATIC_SEARCH, performance = False):
-    """Builds and solves the single-runway CP model with a permutation approach."""
-    model, vars_ = create_cp_model_single_runway(
-        num_planes, planes_data, separation_times
+                           search_strategy=cp_model.AUTOMATIC_SEARCH, performance = False, presolve=True,
+                           formulation="pairwise"):
+    """Builds and solves the single-runway CP model with a permutation approach.
+    formulation="interval" uses the NoOverlap model instead of the pairwise one."""
+    if formulation not in CP_FORMULATIONS:
+        raise ValueError(f"Unknown formulation '{formulation}', expected one of {list(CP_FORMULATIONS)}.")
+    instance = as_instance(planes_data, separation_times)
+    planes_data = instance.planes
+    create_model = CP_FORMULATIONS[formulation][0]
+    model, vars_ = create_model(
+        num_planes, instance, None, presolve=presolve
     )
 
     if hint:
-        for i in range(num_planes):
-            model.AddHint(vars_["landing_time"][i], planes_data[i]["target_landing_time"])
+        # Complete warm start (and upper bound) from the constructive heuristic
+        schedule = greedy_schedule(instance)
+        if schedule is not None:
+            for var, value in schedule_hints(vars_, instance, schedule[0], schedule[1]):
+                model.AddHint(var, value)
+            print(f"-> Heuristic upper bound: {schedule[2]:.2f}")
 
     # Create solver instance
     solver = cp_model.CpSolver()
@@ -150,11 +251,11 @@ def solve_single_runway_cp(num_planes, planes_data, separation_times,
         for strategy in decision_strategies:
             var_names = strategy["variables"]
             if isinstance(var_names, str):
-                var_list = vars_.get(var_names, [])
+                var_list = _as_var_list(vars_.get(var_names, []))
             elif isinstance(var_names, list):
                 var_list = []
                 for var_name in var_names:
-                    var_list.extend(vars_.get(var_name, []))
+                    var_list.extend(_as_var_list(vars_.get(var_name, [])))
             else:
                 raise ValueError("The 'variables' field must be a string or list of strings.")
 
@@ -280,7 +381,7 @@ def solve_single_runway_cp(num_planes, planes_data, separation_times,
 
 # Multiples Runways
 # Model
-def create_cp_model_multiple_runway(num_planes, num_runways, planes_data, separation_times, separation_times_between_runways):
+def create_cp_model_multiple_runway(num_planes, num_runways, planes_data, separation_times, separation_times_between_runways, presolve=True):
     print("=" * 60)
     print("\t\t     Creating CP model")
     print("=" * 60, "\n")
@@ -289,17 +390,25 @@ def create_cp_model_multiple_runway(num_planes, num_runways, planes_data, separa
     model = cp_model.CpModel()
 
     # 1) EXTRACT RELEVANT DATA INTO ARRAYS (for convenience)
-    E = [p["earliest_landing_time"] for p in planes_data]  # Earliest landing times
-    T = [p["target_landing_time"]   for p in planes_data]  # Target landing times
-    L = [p["latest_landing_time"]   for p in planes_data]  # Latest landing times
-    cost_e = [p["penalty_early"]    for p in planes_data]  # Penalty for early_deviation
-    cost_l = [p["penalty_late"]     for p in planes_data]  # Penalty for late_deviation
+    instance = as_instance(planes_data, separation_times)
+    E = instance.earliest.tolist()           # Earliest landing times
+    T = instance.target.tolist()             # Target landing times
+    L = instance.latest.tolist()             # Latest landing times
+    scale = scale_objective(instance)        # Penalties as exact integers
+    cost_e = scale.penalty_early.tolist()    # Penalty for early_deviation
+    cost_l = scale.penalty_late.tolist()     # Penalty for late_deviation
+    separation_times_between_runways = np.asarray(separation_times_between_runways, dtype=np.int32)
+
+    # Tighten [E, L] along the mandatory precedence chains before building domains
+    windows = presolve_windows(instance, separation_times_between_runways, tighten=presolve)
+    E = windows.earliest.tolist()
+    L = windows.latest.tolist()
 
     # 2) VARIABLE CREATION
 
     # 'xi' is the time plane i actually lands
     landing_time = [
-        model.NewIntVar(0, 10_000_000, f"landing_time_{i}")
+        model.NewIntVar(E[i], L[i], f"landing_time_{i}")
         for i in range(num_planes)
     ]
 
@@ -319,110 +428,218 @@ def create_cp_model_multiple_runway(num_planes, num_runways, planes_data, separa
             f"late_deviation_{i}")
         for i in range(num_planes)]
 
-    # Boolean variables: before_ij = True if plane i lands before plane j (i < j).
-    # We'll store these in a 2D list for convenience.
-    before_ij = []
-    for i in range(num_planes):
-        row = []
-        for j in range(num_planes):
-            if j > i:
-                # Only define it for j > i to avoid duplication
-                row.append(model.NewBoolVar(f"before_ij_{i}_{j}"))
-            else:
-                # For j <= i, we can store None (or a dummy variable)
-                row.append(None)
-        before_ij.append(row)
-
     # 'runway[i]' is the index of the runway on which plane i lands
     runway_i = [model.NewIntVar(0, num_runways - 1, f"runway_{i}") for i in range(num_planes)]
 
     # 3) SETS U, V, W
     # Sets U, V, W
-    W, U, V = [], [], []
-    for i in range(num_planes):
-        for j in range(num_planes):
-            if i != j:
-                E_i, L_i = planes_data[i]['earliest_landing_time'], planes_data[i]['latest_landing_time']
-                E_j, L_j = planes_data[j]['earliest_landing_time'], planes_data[j]['latest_landing_time']
-                S_ij = separation_times[i][j]
+    pairs = windows.pairs
+    V = pairs.V.tolist()
+    U = pairs.U.tolist()
+    S_V = pair_separations(instance.separation, pairs.V)
+    S_U = pair_separations(instance.separation, pairs.U)
+    S_U_reverse = pair_separations(instance.separation, pairs.U[:, ::-1])
+    s_V = pair_separations(separation_times_between_runways, pairs.V)
+    s_U = pair_separations(separation_times_between_runways, pairs.U)
+    s_U_reverse = pair_separations(separation_times_between_runways, pairs.U[:, ::-1])
 
-                if L_i < E_j and L_i + S_ij <= E_j:
-                    W.append((i, j))
-                elif L_i < E_j and L_i + S_ij > E_j:
-                    V.append((i, j))
-                elif (E_j <= E_i <= L_j) or (E_j <= L_i <= L_j) or (E_i <= E_j <= L_i) or (E_i <= L_j <= L_i):
-                    U.append((i, j))
+    # Boolean variables: before_ij[(i, j)] = True if plane i lands before plane j.
+    # Only U pairs (i < j) have an open order; W and V pairs are fixed i -> j.
+    before_ij = {(i, j): model.NewBoolVar(f"before_ij_{i}_{j}") for i, j in U}
 
 
     # 4) CONSTRAINTS
+    # Landing time within [earliest, latest] is enforced by the variable domains
     for i in range(num_planes):
-        # Landing time must be within [earliest, latest]
-        model.Add(landing_time[i] >= E[i])
-        model.Add(landing_time[i] <= L[i])
-
         # Define early_deviation and late_deviation
         model.Add(early_deviation[i] >= T[i] - landing_time[i])
         model.Add(late_deviation[i] >= landing_time[i] - T[i])
         model.Add(landing_time[i] == T[i] - early_deviation[i] + late_deviation[i])
 
-    for i in range(num_planes):
-        for j in range(num_planes):
-            if j > i:
-                before_ij_var = before_ij[i][j]
-                before_ji_var = before_ij_var.Not()
-
-    # Reified equality: same_runway[i][j] <-> (runway_i[i] == runway_i[j])
-    # Only for i < j
-    same_runway = [[None] * num_planes for _ in range(num_planes)]
-    for i in range(num_planes):
-        for j in range(i + 1, num_planes):
-            b = model.NewBoolVar(f"same_runway_{i}_{j}")
-            same_runway[i][j] = b
+    # Reified equality: same_runway[(i, j)] <-> (runway_i[i] == runway_i[j])
+    # Only for i < j, and only for pairs that carry a separation constraint (U and V)
+    same_runway = {}
+    for i, j in U + [sorted(p) for p in V]:
+        if (i, j) in same_runway:
+            continue
+        b = model.NewBoolVar(f"same_runway_{i}_{j}")
+        same_runway[(i, j)] = b
 
-            # b => runway_i[i] == runway_i[j]
-            model.Add(runway_i[i] == runway_i[j]).OnlyEnforceIf(b)
-            # not b => runway_i[i] != runway_i[j]
-            model.Add(runway_i[i] != runway_i[j]).OnlyEnforceIf(b.Not())
+        # b => runway_i[i] == runway_i[j]
+        model.Add(runway_i[i] == runway_i[j]).OnlyEnforceIf(b)
+        # not b => runway_i[i] != runway_i[j]
+        model.Add(runway_i[i] != runway_i[j]).OnlyEnforceIf(b.Not())
 
     def get_same_runway_bool(i, j):
         # returns BoolVar representing (runway_i[i] == runway_i[j])
         if i < j:
-            return same_runway[i][j]
+            return same_runway[(i, j)]
         else:
-            return same_runway[j][i]
+            return same_runway[(j, i)]
 
     # V constraints
-    for i, j in V:
-        S_ij = separation_times[i][j]
-        s_ij = separation_times_between_runways[i][j]
-
+    for (i, j), S_ij, s_ij in zip(V, S_V, s_V):
         b_same = get_same_runway_bool(i, j)
 
         model.Add(landing_time[j] >= landing_time[i] + S_ij).OnlyEnforceIf(b_same)
         model.Add(landing_time[j] >= landing_time[i] + s_ij).OnlyEnforceIf(b_same.Not())
 
     # U constraints
-    for i, j in U:
-        if i < j:
-            S_ij = separation_times[i][j]
-            S_ji = separation_times[j][i]
-            s_ij = separation_times_between_runways[i][j]
-            s_ji = separation_times_between_runways[j][i]
+    for (i, j), S_ij, S_ji, s_ij, s_ji in zip(U, S_U, S_U_reverse, s_U, s_U_reverse):
+        before_ij_var = before_ij[(i, j)]
+        before_ji_var = before_ij_var.Not()
 
-            before_ij_var = before_ij[i][j]
-            before_ji_var = before_ij_var.Not()
+        b_same = get_same_runway_bool(i, j)
 
-            b_same = get_same_runway_bool(i, j)
+        # i before j
+        model.Add(landing_time[j] >= landing_time[i] + S_ij).OnlyEnforceIf([before_ij_var, b_same])
+        model.Add(landing_time[j] >= landing_time[i] + s_ij).OnlyEnforceIf([before_ij_var, b_same.Not()])
 
-            # i before j
-            model.Add(landing_time[j] >= landing_time[i] + S_ij).OnlyEnforceIf([before_ij_var, b_same])
-            model.Add(landing_time[j] >= landing_time[i] + s_ij).OnlyEnforceIf([before_ij_var, b_same.Not()])
+        # j before i
+        model.Add(landing_time[i] >= landing_time[j] + S_ji).OnlyEnforceIf([before_ji_var, b_same])
+        model.Add(landing_time[i] >= landing_time[j] + s_ji).OnlyEnforceIf([before_ji_var, b_same.Not()])
+
+
+    # 5) OBJECTIVE FUNCTION
+    cost_terms = []
+    for i in range(num_planes):
+        cost_terms.append(cost_e[i] * early_deviation[i])
+        cost_terms.append(cost_l[i] * late_deviation[i])
+
+    model.Minimize(sum(cost_terms))
+    # Report the objective in the original (fractional) penalty units
+    set_objective_scaling(model, scale)
+
+    # 6) RETURN MODEL AND VARIABLES
+    variables = {
+        "landing_time": landing_time,
+        "early_deviation": early_deviation,
+        "late_deviation": late_deviation,
+        "before_ij": before_ij,
+        "runway_i": runway_i,
+        "same_runway": same_runway
+    }
+
+    return model, variables
+
+# Model (interval formulation)
+# One optional interval per (plane, runway); exactly one of them is present and
+# the intervals on each runway may not overlap. same_runway/before_ij literals
+# are only created for pairs the NoOverlap cannot separate on its own: a
+# same-runway separation above the occupancy or a positive between-runway one.
+def create_cp_model_multiple_runway_interval(num_planes, num_runways, planes_data, separation_times, separation_times_between_runways, presolve=True):
+    print("=" * 60)
+    print("\t\t     Creating CP model (intervals)")
+    print("=" * 60, "\n")
+
+    # Create the CP-SAT model
+    model = cp_model.CpModel()
+
+    # 1) EXTRACT RELEVANT DATA INTO ARRAYS (for convenience)
+    instance = as_instance(planes_data, separation_times)
+    T = instance.target.tolist()             # Target landing times
+    scale = scale_objective(instance)        # Penalties as exact integers
+    cost_e = scale.penalty_early.tolist()    # Penalty for early_deviation
+    cost_l = scale.penalty_late.tolist()     # Penalty for late_deviation
+    separation_times_between_runways = np.asarray(separation_times_between_runways, dtype=np.int32)
+    occupancy = min_separation(instance).tolist()
+
+    windows = presolve_windows(instance, separation_times_between_runways, tighten=presolve)
+    E = windows.earliest.tolist()
+    L = windows.latest.tolist()
+
+    # 2) VARIABLE CREATION
+    landing_time = [
+        model.NewIntVar(E[i], L[i], f"landing_time_{i}")
+        for i in range(num_planes)
+    ]
+
+    early_deviation = [
+        model.NewIntVar(0, max(T[i] - E[i], 0), f"early_deviation_{i}")
+        for i in range(num_planes)]
+
+    late_deviation = [
+        model.NewIntVar(0, max(L[i] - T[i], 0), f"late_deviation_{i}")
+        for i in range(num_planes)]
+
+    runway_i = [model.NewIntVar(0, num_runways - 1, f"runway_{i}") for i in range(num_planes)]
+
+    # 'landing_runway[(i, r)]' is True if plane i lands on runway r
+    landing_runway = {
+        (i, r): model.NewBoolVar(f"landing_runway_{i}_{r}")
+        for i in range(num_planes) for r in range(num_runways)
+    }
+
+    occupation = {
+        (i, r): model.NewOptionalFixedSizeIntervalVar(
+            landing_time[i], occupancy[i], landing_runway[(i, r)], f"occupation_{i}_{r}")
+        for i in range(num_planes) for r in range(num_runways)
+    }
+
+    # 3) SETS U, V, W
+    pairs = windows.pairs
+    V = pairs.V.tolist()
+    U = pairs.U.tolist()
+    S_V = pair_separations(instance.separation, pairs.V)
+    S_U = pair_separations(instance.separation, pairs.U)
+    S_U_reverse = pair_separations(instance.separation, pairs.U[:, ::-1])
+    s_V = pair_separations(separation_times_between_runways, pairs.V)
+    s_U = pair_separations(separation_times_between_runways, pairs.U)
+    s_U_reverse = pair_separations(separation_times_between_runways, pairs.U[:, ::-1])
+
+    # 4) CONSTRAINTS
+    for i in range(num_planes):
+        model.AddExactlyOne(landing_runway[(i, r)] for r in range(num_runways))
+        model.Add(runway_i[i] == sum(r * landing_runway[(i, r)] for r in range(num_runways)))
+        model.Add(early_deviation[i] >= T[i] - landing_time[i])
+        model.Add(late_deviation[i] >= landing_time[i] - T[i])
 
-            # j before i
+    for r in range(num_runways):
+        model.AddNoOverlap(occupation[(i, r)] for i in range(num_planes))
+
+    same_runway = {}
+
+    def get_same_runway_bool(i, j):
+        key = (min(i, j), max(i, j))
+        if key not in same_runway:
+            b = model.NewBoolVar(f"same_runway_{key[0]}_{key[1]}")
+            same_runway[key] = b
+            model.Add(runway_i[i] == runway_i[j]).OnlyEnforceIf(b)
+            model.Add(runway_i[i] != runway_i[j]).OnlyEnforceIf(b.Not())
+        return same_runway[key]
+
+    # V constraints
+    for (i, j), S_ij, s_ij in zip(V, S_V, s_V):
+        covered = _occupancy_covers(occupancy, i, S_ij)
+        if covered and s_ij <= 0:
+            continue
+
+        b_same = get_same_runway_bool(i, j)
+        if not covered:
+            model.Add(landing_time[j] >= landing_time[i] + S_ij).OnlyEnforceIf(b_same)
+        if s_ij > 0:
+            model.Add(landing_time[j] >= landing_time[i] + s_ij).OnlyEnforceIf(b_same.Not())
+
+    # U constraints
+    before_ij = {}
+    for (i, j), S_ij, S_ji, s_ij, s_ji in zip(U, S_U, S_U_reverse, s_U, s_U_reverse):
+        needs_same = not (_occupancy_covers(occupancy, i, S_ij) and _occupancy_covers(occupancy, j, S_ji))
+        needs_between = s_ij > 0 or s_ji > 0
+        if not needs_same and not needs_between:
+            continue
+
+        before_ij_var = model.NewBoolVar(f"before_ij_{i}_{j}")
+        before_ij[(i, j)] = before_ij_var
+        before_ji_var = before_ij_var.Not()
+        b_same = get_same_runway_bool(i, j)
+
+        if needs_same:
+            model.Add(landing_time[j] >= landing_time[i] + S_ij).OnlyEnforceIf([before_ij_var, b_same])
             model.Add(landing_time[i] >= landing_time[j] + S_ji).OnlyEnforceIf([before_ji_var, b_same])
+        if needs_between:
+            model.Add(landing_time[j] >= landing_time[i] + s_ij).OnlyEnforceIf([before_ij_var, b_same.Not()])
             model.Add(landing_time[i] >= landing_time[j] + s_ji).OnlyEnforceIf([before_ji_var, b_same.Not()])
 
-
     # 5) OBJECTIVE FUNCTION
     cost_terms = []
     for i in range(num_planes):
@@ -430,6 +647,8 @@ def create_cp_model_multiple_runway(num_planes, num_runways, planes_data, separa
         cost_terms.append(cost_l[i] * late_deviation[i])
 
     model.Minimize(sum(cost_terms))
+    # Report the objective in the original (fractional) penalty units
+    set_objective_scaling(model, scale)
 
     # 6) RETURN MODEL AND VARIABLES
     variables = {
@@ -437,21 +656,41 @@ def create_cp_model_multiple_runway(num_planes, num_runways, planes_data, separa
         "early_deviation": early_deviation,
         "late_deviation": late_deviation,
         "before_ij": before_ij,
-        "runway_i": runway_i
+        "runway_i": runway_i,
+        "landing_runway": landing_runway,
+        "same_runway": same_runway,
+        "occupation": occupation
     }
 
     return model, variables
 
+# Builders per formulation: (single runway, multiple runways)
+CP_FORMULATIONS = {
+    "pairwise": (create_cp_model_single_runway, create_cp_model_multiple_runway),
+    "interval": (create_cp_model_single_runway_interval, create_cp_model_multiple_runway_interval),
+}
+
 # Solver
-def solve_multiple_runways_cp(num_planes, num_runways, planes_data, separation_times, separation_times_between_runways, decision_strategies=None, hint=False, search_strategy=cp_model.AUTOMATIC_SEARCH, performance = False):
-    """Builds and solves the multiple-runway CP model with a permutation approach."""
-    model, vars_ = create_cp_model_multiple_runway(
-        num_planes, num_runways, planes_data, separation_times, separation_times_between_runways
+def solve_multiple_runways_cp(num_planes, num_runways, planes_data, separation_times, separation_times_between_runways, decision_strategies=None, hint=False, search_strategy=cp_model.AUTOMATIC_SEARCH, performance = False, presolve=True, formulation="pairwise"):
+    """Builds and solves the multiple-runway CP model with a permutation approach.
+    formulation="interval" uses the NoOverlap model instead of the pairwise one."""
+    if formulation not in CP_FORMULATIONS:
+        raise ValueError(f"Unknown formulation '{formulation}', expected one of {list(CP_FORMULATIONS)}.")
+    instance = as_instance(planes_data, separation_times)
+    planes_data = instance.planes
+    create_model = CP_FORMULATIONS[formulation][1]
+    model, vars_ = create_model(
+        num_planes, num_runways, instance, None, separation_times_between_runways, presolve=presolve
     )
 
     if hint:
-        for i in range(num_planes):
-            model.AddHint(vars_["landing_time"][i], planes_data[i]["target_landing_time"])
+        # Complete warm start (and upper bound) from the constructive heuristic
+        schedule = greedy_schedule(instance, num_runways, separation_times_between_runways)
+        if schedule is not None:
+            for var, value in schedule_hints(vars_, instance, schedule[0], schedule[1],
+                                             separation_times_between_runways):
+                model.AddHint(var, value)
+            print(f"-> Heuristic upper bound: {schedule[2]:.2f}")
 
     # Create solver instance
     solver = cp_model.CpSolver()
@@ -468,11 +707,11 @@ def solve_multiple_runways_cp(num_planes, num_runways, planes_data, separation_t
         for strategy in decision_strategies:
             var_names = strategy["variables"]
             if isinstance(var_names, str):
-                var_list = vars_.get(var_names, [])
+                var_list = _as_var_list(vars_.get(var_names, []))
             elif isinstance(var_names, list):
                 var_list = []
                 for var_name in var_names:
-                    var_list.extend(vars_.get(var_name, []))
+                    var_list.extend(_as_var_list(vars_.get(var_name, [])))
             else:
                 raise ValueError("The 'variables' field must be a string or list of strings.")
 
@@ -0,0 +1,127 @@
+import contextlib
+import io
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, replace
+
+import numpy as np
+
+from models.Engines import check_engine_options, schedule_cost, solve_with_engine
+from others.components import conflict_components
+from others.utils import as_instance
+
+
+# Connected-component decomposition front-end
+# The V/U conflict graph is split into components (see others/components.py),
+# every component is solved by one of the three engines as an instance of its
+# own (presolved windows, all runways) in a process pool, and the schedules
+# are stitched back together. Costs add up because the components share no
+# binding separation.
+@dataclass
+class ComponentSolution:
+    planes: list        # plane indices in the full instance
+    status: str
+    cost: float
+    times: list         # landing times, aligned with planes
+    runways: list       # 0-based runways, aligned with planes
+    solve_time: float
+
+
+@dataclass
+class DecomposedSolution:
+    status: str
+    cost: float
+    times: list         # landing time of every plane (None if a component failed)
+    runways: list       # 0-based runway of every plane
+    components: list    # [ComponentSolution], in order of earliest time
+    wall_time: float
+
+
+def _solve_component(engine, instance, planes, num_runways, separation_between_runways, time_limit, presolve,
+                     search_workers, options):
+    # Runs in a worker process; the engines' own reports are silenced
+    start_time = time.time()
+    with contextlib.redirect_stdout(io.StringIO()):
+        status, times, runways = solve_with_engine(
+            engine, instance, num_runways, separation_between_runways, time_limit, presolve, search_workers, **options
+        )
+    cost = schedule_cost(instance, times) if times is not None else None
+    return ComponentSolution(planes=planes, status=status, cost=cost, times=times, runways=runways,
+                             solve_time=time.time() - start_time)
+
+
+def _solve_single_plane(instance, plane):
+    # A plane without conflicts lands as close to its target as its window allows
+    t = int(min(max(instance.target[0], instance.earliest[0]), instance.latest[0]))
+    return ComponentSolution(planes=[plane], status="OPTIMAL", cost=schedule_cost(instance, [t]),
+                             times=[t], runways=[0], solve_time=0.0)
+
+
+def solve_decomposed(num_planes, num_runways, planes_data, separation_times, separation_between_runways=None,
+                     engine="cp", time_limit=None, num_workers=None, presolve=True, **options):
+    """Solves every connected component of the conflict graph with the given
+    engine ("mip", "cp" or "hybrid"), in parallel processes, and stitches the
+    schedules. time_limit applies to each component (the Hybrid master for
+    "hybrid"); options go to the engine (see ENGINE_OPTIONS in Engines.py)."""
+    # Checked here too: single-plane components never reach the engine
+    check_engine_options(engine, options)
+
+    start_time = time.time()
+    instance = as_instance(planes_data, separation_times)
+    if separation_between_runways is not None:
+        separation_between_runways = np.asarray(separation_between_runways, dtype=np.int32)
+    elif num_runways > 1:
+        separation_between_runways = np.zeros((num_planes, num_planes), dtype=np.int32)
+    between = separation_between_runways if num_runways > 1 else None
+
+    components, windows = conflict_components(instance, between, presolve)
+    print(f"-> {len(components)} independent components (largest: {max((len(c) for c in components), default=0)} planes)")
+
+    # Every component keeps the presolved windows, which hold for every feasible
+    # schedule and keep its W pairs with the other components separated
+    tasks = []
+    solutions = {}
+    for k, planes in enumerate(components):
+        sub = replace(instance.subset(planes), earliest=windows.earliest[planes], latest=windows.latest[planes])
+        if len(planes) == 1:
+            solutions[k] = _solve_single_plane(sub, int(planes[0]))
+            continue
+        sub_between = None if between is None else between[np.ix_(planes, planes)]
+        tasks.append((k, sub, planes.tolist(), sub_between))
+
+    max_workers = min(len(tasks), num_workers or os.cpu_count() or 1)
+    # The cores are shared between the processes instead of every solver taking all of them
+    search_workers = max(1, (os.cpu_count() or 1) // max(max_workers, 1))
+    if max_workers > 1:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                k: executor.submit(_solve_component, engine, sub, planes, num_runways, sub_between,
+                                   time_limit, presolve, search_workers, options)
+                for k, sub, planes, sub_between in tasks
+            }
+            for k, future in futures.items():
+                solutions[k] = future.result()
+    else:
+        for k, sub, planes, sub_between in tasks:
+            solutions[k] = _solve_component(engine, sub, planes, num_runways, sub_between,
+                                            time_limit, presolve, search_workers, options)
+
+    solutions = [solutions[k] for k in range(len(components))]
+    failed = [sol for sol in solutions if sol.times is None]
+    if failed:
+        status, cost, times, runways = failed[0].status, None, None, None
+    else:
+        status = "OPTIMAL" if all(sol.status == "OPTIMAL" for sol in solutions) else "FEASIBLE"
+        times = [0.0] * num_planes
+        runways = [0] * num_planes
+        for sol in solutions:
+            for i, t, rw in zip(sol.planes, sol.times, sol.runways):
+                times[i], runways[i] = t, rw
+        cost = sum((sol.cost for sol in solutions), 0.0)
+
+    wall_time = time.time() - start_time
+    print(f"-> Status: {status} | Cost: {cost if cost is None else round(cost, 2)} | "
+          f"Wall time: {wall_time:.4f}s ({max_workers} processes)")
+    return DecomposedSolution(status=status, cost=cost, times=times, runways=runways,
+                              components=solutions, wall_time=wall_time)
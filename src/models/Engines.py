@@ -0,0 +1,209 @@
+import time
+from dataclasses import dataclass
+
+import numpy as np
+from ortools.linear_solver import pywraplp
+from ortools.sat.python import cp_model
+
+from others.heuristic import schedule_hints
+
+ENGINES = ("mip", "cp", "hybrid")
+
+# Options every engine accepts on top of the common arguments (big_m only
+# changes the multi-runway MIP; the Hybrid ones are solve_hybrid_lbbd's)
+ENGINE_OPTIONS = {
+    "mip": ("big_m",),
+    "cp": ("formulation", "search_strategy", "on_solution"),
+    "hybrid": ("max_iterations", "search_strategy", "subproblem", "warm_start", "cut_mode", "num_solutions",
+               "num_workers", "cache", "incumbent", "poll_incumbent"),
+}
+
+
+@dataclass
+class EngineSolution:
+    engine: str
+    status: str
+    cost: float
+    times: list         # landing time of every plane (None if no schedule was found)
+    runways: list       # 0-based runway of every plane
+    solve_time: float
+
+    @property
+    def schedule(self):
+        """(times, runways), as taken by hint and incumbent."""
+        return self.times, self.runways
+
+
+# Common entry point to the three engines
+# Front-ends (decomposition, online scheduling, ...) only need a schedule
+# back, so every engine is built, optionally constrained and warm-started,
+# solved, and read back as plain lists: (status, times, runways), runways
+# numbered from 0. fixed_runways maps planes to the runway they must keep;
+# hint is a previous (times, runways) schedule, written to every variable.
+# CP also takes search_strategy and on_solution(times, runways), called with
+# every improving solution; the Hybrid takes poll_incumbent(), returning a
+# better (times, runways) schedule or None, checked at every iteration.
+def _solve_mip(instance, num_runways, separation_between_runways, time_limit, presolve, search_workers,
+               fixed_runways, hint, options):
+    from models.MIP import create_mip_model_multiple_runways, create_mip_model_single_runway
+
+    n = instance.num_planes
+    if num_runways == 1:
+        solver, variables = create_mip_model_single_runway(n, instance, None, presolve=presolve)
+    else:
+        solver, variables = create_mip_model_multiple_runways(
+            n, instance, None, separation_between_runways, num_runways, presolve=presolve, **options
+        )
+    if time_limit is not None:
+        solver.SetTimeLimit(int(time_limit * 1000))
+    if search_workers is not None:
+        solver.SetNumThreads(search_workers)
+
+    if num_runways > 1:
+        for i, rw in (fixed_runways or {}).items():
+            variables["landing_runway"][(i, rw)].SetBounds(1, 1)
+    if hint is not None:
+        hints = schedule_hints(variables, instance, hint[0], hint[1] if num_runways > 1 else None,
+                               separation_between_runways)
+        solver.SetHint([var for var, _ in hints], [float(value) for _, value in hints])
+
+    status = solver.Solve()
+    if status not in (pywraplp.Solver.OPTIMAL, pywraplp.Solver.FEASIBLE):
+        return ("INFEASIBLE" if status == pywraplp.Solver.INFEASIBLE else "NOT_SOLVED"), None, None
+
+    times = [variables["landing_time"][i].solution_value() for i in range(n)]
+    runways = [0] * n
+    if num_runways > 1:
+        runways = [max(range(num_runways), key=lambda r: variables["landing_runway"][(i, r)].solution_value())
+                   for i in range(n)]
+    return ("OPTIMAL" if status == pywraplp.Solver.OPTIMAL else "FEASIBLE"), times, runways
+
+
+class _SolutionReporter(cp_model.CpSolverSolutionCallback):
+    # Hands every improving CP-SAT solution to on_solution(times, runways)
+    def __init__(self, variables, num_planes, num_runways, on_solution):
+        super().__init__()
+        self._landing_time = variables["landing_time"]
+        self._runway = variables.get("runway_i") if num_runways > 1 else None
+        self._num_planes = num_planes
+        self._on_solution = on_solution
+
+    def on_solution_callback(self):
+        times = [self.Value(self._landing_time[i]) for i in range(self._num_planes)]
+        runways = ([self.Value(self._runway[i]) for i in range(self._num_planes)] if self._runway is not None
+                   else [0] * self._num_planes)
+        self._on_solution(times, runways)
+
+
+def _solve_cp(instance, num_runways, separation_between_runways, time_limit, presolve, search_workers,
+              fixed_runways, hint, options):
+    from models.CP import CP_FORMULATIONS
+
+    n = instance.num_planes
+    create_single, create_multiple = CP_FORMULATIONS[options.get("formulation", "pairwise")]
+    if num_runways == 1:
+        model, variables = create_single(n, instance, None, presolve=presolve)
+    else:
+        model, variables = create_multiple(n, num_runways, instance, None, separation_between_runways, presolve=presolve)
+
+    if num_runways > 1:
+        for i, rw in (fixed_runways or {}).items():
+            model.Add(variables["runway_i"][i] == rw)
+    if hint is not None:
+        for var, value in schedule_hints(variables, instance, hint[0], hint[1] if num_runways > 1 else None,
+                                         separation_between_runways):
+            model.AddHint(var, value)
+
+    solver = cp_model.CpSolver()
+    if time_limit is not None:
+        solver.parameters.max_time_in_seconds = time_limit
+    if search_workers is not None:
+        solver.parameters.num_workers = search_workers
+    if "search_strategy" in options:
+        solver.parameters.search_branching = options["search_strategy"]
+
+    on_solution = options.get("on_solution")
+    callback = None if on_solution is None else _SolutionReporter(variables, n, num_runways, on_solution)
+    status = solver.Solve(model, callback)
+    if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+        return solver.StatusName(status), None, None
+
+    times = [solver.Value(variables["landing_time"][i]) for i in range(n)]
+    runways = [solver.Value(variables["runway_i"][i]) for i in range(n)] if num_runways > 1 else [0] * n
+    return solver.StatusName(status), times, runways
+
+
+def _solve_hybrid(instance, num_runways, separation_between_runways, time_limit, presolve, search_workers,
+                  fixed_runways, hint, options):
+    from models.Hybrid import solve_hybrid_lbbd
+
+    n = instance.num_planes
+    if separation_between_runways is None:
+        separation_between_runways = np.zeros((n, n), dtype=np.int32)
+    # The Hybrid numbers its runways from 1
+    fix_runways = {i: rw + 1 for i, rw in (fixed_runways or {}).items()}
+    hint_solution = None if hint is None else ([rw + 1 for rw in hint[1]], hint[0])
+    # A feasible (times, runways) schedule also becomes the Hybrid's first incumbent
+    options = dict(options)
+    incumbent = options.pop("incumbent", None)
+    if incumbent is not None:
+        options["incumbent"] = ([rw + 1 for rw in incumbent[1]], incumbent[0])
+    poll_incumbent = options.pop("poll_incumbent", None)
+    if poll_incumbent is not None:
+        def poll_hybrid_incumbent():
+            schedule = poll_incumbent()
+            return None if schedule is None else ([rw + 1 for rw in schedule[1]], schedule[0])
+        options["poll_incumbent"] = poll_hybrid_incumbent
+    _, _, runways, times, metrics = solve_hybrid_lbbd(
+        n, num_runways, instance, None, separation_between_runways,
+        performance=True, presolve=presolve, master_time_limit=time_limit,
+        fix_runways=fix_runways, hint_solution=hint_solution, **options
+    )
+    if not times:
+        return "NOT_SOLVED", None, None
+    return ("OPTIMAL" if metrics["converged"] else "FEASIBLE"), list(times), [rw - 1 for rw in runways]
+
+
+ENGINE_SOLVERS = {"mip": _solve_mip, "cp": _solve_cp, "hybrid": _solve_hybrid}
+
+
+def check_engine_options(engine, options):
+    """Raises ValueError for an unknown engine or an option it does not take."""
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown engine '{engine}', expected one of {list(ENGINES)}.")
+    unknown = sorted(set(options) - set(ENGINE_OPTIONS[engine]))
+    if unknown:
+        raise ValueError(f"Unknown option(s) {unknown} for engine '{engine}', expected some of "
+                         f"{list(ENGINE_OPTIONS[engine])}.")
+
+
+def solve_with_engine(engine, instance, num_runways, separation_between_runways=None, time_limit=None,
+                      presolve=True, search_workers=None, fixed_runways=None, hint=None, **options):
+    """Returns (status, times, runways) for the given AirlandInstance; times and
+    runways are None when no schedule was found. options are checked against
+    ENGINE_OPTIONS."""
+    check_engine_options(engine, options)
+    return ENGINE_SOLVERS[engine](instance, num_runways, separation_between_runways, time_limit, presolve,
+                                  search_workers, fixed_runways, hint, options)
+
+
+def schedule_cost(instance, times):
+    times = np.asarray(times, dtype=np.float64)
+    return float(np.dot(instance.penalty_early, np.maximum(instance.target - times, 0))
+                 + np.dot(instance.penalty_late, np.maximum(times - instance.target, 0)))
+
+
+def run_engine(engine, instance, num_runways, separation_between_runways=None, time_limit=None, presolve=True,
+               search_workers=None, fixed_runways=None, hint=None, **options):
+    """solve_with_engine, timed and costed as an EngineSolution. Landing
+    times are rounded to the integer grid every model lives on."""
+    start_time = time.time()
+    status, times, runways = solve_with_engine(engine, instance, num_runways, separation_between_runways, time_limit,
+                                               presolve, search_workers, fixed_runways, hint, **options)
+    cost = None
+    if times is not None:
+        times = [int(round(t)) for t in times]
+        runways = [int(rw) for rw in runways]
+        cost = schedule_cost(instance, times)
+    return EngineSolution(engine=engine, status=status, cost=cost, times=times, runways=runways,
+                          solve_time=time.time() - start_time)
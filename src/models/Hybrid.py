@@ -1,88 +1,571 @@
-import math
+import multiprocessing
+import os
 import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import cmp_to_key
+import numpy as np
 from ortools.sat.python import cp_model
 from ortools.linear_solver import pywraplp
 
+from others.cache import LRUCache, sequences_digest
+from others.pairs import pair_separations
 from others.performance import PerformanceHybrid
+from others.utils import AirlandInstance, as_instance
+from others.presolve import presolve_windows
+from others.scaling import scale_objective, set_objective_scaling
+from others.timing import chain_blocks, sequence_timing
 
 # 0. HELPER FUNCTIONS (Sets & Reading)
-def calculate_sets(num_planes, planes_data, separation_times):
-    W, V, U = [], [], []
-    for i in range(num_planes):
-        for j in range(num_planes):
-            if i == j: continue
-            E_i, L_i = planes_data[i]['earliest_landing_time'], planes_data[i]['latest_landing_time']
-            E_j, L_j = planes_data[j]['earliest_landing_time'], planes_data[j]['latest_landing_time']
-            S_ij = separation_times[i][j]
-
-            if L_i < E_j and L_i + S_ij <= E_j:
-                W.append((i, j))
-            elif L_i < E_j and L_i + S_ij > E_j:
-                V.append((i, j))
-            else:
-                U.append((i, j))
-    return W, V, U
+def calculate_sets(num_planes, planes_data, separation_times, separation_between_runways=None, presolve=True):
+    instance = as_instance(planes_data, separation_times)
+    windows = presolve_windows(instance, separation_between_runways, tighten=presolve)
+    pairs = windows.pairs
 
-# 1. SUB-PROBLEM (LP - Linear Programming)
-def solve_subproblem_lp(num_planes, planes_data, separation_times, separation_between_runways,
-                        fixed_runways, fixed_before, W, V, U):
-    solver = pywraplp.Solver.CreateSolver('GLOP')
-    if not solver: return "ERROR", 0, []
-
-    x = []
-    alpha = []
-    beta = []
-    infinity = solver.infinity()
-
-    # Create Variables
-    for i in range(num_planes):
-        x.append(solver.NumVar(planes_data[i]['earliest_landing_time'],
-                               planes_data[i]['latest_landing_time'], f'x_{i}'))
-        alpha.append(solver.NumVar(0, infinity, f'alpha_{i}'))
-        beta.append(solver.NumVar(0, infinity, f'beta_{i}'))
+    # W pairs are implied by the time windows and never enumerated
+    V = [tuple(p) for p in pairs.V.tolist()]
+    # The master keeps one order literal per orientation of an open pair
+    U = [(i, j) for i, j in pairs.U.tolist()] + [(j, i) for i, j in pairs.U.tolist()]
+    return V, U, windows
 
-    # Constraints: Deviation Definitions
-    for i in range(num_planes):
-        target = planes_data[i]['target_landing_time']
-        solver.Add(x[i] + alpha[i] - beta[i] == target)
-
-    # Constraints: Separation based on fixed sequence
-    all_pairs = W + V + U
-    for i, j in all_pairs:
-        is_preceding = False
-
-        # Check Precedence
-        if (i, j) in W or (i, j) in V:
-            is_preceding = True
-        elif (i, j) in U:
+# 1. SUB-PROBLEM (LP - Linear Programming)
+# The LP is built once per instance: one separation row x_j - x_i >= lb per
+# ordered pair of V and U. Each Benders iteration only moves the row bounds
+# (S_ij or a positive s_ij when the order i -> j is fixed, -inf otherwise), so
+# GLOP can re-solve from the previous basis instead of rebuilding the model.
+class SubproblemLP:
+    def __init__(self, num_planes, planes_data, separation_times, separation_between_runways, V, U, earliest=None, latest=None):
+        self.solver = pywraplp.Solver.CreateSolver('GLOP')
+        self.num_planes = num_planes
+        if not self.solver:
+            return
+
+        instance = as_instance(planes_data, separation_times)
+        self.infinity = self.solver.infinity()
+
+        solver = self.solver
+        infinity = self.infinity
+
+        # Create Variables
+        # Presolved windows (valid for every feasible schedule) keep the W pairs separated
+        E = instance.earliest if earliest is None else earliest
+        L = instance.latest if latest is None else latest
+        self.x = [solver.NumVar(int(E[i]), int(L[i]), f'x_{i}') for i in range(num_planes)]
+        alpha = [solver.NumVar(0, infinity, f'alpha_{i}') for i in range(num_planes)]
+        beta = [solver.NumVar(0, infinity, f'beta_{i}') for i in range(num_planes)]
+
+        # Constraints: Deviation Definitions
+        for i in range(num_planes):
+            solver.Add(self.x[i] + alpha[i] - beta[i] == int(instance.target[i]))
+
+        # Constraints: Separation rows, inactive until an iteration fixes them
+        self.V = [tuple(p) for p in V]
+        self.U = [tuple(p) for p in U]
+        self.rows = {}
+        self.row_lb = {}
+        for i, j in self.V + self.U:
+            if (i, j) in self.rows:
+                continue
+            row = solver.Constraint(-infinity, infinity, f'sep_{i}_{j}')
+            row.SetCoefficient(self.x[j], 1)
+            row.SetCoefficient(self.x[i], -1)
+            self.rows[(i, j)] = row
+            self.row_lb[(i, j)] = -infinity
+        # (S_ij, s_ij) of every row, gathered once
+        row_pairs = np.array(list(self.rows), dtype=np.int64).reshape(-1, 2)
+        between = np.asarray(separation_between_runways, dtype=np.int32)
+        self.row_separation = dict(zip(self.rows, zip(pair_separations(instance.separation, row_pairs),
+                                                      pair_separations(between, row_pairs))))
+
+        # Objective
+        objective = solver.Objective()
+        for i in range(num_planes):
+            objective.SetCoefficient(alpha[i], float(instance.penalty_early[i]))
+            objective.SetCoefficient(beta[i], float(instance.penalty_late[i]))
+        objective.SetMinimization()
+
+    def binding_rows(self, tol=1e-9):
+        # Separation rows with a positive dual in the last optimal solve: (pair, dual, lb)
+        return [
+            (pair, row.dual_value(), self.row_lb[pair])
+            for pair, row in self.rows.items()
+            if self.row_lb[pair] > -self.infinity and row.dual_value() > tol
+        ]
+
+    def _set_lb(self, pair, lb):
+        if self.row_lb[pair] != lb:
+            self.rows[pair].SetLb(lb)
+            self.row_lb[pair] = lb
+
+    def _delta(self, i, j, fixed_runways):
+        S_ij, s_ij = self.row_separation[(i, j)]
+        if fixed_runways[i] == fixed_runways[j]:
+            return S_ij
+        # Planes on different runways with no separation do not constrain each other
+        return s_ij if s_ij > 0 else -self.infinity
+
+    def solve(self, fixed_runways, fixed_before):
+        if not self.solver: return "ERROR", 0, []
+
+        # V pairs always land i -> j
+        for i, j in self.V:
+            self._set_lb((i, j), self._delta(i, j, fixed_runways))
+
+        # U pairs follow the order fixed by the master
+        for i, j in self.U:
             if fixed_before.get((i, j)) == 1:
-                is_preceding = True
-
-        if is_preceding:
-            r_i = fixed_runways[i]
-            r_j = fixed_runways[j]
-            delta = separation_times[i][j] if r_i == r_j else separation_between_runways[i][j]
-            solver.Add(x[j] >= x[i] + delta)
+                self._set_lb((i, j), self._delta(i, j, fixed_runways))
+            else:
+                self._set_lb((i, j), -self.infinity)
+
+        status = self.solver.Solve()
+
+        if status == pywraplp.Solver.OPTIMAL:
+            times = [self.x[i].solution_value() for i in range(self.num_planes)]
+            return "OPTIMAL", self.solver.Objective().Value(), times
+        elif status == pywraplp.Solver.INFEASIBLE:
+            return "INFEASIBLE", 0, []
+        else:
+            return "OTHER", 0, []
+
+def solve_runway(instance, planes, fixed_before, V, U, earliest=None, latest=None, subproblem_class=SubproblemLP):
+    # One runway on its own: the subproblem over its planes and the V/U pairs among them
+    index = {p: k for k, p in enumerate(planes)}
+    V_rw = [(index[i], index[j]) for i, j in V if i in index and j in index]
+    U_rw = [(index[i], index[j]) for i, j in U if i in index and j in index]
+    before_rw = {(index[i], index[j]): fixed_before.get((i, j)) for i, j in U if i in index and j in index}
+    E = instance.earliest if earliest is None else np.asarray(earliest)
+    L = instance.latest if latest is None else np.asarray(latest)
+    k = len(planes)
+    subproblem = subproblem_class(k, instance.subset(planes), None, np.zeros((k, k), dtype=np.int32), V_rw, U_rw,
+                                  E[planes], L[planes])
+    return subproblem.solve([1] * k, before_rw)
 
-    # Objective
-    objective = solver.Objective()
+def solve_subproblem_lp(num_planes, planes_data, separation_times, separation_between_runways,
+                        fixed_runways, fixed_before, V, U, earliest=None, latest=None):
+    # One-off solve; the Benders loop evaluates through a SubproblemEvaluator,
+    # which also splits independent runways across its process pool.
+    # Returns (status, cost, times, cost per runway)
+    instance = as_instance(planes_data, separation_times)
+    subproblem = SubproblemLP(num_planes, instance, None, separation_between_runways, V, U, earliest, latest)
+    status, cost, times = subproblem.solve(fixed_runways, fixed_before)
+    return status, cost, times, runway_costs(instance, fixed_runways, times) if status == "OPTIMAL" else {}
+
+def cross_runway_rows(fixed_runways, fixed_before, separation_between_runways, V, U):
+    # Active separation rows between planes on different runways. Without
+    # them the subproblem splits into one independent problem per runway
+    between = np.asarray(separation_between_runways)
+    rows = []
+    for i, j in list(V) + [pair for pair in U if fixed_before.get(tuple(pair)) == 1]:
+        if fixed_runways[i] != fixed_runways[j] and between[i, j] > 0:
+            rows.append((i, j))
+    return rows
+
+def runway_costs(instance, fixed_runways, times):
+    # Share of the subproblem cost paid by the planes of every runway
+    times = np.asarray(times, dtype=np.float64)
+    cost = (instance.penalty_early * np.maximum(instance.target - times, 0)
+            + instance.penalty_late * np.maximum(times - instance.target, 0))
+    rw = np.asarray(fixed_runways)
+    return {int(k): float(cost[rw == k].sum()) for k in np.unique(rw)}
+
+def runway_sequences(num_planes, fixed_runways, fixed_before, order_key):
+    # Landing order on every runway: the master's decision for U pairs, the
+    # (presolved) earliest time for the pairs whose order is already fixed
+    def compare(i, j):
+        b = fixed_before.get((i, j))
+        if b is not None:
+            return -1 if b == 1 else 1
+        return (order_key[i] > order_key[j]) - (order_key[i] < order_key[j])
+
+    runways = {}
     for i in range(num_planes):
-        objective.SetCoefficient(alpha[i], planes_data[i]['penalty_early'])
-        objective.SetCoefficient(beta[i], planes_data[i]['penalty_late'])
-    objective.SetMinimization()
-
-    status = solver.Solve()
-
-    if status == pywraplp.Solver.OPTIMAL:
-        times = [x[i].solution_value() for i in range(num_planes)]
-        return "OPTIMAL", solver.Objective().Value(), times
-    elif status == pywraplp.Solver.INFEASIBLE:
-        return "INFEASIBLE", 0, []
-    else:
-        return "OTHER", 0, []
-
-# 2. MASTER PROBLEM (CP - Strengthened)
-def solve_hybrid_lbbd(num_planes, num_runways, planes_data, separation_times, separation_between_runways, max_iterations=20, search_strategy=cp_model.AUTOMATIC_SEARCH, performance = False):
+        runways.setdefault(fixed_runways[i], []).append(i)
+    return {rw: sorted(planes, key=cmp_to_key(compare)) for rw, planes in runways.items()}
+
+# 1b. SUB-PROBLEM (combinatorial timing)
+# Same interface as SubproblemLP. The planes on each runway are put in the
+# order fixed by the master and timed with the O(n log n) chain algorithm.
+# That only separates consecutive planes on the same runway, so the result is
+# checked against every active V/U row; if one is violated (between-runway
+# separations, or S without the triangle inequality) the LP decides.
+class SubproblemTiming:
+    def __init__(self, num_planes, planes_data, separation_times, separation_between_runways, V, U, earliest=None, latest=None):
+        self.instance = as_instance(planes_data, separation_times)
+        self.num_planes = num_planes
+        self.separation_between_runways = separation_between_runways
+        self.earliest = self.instance.earliest if earliest is None else np.asarray(earliest, dtype=np.int64)
+        self.latest = self.instance.latest if latest is None else np.asarray(latest, dtype=np.int64)
+        # W/V pairs, whose order the master does not fix, land by earliest time
+        self.order_key = self.earliest.tolist()
+
+        self.V = [tuple(p) for p in V]
+        self.U = [tuple(p) for p in U]
+        rows = np.array(self.V + self.U, dtype=np.int64).reshape(-1, 2)
+        self.rows_i = rows[:, 0]
+        self.rows_j = rows[:, 1]
+        between = np.asarray(separation_between_runways, dtype=np.int32)
+        self.rows_same = self.instance.separation[self.rows_i, self.rows_j].astype(np.int64)
+        self.rows_between = between[self.rows_i, self.rows_j].astype(np.int64)
+
+        self.lp = None
+        self.num_fallbacks = 0
+
+    def _satisfies_rows(self, times, fixed_runways, fixed_before):
+        rw = np.asarray(fixed_runways)
+        active = np.ones(len(self.rows_i), dtype=bool)
+        active[len(self.V):] = np.fromiter((fixed_before.get(p) == 1 for p in self.U), dtype=bool, count=len(self.U))
+        same = rw[self.rows_i] == rw[self.rows_j]
+        active &= same | (self.rows_between > 0)
+        delta = np.where(same, self.rows_same, self.rows_between)
+        return bool(np.all((times[self.rows_j] - times[self.rows_i] >= delta)[active]))
+
+    def solve(self, fixed_runways, fixed_before):
+        result = sequence_timing(self.instance, runway_sequences(self.num_planes, fixed_runways, fixed_before, self.order_key).values(), self.earliest, self.latest)
+        if result is not None:
+            times, cost = result
+            if self._satisfies_rows(times, fixed_runways, fixed_before):
+                return "OPTIMAL", cost, times.astype(float).tolist()
+
+        self.num_fallbacks += 1
+        if self.lp is None:
+            self.lp = SubproblemLP(self.num_planes, self.instance, None, self.separation_between_runways, self.V, self.U,
+                                   self.earliest, self.latest)
+        return self.lp.solve(fixed_runways, fixed_before)
+
+def solve_subproblem_timing(num_planes, planes_data, separation_times, separation_between_runways,
+                            fixed_runways, fixed_before, V, U, earliest=None, latest=None):
+    # Drop-in replacement for solve_subproblem_lp
+    subproblem = SubproblemTiming(num_planes, planes_data, separation_times, separation_between_runways, V, U,
+                                  earliest, latest)
+    status, cost, times = subproblem.solve(fixed_runways, fixed_before)
+    return status, cost, times, runway_costs(subproblem.instance, fixed_runways, times) if status == "OPTIMAL" else {}
+
+# 1c. SUBPROBLEM EVALUATION
+# The master can propose the same runway sequences again in later iterations.
+# Every evaluator keeps its results in its own LRU caches, keyed by a hash of
+# the sequences (runways are interchangeable, so relabelled assignments hit
+# too); they live as long as the run, so sub-instances never share them. When no
+# cross-runway row is active every runway is also cached on its own, and an
+# assignment that shares some runways with earlier ones only re-solves the rest.
+# The master solutions of an iteration are evaluated as one batch. GLOP and
+# the timing routine hold the GIL, so the misses of a batch are solved in a
+# process pool, started by the first batch with more than one task and kept
+# until the evaluator is closed; its initializer builds one subproblem per
+# worker, so a task only ships the assignment. With several workers,
+# independent runways are solved as separate tasks (one small subproblem each).
+_worker = {}
+
+def _init_subproblem_worker(subproblem_class, instance, separation_between_runways, V, U, earliest, latest, keep_duals):
+    _worker["runway_args"] = (V, U, earliest, latest, subproblem_class)
+    _worker["instance"] = instance
+    _worker["keep_duals"] = keep_duals
+    _worker["subproblem"] = subproblem_class(instance.num_planes, instance, None, separation_between_runways, V, U,
+                                             earliest, latest)
+
+def _solve_assignment(subproblem, fixed_runways, fixed_before, keep_duals):
+    start = time.time()
+    status, cost, times = subproblem.solve(fixed_runways, fixed_before)
+    binding = subproblem.binding_rows() if keep_duals and status == "OPTIMAL" else None
+    return status, cost, times, binding, time.time() - start
+
+def _solve_assignment_task(fixed_runways, fixed_before):
+    return _solve_assignment(_worker["subproblem"], fixed_runways, fixed_before, _worker["keep_duals"])
+
+def _solve_single_runway(instance, planes, fixed_before, V, U, earliest, latest, subproblem_class):
+    start = time.time()
+    status, cost, times = solve_runway(instance, planes, fixed_before, V, U, earliest, latest, subproblem_class)
+    return status, cost, np.asarray(times, dtype=np.float64), time.time() - start
+
+def _solve_runway_task(planes, fixed_before):
+    return _solve_single_runway(_worker["instance"], planes, fixed_before, *_worker["runway_args"])
+
+class SubproblemEvaluator:
+    def __init__(self, subproblem_class, instance, separation_between_runways, V, U, earliest, latest, cache=True,
+                 keep_duals=False, max_workers=1):
+        self.subproblem_class = subproblem_class
+        self.instance = instance
+        self.num_planes = instance.num_planes
+        between = np.asarray(separation_between_runways, dtype=np.int32)
+        self.separation_between_runways = between
+        self.V = [tuple(p) for p in V]
+        self.U = [tuple(p) for p in U]
+        self.earliest = np.asarray(earliest, dtype=np.int64)
+        self.latest = np.asarray(latest, dtype=np.int64)
+        self.order_key = self.earliest.tolist()
+        self.cache = cache
+        # LP duals depend on the full model, so dual cuts only reuse whole assignments
+        self.keep_duals = keep_duals
+        self.subproblem_cache = LRUCache(maxsize=4096)
+        self.runway_cache = LRUCache(maxsize=16384)
+
+        # Batches of one are solved here, keeping the warm LP basis
+        self.subproblem = subproblem_class(self.num_planes, instance, None, self.separation_between_runways,
+                                           self.V, self.U, self.earliest, self.latest)
+        # Daemonic processes (e.g. a portfolio member) cannot start workers of their own
+        self.max_workers = 1 if multiprocessing.current_process().daemon else max_workers
+        self.executor = None
+        self.pool_args = (subproblem_class, instance, between, self.V, self.U, self.earliest, self.latest, keep_duals)
+
+        self.hits = 0
+        self.misses = 0
+        self.runway_hits = 0
+        self.runway_misses = 0
+
+    def _pool(self):
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(max_workers=self.max_workers, initializer=_init_subproblem_worker,
+                                                initargs=self.pool_args)
+        return self.executor
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+
+    def _runway_key(self, seq):
+        return sequences_digest([seq])
+
+    def _store_runways(self, sequences, times):
+        times = np.asarray(times, dtype=np.float64)
+        cost = (self.instance.penalty_early * np.maximum(self.instance.target - times, 0)
+                + self.instance.penalty_late * np.maximum(times - self.instance.target, 0))
+        for seq in sequences:
+            self.runway_cache.put(self._runway_key(seq), ("OPTIMAL", float(cost[seq].sum()), times[seq]))
+
+    def solve_batch(self, assignments):
+        """Evaluates [(fixed_runways, fixed_before)] and returns, in the same
+        order, (status, cost, times, binding rows or None, solve time)."""
+        results = [None] * len(assignments)
+        whole = {}              # k -> (sequences, cross, key), one subproblem
+        split = {}              # k -> (sequences, key), one subproblem per runway
+        runways = {}            # runway sequence -> (status, cost, times)
+        runway_jobs = {}        # runway sequence -> order of its pairs
+        for k, (fixed_runways, fixed_before) in enumerate(assignments):
+            sequences = list(runway_sequences(self.num_planes, fixed_runways, fixed_before, self.order_key).values())
+            cross = cross_runway_rows(fixed_runways, fixed_before, self.separation_between_runways, self.V, self.U)
+            key = (sequences_digest(sequences), tuple(sorted(cross)))
+
+            if self.cache:
+                cached = self.subproblem_cache.get(key)
+                if cached is not None and (cached[3] is not None or not self.keep_duals or cached[0] != "OPTIMAL"):
+                    self.hits += 1
+                    status, cost, times, binding = cached
+                    results[k] = (status, cost, times.tolist(), binding, 0.0)
+                    continue
+                self.misses += 1
+
+            if not cross and not self.keep_duals:
+                cached_runways = {}
+                if self.cache:
+                    for seq in sequences:
+                        entry = self.runway_cache.get(self._runway_key(seq))
+                        if entry is not None:
+                            cached_runways[tuple(seq)] = entry
+                    self.runway_hits += len(cached_runways)
+                    self.runway_misses += len(sequences) - len(cached_runways)
+                # Split when some runways are already known, or when the pool can solve them side by side
+                if cached_runways or (self.max_workers > 1 and len(sequences) > 1):
+                    runways.update(cached_runways)
+                    for seq in sequences:
+                        if tuple(seq) not in runways:
+                            planes = set(seq)
+                            runway_jobs[tuple(seq)] = {pair: value for pair, value in fixed_before.items()
+                                                       if pair[0] in planes and pair[1] in planes}
+                    split[k] = (sequences, key)
+                    continue
+            whole[k] = (sequences, cross, key)
+
+        if self.max_workers > 1 and len(whole) + len(runway_jobs) > 1:
+            executor = self._pool()
+            runway_futures = {seq: executor.submit(_solve_runway_task, list(seq), before)
+                              for seq, before in runway_jobs.items()}
+            futures = {k: executor.submit(_solve_assignment_task, *assignments[k]) for k in whole}
+            solved_runways = {seq: future.result() for seq, future in runway_futures.items()}
+            solved = {k: future.result() for k, future in futures.items()}
+        else:
+            solved_runways = {
+                seq: _solve_single_runway(self.instance, list(seq), before, self.V, self.U, self.earliest,
+                                          self.latest, self.subproblem_class)
+                for seq, before in runway_jobs.items()
+            }
+            solved = {k: _solve_assignment(self.subproblem, *assignments[k], self.keep_duals) for k in whole}
+
+        for seq, (status, cost, times, _) in solved_runways.items():
+            runways[seq] = (status, cost, times)
+            if self.cache:
+                self.runway_cache.put(self._runway_key(seq), (status, cost, times))
+
+        for k, (sequences, key) in split.items():
+            sp_time = sum(solved_runways[tuple(seq)][3] for seq in sequences if tuple(seq) in solved_runways)
+            times = np.zeros(self.num_planes)
+            cost = 0.0
+            status = "OPTIMAL"
+            for seq in sequences:
+                rw_status, rw_cost, rw_times = runways[tuple(seq)]
+                if rw_status != "OPTIMAL":
+                    status = rw_status
+                    break
+                cost += rw_cost
+                times[seq] = rw_times
+            if status != "OPTIMAL":
+                cost, times = 0, np.zeros(0)
+            results[k] = (status, cost, times.tolist(), None, sp_time)
+            if self.cache:
+                self.subproblem_cache.put(key, (status, cost, times, None))
+
+        for k, (sequences, cross, key) in whole.items():
+            status, cost, times, binding, _ = results[k] = solved[k]
+            if self.cache:
+                if not cross and status == "OPTIMAL":
+                    self._store_runways(sequences, times)
+                self.subproblem_cache.put(key, (status, cost, np.asarray(times, dtype=np.float64), binding))
+        return results
+
+# 2. CUT POOL
+# Literals and cuts shared by all Benders iterations. The literal r_i == rw is
+# created once per (plane, runway) value. Optimality cuts are built from the
+# runway blocks of the subproblem (planes timed back-to-back): a block only
+# mentions its own planes and order, so it stays valid for every master
+# solution that reproduces it and is reused instead of re-created.
+class CutPool:
+    def __init__(self, model, r, before, theta):
+        self.model = model
+        self.r = r
+        self.before = before
+        self.theta = theta
+        self.runway_lits = {}
+        self.indicators = {}
+        self.cuts = set()
+        self.num_cuts = 0
+        self.num_duplicates = 0
+
+    def runway_literal(self, i, rw):
+        if (i, rw) not in self.runway_lits:
+            b = self.model.NewBoolVar(f'runway_{i}_{rw}')
+            self.model.Add(self.r[i] == rw).OnlyEnforceIf(b)
+            self.model.Add(self.r[i] != rw).OnlyEnforceIf(b.Not())
+            self.runway_lits[(i, rw)] = b
+        return self.runway_lits[(i, rw)]
+
+    def _order_literals(self, planes):
+        # planes are in landing order, so every U pair among them lands a -> b
+        lits = []
+        for k, a in enumerate(planes):
+            for b in planes[k + 1:]:
+                if (a, b) in self.before:
+                    lits.append(self.before[(a, b)])
+        return lits
+
+    def _block_literals(self, planes, rw):
+        return [self.runway_literal(i, rw) for i in planes] + self._order_literals(planes)
+
+    def _indicator(self, key, lits):
+        # z is forced on whenever all lits hold
+        if key not in self.indicators:
+            z = self.model.NewBoolVar(f'cut_indicator_{len(self.indicators)}')
+            self.model.AddBoolOr([l.Not() for l in lits] + [z])
+            self.indicators[key] = z
+        return self.indicators[key]
+
+    def _register(self, key):
+        if key in self.cuts:
+            self.num_duplicates += 1
+            return False
+        self.cuts.add(key)
+        self.num_cuts += 1
+        return True
+
+    def add_block_cut(self, blocks):
+        # blocks: [(planes, rw, scaled cost)]; their costs add up on disjoint planes
+        blocks = [(planes, rw, cost) for planes, rw, cost in blocks if cost > 0]
+        key = ("blocks", frozenset((tuple(planes), rw, cost) for planes, rw, cost in blocks))
+        if not blocks or not self._register(key):
+            return False
+        terms = [cost * self._indicator(("block", tuple(planes), rw), self._block_literals(planes, rw))
+                 for planes, rw, cost in blocks]
+        self.model.Add(self.theta >= sum(terms))
+        return True
+
+    def add_dual_cut(self, constant, terms, condition):
+        # theta >= constant + sum(coef * lit), enforced while every condition literal holds
+        condition_key = frozenset(lit.Index() for lit in condition)
+        key = ("dual", constant, frozenset((lit.Index(), coef) for lit, coef in terms), condition_key)
+        if not self._register(key):
+            return False
+        cut = self.model.Add(self.theta >= constant + sum(coef * lit for lit, coef in terms))
+        if condition:
+            cut.OnlyEnforceIf(self._indicator(("dual", condition_key), condition))
+        return True
+
+    def add_block_nogood(self, planes, rw):
+        # These planes cannot land on one runway in this order
+        if not self._register(("nogood", tuple(planes), rw)):
+            return False
+        self.model.AddBoolOr([l.Not() for l in self._block_literals(planes, rw)])
+        return True
+
+    def _assignment_literals(self, fixed_runways, fixed_before):
+        lits = [self.runway_literal(i, rw) for i, rw in enumerate(fixed_runways)]
+        for (i, j), val in fixed_before.items():
+            if i < j:
+                lits.append(self.before[(i, j)] if val else self.before[(i, j)].Not())
+        return lits
+
+    def add_assignment_cut(self, fixed_runways, fixed_before, cost):
+        # Classic cut on the whole master solution, for costs the blocks do not explain
+        assignment = (tuple(fixed_runways), tuple(sorted(fixed_before.items())))
+        if not self._register(("assignment", assignment, cost)):
+            return False
+        z = self._indicator(("assignment", assignment), self._assignment_literals(fixed_runways, fixed_before))
+        self.model.Add(self.theta >= cost).OnlyEnforceIf(z)
+        return True
+
+    def add_assignment_nogood(self, fixed_runways, fixed_before):
+        assignment = (tuple(fixed_runways), tuple(sorted(fixed_before.items())))
+        if not self._register(("nogood", assignment)):
+            return False
+        self.model.AddBoolOr([l.Not() for l in self._assignment_literals(fixed_runways, fixed_before)])
+        return True
+
+# 2b. MASTER SOLUTIONS
+# CP-SAT reports every improving master solution through this callback. The
+# last `limit` distinct assignments (runways + order) are kept, the final one
+# being the master optimum, so a single master solve can feed several
+# subproblems and return several cuts.
+class MasterSolutionCollector(cp_model.CpSolverSolutionCallback):
+    def __init__(self, r, before, theta, limit):
+        super().__init__()
+        self.r = r
+        self.before = before
+        self.theta = theta
+        self.limit = limit
+        self.solutions = []
+
+    def reset(self):
+        self.solutions = []
+
+    def on_solution_callback(self):
+        runways = [self.Value(v) for v in self.r]
+        fixed_before = {pair: self.Value(v) for pair, v in self.before.items()}
+        key = (tuple(runways), tuple(fixed_before.values()))
+        self.solutions = [sol for sol in self.solutions if sol[0] != key]
+        self.solutions.append((key, runways, fixed_before, self.Value(self.theta)))
+        del self.solutions[:-self.limit]
+
+
+# 3. MASTER PROBLEM (CP - Strengthened)
+def solve_hybrid_lbbd(num_planes, num_runways, planes_data, separation_times, separation_between_runways, max_iterations=20, search_strategy=cp_model.AUTOMATIC_SEARCH, performance = False, presolve=True, subproblem="lp",
+                      warm_start=True, master_time_limit=None, cut_mode="block", num_solutions=1, num_workers=None,
+                      cache=True, fix_runways=None, hint_solution=None, incumbent=None, poll_incumbent=None):
+    if subproblem not in ("lp", "timing"):
+        raise ValueError(f"Unknown subproblem '{subproblem}', expected 'lp' or 'timing'.")
+    if cut_mode not in ("block", "dual"):
+        raise ValueError(f"Unknown cut_mode '{cut_mode}', expected 'block' or 'dual'.")
+    if cut_mode == "dual" and subproblem != "lp":
+        raise ValueError("cut_mode='dual' needs the LP subproblem for its duals.")
+    if num_solutions < 1:
+        raise ValueError("num_solutions must be at least 1.")
+
     print("\n" + "=" * 60)
     print("\t\tRunning Hybrid LBBD Solver (Strengthened Master)")
     print("=" * 60, "\n")
@@ -92,90 +575,198 @@ def solve_hybrid_lbbd(num_planes, num_runways, planes_data, separation_times, se
         perf.start()
 
     start_time = time.time()
-    W, V, U = calculate_sets(num_planes, planes_data, separation_times)
+    instance = as_instance(planes_data, separation_times)
+    planes_data = instance.planes
+    separation_between_runways = np.asarray(separation_between_runways, dtype=np.int32)
+    V, U, windows = calculate_sets(num_planes, instance, None, separation_between_runways, presolve)
+    E = windows.earliest.tolist()
+    T = instance.target.tolist()
+    L = windows.latest.tolist()
 
     master_model = cp_model.CpModel()
 
     # Discrete Decision Variables
     r = [master_model.NewIntVar(1, num_runways, f'r_{i}') for i in range(num_planes)]
-    before = {}
-    for i, j in U:
-        if (i, j) not in before:
-            before[(i, j)] = master_model.NewBoolVar(f'before_{i}_{j}')
-        if (j, i) not in before:
-            before[(j, i)] = master_model.NewBoolVar(f'before_{j}_{i}')
+    # Planes whose runway is already decided (e.g. frozen by the online scheduler)
+    for i, rw in (fix_runways or {}).items():
+        master_model.Add(r[i] == rw)
 
-    # Mutually Exclusive: Either i before j OR j before i
-    for i, j in U:
-        master_model.Add(before[(i, j)] + before[(j, i)] == 1)
+    # One order literal per unordered pair of U: before[(i, j)] for i < j and
+    # its negation for (j, i), so "either i before j or j before i" needs no constraint
+    order_pairs = sorted({(min(i, j), max(i, j)) for i, j in U})
+    before = {}
+    for i, j in order_pairs:
+        before[(i, j)] = master_model.NewBoolVar(f'before_{i}_{j}')
+        before[(j, i)] = before[(i, j)].Not()
 
     # B. Proxy Time Variables (Strengthened Master)
     # These allow the Master to estimate costs BEFORE calling the LP
     x_m = []
     alpha_m = []
     beta_m = []
-    max_time = max(p['latest_landing_time'] for p in planes_data)
 
     for i in range(num_planes):
-        # Time Windows
-        x_m.append(master_model.NewIntVar(planes_data[i]['earliest_landing_time'],
-                                          planes_data[i]['latest_landing_time'], f'xm_{i}'))
-        alpha_m.append(master_model.NewIntVar(0, max_time, f'am_{i}'))
-        beta_m.append(master_model.NewIntVar(0, max_time, f'bm_{i}'))
+        # Time Windows; the deviations are bounded by the (presolved) window on both sides
+        x_m.append(master_model.NewIntVar(E[i], L[i], f'xm_{i}'))
+        alpha_m.append(master_model.NewIntVar(max(T[i] - L[i], 0), max(T[i] - E[i], 0), f'am_{i}'))
+        beta_m.append(master_model.NewIntVar(max(E[i] - T[i], 0), max(L[i] - T[i], 0), f'bm_{i}'))
 
         # Link Deviation to Time (Integer Relaxation)
-        tgt = planes_data[i]['target_landing_time']
+        tgt = T[i]
         master_model.Add(x_m[i] + alpha_m[i] - beta_m[i] == tgt)
 
     # Cost Calculation in Master
-    # We sum up the penalties. Note: CP works with Integers, so penalties must be int here.
-    # If penalties are floats (e.g. 1.5), multiply everything by 10 or 100.
-    master_cost = sum(alpha_m[i] * int(planes_data[i]['penalty_early']) +
-                      beta_m[i] * int(planes_data[i]['penalty_late']) for i in range(num_planes))
+    # CP works with integers, so the penalties are scaled to exact integers and
+    # theta is expressed in scaled units (scale.unscale gives the real cost)
+    scale = scale_objective(instance)
+    cost_e = scale.penalty_early.tolist()
+    cost_l = scale.penalty_late.tolist()
+    master_cost = sum(alpha_m[i] * cost_e[i] + beta_m[i] * cost_l[i] for i in range(num_planes))
 
     # Theta variable (Estimator for Benders)
     # Theta must be at least the cost calculated by the Master itself
-    theta = master_model.NewIntVar(0, int(1e7), 'theta')
+    theta_ub = sum(max(T[i] - E[i], 0) * cost_e[i] + max(L[i] - T[i], 0) * cost_l[i] for i in range(num_planes))
+    theta = master_model.NewIntVar(0, theta_ub, 'theta')
     master_model.Add(theta >= master_cost)
     master_model.Minimize(theta)
-
-    # Logic Constraints (Sequence)
-    processed = set()
-    for i, j in U:
-        pair = tuple(sorted((i, j)))
-        if pair in processed: continue
-        processed.add(pair)
-        # Mutually Exclusive: Either i before j OR j before i
-        master_model.Add(before[(i, j)] + before[(j, i)] == 1)
+    set_objective_scaling(master_model, scale)
 
     # Time/Separation Constraints in Master
-    # This guides the Master to choose valid sequences
+    # This guides the Master to choose valid sequences. The same-runway
+    # reification is shared by both orientations of a pair
+    same_runway = {}
+
+    def same_runway_literal(i, j):
+        if (i, j) not in same_runway:
+            same_rw = master_model.NewBoolVar(f'same_{min(i, j)}_{max(i, j)}')
+            master_model.Add(r[i] == r[j]).OnlyEnforceIf(same_rw)
+            master_model.Add(r[i] != r[j]).OnlyEnforceIf(same_rw.Not())
+            same_runway[(i, j)] = same_runway[(j, i)] = same_rw
+        return same_runway[(i, j)]
+
+    # Separations of the U (both orientations) and V pairs, gathered once
+    U_pairs = np.array(order_pairs, dtype=np.int64).reshape(-1, 2)
+    U_separations = zip(pair_separations(instance.separation, U_pairs),
+                        pair_separations(instance.separation, U_pairs[:, ::-1]),
+                        pair_separations(separation_between_runways, U_pairs),
+                        pair_separations(separation_between_runways, U_pairs[:, ::-1]))
+    V_separations = zip(pair_separations(instance.separation, V), pair_separations(separation_between_runways, V))
 
     # 1. Uncertain Pairs (U)
-    for i, j in U:
-        # Reification: Are they on the same runway?
-        same_rw = master_model.NewBoolVar(f'same_{i}_{j}')
-        master_model.Add(r[i] == r[j]).OnlyEnforceIf(same_rw)
-        master_model.Add(r[i] != r[j]).OnlyEnforceIf(same_rw.Not())
-
-        # If i before j:
-        # Same Runway -> S_ij
-        master_model.Add(x_m[j] >= x_m[i] + separation_times[i][j]).OnlyEnforceIf([before[(i,j)], same_rw])
-        # Diff Runway -> s_ij
-        master_model.Add(x_m[j] >= x_m[i] + separation_between_runways[i][j]).OnlyEnforceIf([before[(i,j)], same_rw.Not()])
+    for (i, j), (S_ij, S_ji, s_ij, s_ji) in zip(order_pairs, U_separations):
+        same_rw = same_runway_literal(i, j)
+        for a, b, S_ab, s_ab in ((i, j, S_ij, s_ij), (j, i, S_ji, s_ji)):
+            # If a before b:
+            # Same Runway -> S_ab
+            master_model.Add(x_m[b] >= x_m[a] + S_ab).OnlyEnforceIf([before[(a, b)], same_rw])
+            # Diff Runway -> s_ab
+            master_model.Add(x_m[b] >= x_m[a] + s_ab).OnlyEnforceIf([before[(a, b)], same_rw.Not()])
 
     # 2. Certain Order Pairs (V)
-    for i, j in V:
-        same_rw = master_model.NewBoolVar(f'same_{i}_{j}')
-        master_model.Add(r[i] == r[j]).OnlyEnforceIf(same_rw)
-        master_model.Add(r[i] != r[j]).OnlyEnforceIf(same_rw.Not())
-
-        master_model.Add(x_m[j] >= x_m[i] + separation_times[i][j]).OnlyEnforceIf(same_rw)
-        master_model.Add(x_m[j] >= x_m[i] + separation_between_runways[i][j]).OnlyEnforceIf(same_rw.Not())
+    for (i, j), (S_ij, s_ij) in zip(V, V_separations):
+        same_rw = same_runway_literal(i, j)
+        master_model.Add(x_m[j] >= x_m[i] + S_ij).OnlyEnforceIf(same_rw)
+        master_model.Add(x_m[j] >= x_m[i] + s_ij).OnlyEnforceIf(same_rw.Not())
+
+    # Subproblems, built once and re-solved for every master solution. The
+    # solutions of one master solve, and their independent runways, are
+    # evaluated together in parallel processes
+    subproblem_class = SubproblemTiming if subproblem == "timing" else SubproblemLP
+    # Worker processes only pay off with several master solutions per batch, unless asked for
+    if num_workers is None:
+        num_workers = min(num_solutions * num_runways, os.cpu_count() or 1) if num_solutions > 1 else 1
+    evaluator = SubproblemEvaluator(subproblem_class, instance, separation_between_runways, V, U,
+                                    windows.earliest, windows.latest, cache=cache, keep_duals=cut_mode == "dual",
+                                    max_workers=num_workers)
+
+    def evaluate(solutions):
+        results = []
+        batch = evaluator.solve_batch([(fixed_runways, fixed_before) for fixed_runways, fixed_before, _ in solutions])
+        for (fixed_runways, fixed_before, _), (sp_status, sp_cost, sp_times, binding, sp_time) in zip(solutions, batch):
+            # Runway blocks of the fixed sequence, used to build restricted cuts
+            sequences = runway_sequences(num_planes, fixed_runways, fixed_before, E)
+            blocks = {rw: chain_blocks(instance, seq, windows.earliest, windows.latest) for rw, seq in sequences.items()}
+            # Independent runways: each runway's share of the cost bounds its planes on their own
+            runway_cost = None
+            if sp_status == "OPTIMAL" and not cross_runway_rows(fixed_runways, fixed_before, separation_between_runways, V, U):
+                runway_cost = runway_costs(instance, fixed_runways, sp_times)
+            results.append((sp_status, sp_cost, sp_times, sp_time, binding, sequences, blocks, runway_cost))
+        return results
+
+    cut_pool = CutPool(master_model, r, before, theta)
+
+    def dual_cut(binding, cost):
+        # LP duals stay feasible for any assignment that keeps the binding rows
+        # active, so theta >= cost + sum u_ij * (lb'_ij - lb_ij) holds there, with
+        # lb'_ij = s_ij + (S_ij - s_ij) * same_ij (or S_ij if s_ij = 0 and the row
+        # only exists on a shared runway)
+        constant = cost
+        coefs = {}
+        condition = []
+        for (i, j), u, lb in binding:
+            constant -= u * lb
+            if (i, j) in before:
+                condition.append(before[(i, j)])
+            S_ij = int(instance.separation[i, j])
+            s_ij = int(separation_between_runways[i, j])
+            if s_ij > 0:
+                constant += u * s_ij
+                coefs[(i, j)] = coefs.get((i, j), 0) + u * (S_ij - s_ij)
+            else:
+                constant += u * S_ij
+                condition.append(same_runway[(i, j)])
+        terms = [(same_runway[pair], scale.scale_bound(c)) for pair, c in coefs.items()]
+        return scale.scale_bound(constant), [(lit, c) for lit, c in terms if c != 0], condition
+
+    # Incumbent: best subproblem schedule found so far (upper bound)
+    best_cost = None
+    best_cost_int = None
+    best_runways = None
+    best_times = None
+    converged = False
+    fixed_runways, sp_times = None, []
+
+    def add_master_hints(hint_runways, hint_times):
+        master_model.ClearHints()
+        hint_times = [int(round(t)) for t in hint_times]
+        for i in range(num_planes):
+            master_model.AddHint(r[i], hint_runways[i])
+            master_model.AddHint(x_m[i], hint_times[i])
+            master_model.AddHint(alpha_m[i], max(T[i] - hint_times[i], 0))
+            master_model.AddHint(beta_m[i], max(hint_times[i] - T[i], 0))
+        for i, j in order_pairs:
+            lands_first = hint_times[i] < hint_times[j] or (hint_times[i] == hint_times[j] and i < j)
+            master_model.AddHint(before[(i, j)], 1 if lands_first else 0)
+
+    # Initial hint, e.g. the previous plan of the online scheduler: (runways, times)
+    if hint_solution is not None:
+        add_master_hints(*hint_solution)
+
+    def accept_incumbent(schedule):
+        # Feasible schedule from another engine, (runways, times): kept if it beats the best one
+        nonlocal best_cost, best_cost_int, best_runways, best_times
+        inc_runways, inc_times = list(schedule[0]), [int(round(t)) for t in schedule[1]]
+        inc_cost = float(np.dot(instance.penalty_early, np.maximum(instance.target - inc_times, 0))
+                         + np.dot(instance.penalty_late, np.maximum(inc_times - instance.target, 0)))
+        inc_cost_int = scale.scale_cost(inc_cost)
+        if best_cost_int is not None and inc_cost_int >= best_cost_int:
+            return
+        best_cost, best_cost_int, best_runways, best_times = inc_cost, inc_cost_int, inc_runways, inc_times
+        if warm_start:
+            master_model.Add(theta <= best_cost_int)
+            add_master_hints(best_runways, best_times)
+            master_model.AddHint(theta, best_cost_int)
+
+    if incumbent is not None:
+        accept_incumbent(incumbent)
 
     # Main Loop
     solver = cp_model.CpSolver()
     # solver.parameters.log_search_progress = True # Optional: see CP logs
+    if master_time_limit is not None:
+        solver.parameters.max_time_in_seconds = master_time_limit
+
+    collector = MasterSolutionCollector(r, before, theta, num_solutions) if num_solutions > 1 else None
 
     iteration = 0
 
@@ -183,8 +774,16 @@ def solve_hybrid_lbbd(num_planes, num_runways, planes_data, separation_times, se
         iteration += 1
         print(f"--- Iteration {iteration} ---")
 
+        # Schedules found meanwhile by other engines (e.g. portfolio members)
+        if poll_incumbent is not None:
+            schedule = poll_incumbent()
+            if schedule is not None:
+                accept_incumbent(schedule)
+
         solver.parameters.search_branching = search_strategy
-        status = solver.Solve(master_model)
+        if collector is not None:
+            collector.reset()
+        status = solver.Solve(master_model, collector)
 
         if performance:
             perf.update_cp_metrics(solver, master_model)
@@ -194,68 +793,133 @@ def solve_hybrid_lbbd(num_planes, num_runways, planes_data, separation_times, se
             break
 
         current_theta = solver.Value(theta)
+        # Lower bound proven by the master (theta itself when solved to optimality)
+        master_bound = scale.scale_cost(solver.BestObjectiveBound())
 
         # Extract Solution
         fixed_runways = [solver.Value(r[i]) for i in range(num_planes)]
         fixed_before = {}
         for i, j in U:
             fixed_before[(i, j)] = solver.Value(before[(i, j)])
+        master_times = [solver.Value(x_m[i]) for i in range(num_planes)]
+
+        # Earlier improving solutions of the same solve are evaluated too; the
+        # master optimum goes last so it sets fixed_runways/sp_times below
+        solutions = [(fixed_runways, fixed_before, current_theta)]
+        if collector is not None:
+            final_key = (tuple(fixed_runways), tuple(fixed_before[pair] for pair in before))
+            solutions[:0] = [(runways, sol_before, sol_theta)
+                             for key, runways, sol_before, sol_theta in collector.solutions if key != final_key]
+
+        # Solve Subproblems (LP), concurrently when there are several
+        num_cuts, previous_best = cut_pool.num_cuts, best_cost_int
+        sp_start = time.time()
+        results = evaluate(solutions)
+        sp_wall_time = time.time() - sp_start
+
+        for (fixed_runways, fixed_before, sol_theta), result in zip(solutions, results):
+            sp_status, sp_cost, sp_times, sp_time, binding, sequences, blocks, runway_cost = result
+            if performance:
+                perf.update_mip_metrics(sp_time)
+
+            if sp_status == "INFEASIBLE":
+                print(f"  >> Subproblem INFEASIBLE (Should be rare with Strengthened Master).")
+                infeasible_runways = [rw for rw, b in blocks.items() if b is None]
+                for rw in infeasible_runways:
+                    cut_pool.add_block_nogood(sequences[rw], rw)
+                if not infeasible_runways:
+                    cut_pool.add_assignment_nogood(fixed_runways, fixed_before)
+
+            elif sp_status == "OPTIMAL":
+                sp_cost_int = scale.scale_cost(sp_cost)
+                print(f"  >> Master Theta: {scale.unscale(sol_theta):.2f} | Subproblem Real Cost: {sp_cost:.2f}")
+
+                if best_cost_int is None or sp_cost_int < best_cost_int:
+                    best_cost, best_cost_int = sp_cost, sp_cost_int
+                    best_runways, best_times = fixed_runways, sp_times
+                    if warm_start:
+                        # Incumbent bound: the master optimum can never lie above a known schedule.
+                        # Each new bound is a new constraint; the older ones are implied by it
+                        master_model.Add(theta <= best_cost_int)
+
+                if sp_cost_int > sol_theta:
+                    print(f"  >> Gap found. Adding Optimality Cut.")
+                    if cut_mode == "dual":
+                        cut_pool.add_dual_cut(*dual_cut(binding, sp_cost))
+                    else:
+                        block_cuts = [
+                            (planes, rw, scale.scale_bound(cost))
+                            for rw, runway_blocks in blocks.items() if runway_blocks
+                            for planes, cost in runway_blocks
+                        ]
+                        cut_pool.add_block_cut(block_cuts)
+
+                        # The blocks ignore between-runway and non-consecutive separations; with
+                        # independent runways cover the rest per runway, else with a full cut
+                        covered = sum(cost for _, _, cost in block_cuts)
+                        if covered < sp_cost_int and runway_cost is not None:
+                            runway_cuts = [(sequences[rw], rw, scale.scale_bound(cost)) for rw, cost in runway_cost.items()]
+                            cut_pool.add_block_cut(runway_cuts)
+                            covered = sum(cost for _, _, cost in runway_cuts)
+                        if covered < sp_cost_int:
+                            cut_pool.add_assignment_cut(fixed_runways, fixed_before, sp_cost_int)
+
+        print(f"  >> Cut pool: {cut_pool.num_cuts} cuts, {cut_pool.num_duplicates} duplicates skipped")
 
-        # Solve Subproblem (LP)
         if performance:
-            lp_start = time.time()
-        sp_status, sp_cost, sp_times = solve_subproblem_lp(
-            num_planes, planes_data, separation_times, separation_between_runways,
-            fixed_runways, fixed_before, W, V, U
-        )
-        if performance:
-            lp_time = time.time() - lp_start
-            perf.update_mip_metrics(lp_time)
-
-        # Function to create boolean literals for cuts
-        def create_literals():
-            lits = []
-            for i in range(num_planes):
-                # Reify Integer variable r[i]
-                b = master_model.NewBoolVar(f'reify_r{i}_it{iteration}')
-                val = fixed_runways[i]
-                master_model.Add(r[i] == val).OnlyEnforceIf(b)
-                master_model.Add(r[i] != val).OnlyEnforceIf(b.Not())
-                lits.append(b)
-            for (i,j), val in fixed_before.items():
-                lits.append(before[(i,j)] if val else before[(i,j)].Not())
-            return lits
-
-        if sp_status == "INFEASIBLE":
-            print(f"  >> Subproblem INFEASIBLE (Should be rare with Strengthened Master).")
-            lits = create_literals()
-            master_model.AddBoolOr([l.Not() for l in lits])
-
-        elif sp_status == "OPTIMAL":
-            sp_cost_int = math.ceil(sp_cost)
-            print(f"  >> Master Theta: {current_theta} | Subproblem Real Cost: {sp_cost_int}")
-
-            # Check Convergence
-            # Tolerance 1e-4 for float issues
-            if sp_cost_int <= current_theta + 1e-4:
-                print(f"\n*** CONVERGENCE ACHIEVED in {iteration} iterations! ***")
-                print_solution(sp_times, fixed_runways, sp_cost, num_planes, planes_data)
-                break
+            perf.record_iteration(
+                iteration=iteration,
+                master_status=solver.StatusName(status),
+                master_time=round(solver.WallTime(), 7),
+                master_branches=solver.NumBranches(),
+                master_conflicts=solver.NumConflicts(),
+                master_objective=scale.unscale(current_theta),
+                master_bound=scale.unscale(master_bound),
+                subproblem_cost=round(sp_cost, 2) if sp_status == "OPTIMAL" else None,
+                num_solutions=len(solutions),
+                subproblem_time=round(sp_wall_time, 7),
+                best_cost=round(best_cost, 2) if best_cost is not None else None,
+                num_cuts=cut_pool.num_cuts,
+            )
+
+        # Check Convergence (scaled integer units): the best schedule reaches the master's lower bound
+        if best_cost_int is not None and best_cost_int <= master_bound:
+            converged = True
+            print(f"\n*** CONVERGENCE ACHIEVED in {iteration} iterations! ***")
+            print_solution(best_times, best_runways, best_cost, num_planes, planes_data)
+            break
+
+        # A master stopped by its time limit proves no bound with theta: without a
+        # new cut or incumbent bound the next solve faces the same model, so
+        # return the incumbent
+        if status == cp_model.FEASIBLE and cut_pool.num_cuts == num_cuts and (
+                not warm_start or best_cost_int == previous_best):
+            print(f"\n*** Master hit its time limit without a new cut; stopping after {iteration} iterations. ***")
+            break
+
+        if warm_start:
+            # Hint the next master with the best schedule (feasible: cuts only raise theta),
+            # or with the previous master solution while no schedule is known
+            if best_times is not None:
+                add_master_hints(best_runways, best_times)
+                master_model.AddHint(theta, best_cost_int)
             else:
-                print(f"  >> Gap found. Adding Optimality Cut.")
-                lits = create_literals()
-                is_same = master_model.NewBoolVar(f'match_{iteration}')
-                master_model.AddBoolAnd(lits).OnlyEnforceIf(is_same)
-                master_model.AddBoolOr([l.Not() for l in lits]).OnlyEnforceIf(is_same.Not())
+                add_master_hints(fixed_runways, master_times)
 
-                # Benders Cut
-                master_model.Add(theta >= sp_cost_int).OnlyEnforceIf(is_same)
+    evaluator.close()
 
     if performance:
-        perf.return_metrics(iterations = iteration, converged=(sp_status=="OPTIMAL" and sp_cost_int <= current_theta + 1e-4) )
+        if cache:
+            perf.update_cache_metrics(
+                hits=evaluator.hits,
+                misses=evaluator.misses,
+                runway_hits=evaluator.runway_hits,
+                runway_misses=evaluator.runway_misses,
+            )
+        perf.return_metrics(iterations = iteration, converged=converged)
         perf.stop()
         metrics = {
-            "total_best_objective_bound": round(sp_cost, 2) if sp_status=="OPTIMAL" else None,
+            "total_best_objective_bound": round(best_cost, 2) if best_cost is not None else None,
             "num_iterations": iteration,
             "converged": perf.converged,
             "total_time": perf.get_total_wall_time(),
@@ -267,11 +931,23 @@ def solve_hybrid_lbbd(num_planes, num_runways, planes_data, separation_times, se
             "cp_num_booleans": perf.cp_num_booleans,
             "cp_num_variables": perf.cp_num_variables,
             "cp_num_constraints": perf.cp_num_constraints,
-            "memory_start_MB": round(perf.memory_peak / 1024, 7)
+            "num_cuts": cut_pool.num_cuts,
+            "num_duplicate_cuts": cut_pool.num_duplicates,
+            "cache_hits": perf.cache_hits,
+            "cache_misses": perf.cache_misses,
+            "runway_cache_hits": perf.runway_cache_hits,
+            "runway_cache_misses": perf.runway_cache_misses,
+            "memory_start_MB": round(perf.memory_peak / 1024, 7),
+            "iterations": perf.iteration_stats
         }
+    if best_times is not None:
+        fixed_runways, sp_times = best_runways, best_times
     return solver, master_model, fixed_runways, sp_times, metrics if performance else None
 
 def print_solution(times, runways, cost, num_planes, planes_data):
+    if isinstance(planes_data, AirlandInstance):
+        planes_data = planes_data.planes
+
     plane_ids = [str(i) for i in range(num_planes)]
     landing_times = [f"{times[i]:.2f}" for i in range(num_planes)]
     earliest = [f"{planes_data[i]['earliest_landing_time']:.2f}" for i in range(num_planes)]
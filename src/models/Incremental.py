@@ -0,0 +1,124 @@
+import contextlib
+import io
+import time
+from dataclasses import dataclass, replace
+
+import numpy as np
+
+from models.Engines import ENGINES, schedule_cost, solve_with_engine
+from others.utils import as_instance
+
+
+# Incremental re-optimisation
+# When a few planes change (target, window, penalties), only a neighbourhood
+# around them is re-solved: the changed planes and every plane planned close
+# to their old landing time or new target. The other planes keep their time
+# and runway (keep="fix"; only those whose separations can reach the
+# neighbourhood enter the model) or stay free but start from the old
+# schedule (keep="hint"). An infeasible neighbourhood is widened until it
+# covers the whole instance.
+@dataclass
+class ReoptimizedSolution:
+    status: str
+    cost: float
+    times: list         # landing time of every plane
+    runways: list       # 0-based runway of every plane
+    neighborhood: list  # planes that were re-optimised
+    radius: int
+    solve_time: float
+
+
+def apply_changes(instance, changes):
+    """Copy of instance with per-plane overrides, e.g. {3: {"target": 520,
+    "latest": 700}}. Fields: earliest, target, latest, penalty_early, penalty_late."""
+    fields = {}
+    for i, values in changes.items():
+        for field_name, value in values.items():
+            if field_name not in ("earliest", "target", "latest", "penalty_early", "penalty_late"):
+                raise ValueError(f"Unknown plane field '{field_name}'.")
+            fields.setdefault(field_name, getattr(instance, field_name).copy())[i] = value
+    return replace(instance, **fields)
+
+
+def _neighborhood(instance, times, changed, radius):
+    changed = np.asarray(sorted(changed), dtype=np.int64)
+    lo = np.minimum(times[changed], instance.target[changed]) - radius
+    hi = np.maximum(times[changed], instance.target[changed]) + radius
+    close = ((times[:, None] >= lo[None, :]) & (times[:, None] <= hi[None, :])).any(axis=1)
+    close[changed] = True
+    return close
+
+
+def reoptimize(num_planes, num_runways, planes_data, separation_times, separation_between_runways, solution,
+               changed_planes, engine="cp", radius=None, keep="fix", time_limit=None, presolve=True, **options):
+    """Updates an existing schedule (times, runways numbered from 0, e.g. from
+    load_solution) after changed_planes were modified in planes_data.
+    radius (time units) sizes the first neighbourhood, by default three times
+    the largest separation."""
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown engine '{engine}', expected one of {list(ENGINES)}.")
+    if keep not in ("fix", "hint"):
+        raise ValueError(f"Unknown keep '{keep}', expected 'fix' or 'hint'.")
+
+    start_time = time.time()
+    instance = as_instance(planes_data, separation_times)
+    between = None
+    if num_runways > 1:
+        between = (np.zeros((num_planes, num_planes), dtype=np.int32) if separation_between_runways is None
+                   else np.asarray(separation_between_runways, dtype=np.int32))
+    old_times = np.round(np.asarray(solution[0], dtype=np.float64)).astype(np.int64)
+    old_runways = np.asarray(solution[1], dtype=np.int64)
+
+    S = instance.separation.astype(np.int64)
+    if between is not None:
+        S = np.maximum(S, between)
+    np.fill_diagonal(S, 0)
+    max_separation = int(S.max()) if num_planes > 1 else 0
+    if radius is None:
+        radius = 3 * max(max_separation, 1)
+    span = int(instance.latest.max() - instance.earliest.min())
+
+    while True:
+        free = np.ones(num_planes, dtype=bool) if keep == "hint" else _neighborhood(instance, old_times, changed_planes, radius)
+        if keep == "hint":
+            planes = np.arange(num_planes)
+        else:
+            # Fixed planes only matter if a separation can reach the free ones
+            lo = int(instance.earliest[free].min()) - max_separation
+            hi = int(instance.latest[free].max()) + max_separation
+            planes = np.flatnonzero(free | ((old_times >= lo) & (old_times <= hi)))
+
+        sub = instance.subset(planes)
+        is_free = free[planes]
+        sub = replace(sub,
+                      earliest=np.where(is_free, sub.earliest, old_times[planes]),
+                      latest=np.where(is_free, sub.latest, old_times[planes]))
+        fixed_runways = {k: int(old_runways[i]) for k, i in enumerate(planes.tolist()) if not free[i]}
+        hint = (np.clip(old_times[planes], sub.earliest, sub.latest).tolist(), old_runways[planes].tolist())
+        sub_between = None if between is None else between[np.ix_(planes, planes)]
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            status, times, runways = solve_with_engine(
+                engine, sub, num_runways, sub_between, time_limit, presolve,
+                fixed_runways=fixed_runways, hint=hint, **options
+            )
+        if times is not None or free.all() or radius > span:
+            break
+        print(f"-> Neighbourhood of {int(free.sum())} planes is {status}, widening it")
+        radius *= 2
+
+    if times is None:
+        new_times, new_runways, cost = None, None, None
+    else:
+        new_times = old_times.astype(np.float64)
+        new_runways = old_runways.copy()
+        new_times[planes] = times
+        new_runways[planes] = runways
+        cost = schedule_cost(instance, new_times)
+        new_times, new_runways = new_times.tolist(), new_runways.tolist()
+
+    solve_time = time.time() - start_time
+    print(f"-> Re-optimised {int(free.sum())} of {num_planes} planes: {status} | "
+          f"Cost: {cost if cost is None else round(cost, 2)} | {solve_time:.4f}s")
+    return ReoptimizedSolution(status=status, cost=cost, times=new_times, runways=new_runways,
+                               neighborhood=np.flatnonzero(free).tolist(), radius=radius, solve_time=solve_time)
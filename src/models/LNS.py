@@ -0,0 +1,237 @@
+import contextlib
+import io
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, replace
+
+import numpy as np
+
+from models.Engines import schedule_cost, solve_with_engine
+from others.heuristic import greedy_schedule, is_feasible_schedule
+from others.presolve import presolve_windows
+from others.utils import as_instance
+
+NEIGHBORHOODS = ("time", "runway", "cluster")
+
+
+# Large neighbourhood search on top of the CP model
+# Every step frees a neighbourhood of the incumbent and re-solves it with
+# create_cp_model_multiple_runway under a short time limit: the free planes
+# keep their (presolved) windows, every other plane whose separations can
+# reach them enters the model with its time and runway fixed, and the
+# incumbent is the hint. Neighbourhoods are a slice of consecutive landings,
+# a slice of one runway, or a cluster of the V/U conflict graph. Several
+# neighbourhoods are solved per round in a process pool; their improvements
+# are merged into the incumbent as long as the schedule stays feasible.
+@dataclass
+class LNSStep:
+    elapsed: float      # seconds since the start
+    cost: float         # incumbent cost after the step
+    neighborhood: str
+    size: int           # free planes
+    status: str
+
+
+@dataclass
+class LNSSolution:
+    status: str
+    cost: float
+    times: list         # landing time of every plane
+    runways: list       # 0-based runway of every plane
+    history: list       # [LNSStep], the initial solution first
+    num_improvements: int
+    wall_time: float
+
+
+def _conflict_graph(num_planes, pairs):
+    neighbors = [[] for _ in range(num_planes)]
+    for pair_set in (pairs.V, pairs.U):
+        for i, j in pair_set.tolist():
+            neighbors[i].append(j)
+            neighbors[j].append(i)
+    return neighbors
+
+
+def _pick_neighborhood(kind, rng, size, times, runways, num_runways, neighbors):
+    n = len(times)
+    if kind == "cluster":
+        seed = int(rng.integers(n))
+        free, frontier = {seed}, [seed]
+        while frontier and len(free) < size:
+            i = frontier.pop(int(rng.integers(len(frontier))))
+            for j in rng.permutation(neighbors[i]).tolist():
+                if j not in free and len(free) < size:
+                    free.add(j)
+                    frontier.append(j)
+        return np.array(sorted(free), dtype=np.int64)
+
+    # Slices of consecutive landings, over all runways or over one of them
+    candidates = np.arange(n)
+    if kind == "runway" and num_runways > 1:
+        candidates = np.flatnonzero(runways == int(rng.integers(num_runways)))
+        if len(candidates) == 0:
+            candidates = np.arange(n)
+    order = candidates[np.argsort(times[candidates], kind="stable")]
+    start = int(rng.integers(max(len(order) - size, 0) + 1))
+    return np.sort(order[start:start + size])
+
+
+def _neighborhood_instance(instance, windows, between, reach, times, runways, free_planes):
+    # Fixed planes only matter if a separation can reach the free windows
+    free = np.zeros(instance.num_planes, dtype=bool)
+    free[free_planes] = True
+    lo = int(windows.earliest[free].min()) - reach
+    hi = int(windows.latest[free].max()) + reach
+    planes = np.flatnonzero(free | ((times >= lo) & (times <= hi)))
+
+    is_free = free[planes]
+    sub = instance.subset(planes)
+    sub = replace(sub,
+                  earliest=np.where(is_free, windows.earliest[planes], times[planes]),
+                  latest=np.where(is_free, windows.latest[planes], times[planes]))
+    fixed_runways = {k: int(runways[i]) for k, i in enumerate(planes.tolist()) if not free[i]}
+    hint = (times[planes].tolist(), runways[planes].tolist())
+    sub_between = None if between is None else between[np.ix_(planes, planes)]
+    return planes, sub, sub_between, fixed_runways, hint
+
+
+def _solve_neighborhood(sub, num_runways, sub_between, time_limit, search_workers, fixed_runways, hint, options):
+    # Runs in a worker process; the engine's own report is silenced
+    with contextlib.redirect_stdout(io.StringIO()):
+        return solve_with_engine("cp", sub, num_runways, sub_between, time_limit, True, search_workers,
+                                 fixed_runways=fixed_runways, hint=hint, **options)
+
+
+def solve_lns(num_planes, num_runways, planes_data, separation_times, separation_between_runways=None,
+              time_budget=60, step_time_limit=2, neighborhood_size=30, neighborhoods=NEIGHBORHOODS,
+              num_workers=None, initial_solution=None, initial_time_limit=None, seed=0, presolve=True, **options):
+    """Improves a schedule by large neighbourhood search within time_budget
+    seconds (wall clock). initial_solution is a (times, runways) schedule with
+    runways numbered from 0; without one, the full CP model is solved for
+    initial_time_limit seconds (a fifth of the budget by default), hinted
+    with the constructive heuristic.
+    neighborhood_size is the starting number of free planes; it grows while
+    neighbourhoods are solved to optimality and shrinks while they time out.
+    options go to the CP engine (formulation)."""
+    for kind in neighborhoods:
+        if kind not in NEIGHBORHOODS:
+            raise ValueError(f"Unknown neighbourhood '{kind}', expected one of {list(NEIGHBORHOODS)}.")
+
+    start_time = time.time()
+    instance = as_instance(planes_data, separation_times)
+    between = None
+    if num_runways > 1:
+        between = (np.zeros((num_planes, num_planes), dtype=np.int32) if separation_between_runways is None
+                   else np.asarray(separation_between_runways, dtype=np.int32))
+    windows = presolve_windows(instance, between, tighten=presolve)
+    neighbors = _conflict_graph(num_planes, windows.pairs)
+    S = instance.separation.astype(np.int64)
+    if between is not None:
+        S = np.maximum(S, between)
+    np.fill_diagonal(S, 0)
+    reach = int(S.max()) if num_planes > 1 else 0
+    rng = np.random.default_rng(seed)
+
+    print("\n" + "=" * 60)
+    print(f"\t\tRunning LNS ({num_runways} runways, budget {time_budget}s)")
+    print("=" * 60, "\n")
+
+    status = "FEASIBLE"
+    if initial_solution is None:
+        if initial_time_limit is None:
+            initial_time_limit = time_budget / 5
+        # The constructive schedule hints the CP model and is kept if CP finds nothing better in time
+        greedy = greedy_schedule(instance, num_runways, between, windows.earliest, windows.latest)
+        hint = None if greedy is None else greedy[:2]
+        with contextlib.redirect_stdout(io.StringIO()):
+            status, times, runways = solve_with_engine(
+                "cp", instance, num_runways, between, initial_time_limit, presolve, hint=hint, **options
+            )
+        if greedy is not None and (times is None or greedy[2] < schedule_cost(instance, times)):
+            status, (times, runways, _) = "FEASIBLE", greedy
+        if times is None:
+            print(f"-> No initial solution: {status}")
+            return LNSSolution(status=status, cost=None, times=None, runways=None, history=[],
+                               num_improvements=0, wall_time=time.time() - start_time)
+    else:
+        times, runways = initial_solution
+    times = np.round(np.asarray(times, dtype=np.float64)).astype(np.int64)
+    runways = np.asarray(runways, dtype=np.int64)
+    cost = schedule_cost(instance, times)
+    history = [LNSStep(elapsed=time.time() - start_time, cost=cost, neighborhood="initial",
+                       size=num_planes, status=status)]
+    print(f"-> Initial cost: {cost:.2f} ({status}) | {history[0].elapsed:.4f}s")
+
+    max_workers = max(1, num_workers or os.cpu_count() or 1)
+    # The cores are shared between the processes instead of every solver taking all of them
+    search_workers = max(1, (os.cpu_count() or 1) // max_workers)
+    size = min(neighborhood_size, num_planes)
+    num_improvements = 0
+    executor = ProcessPoolExecutor(max_workers=max_workers) if max_workers > 1 else None
+    try:
+        while status != "OPTIMAL":
+            remaining = time_budget - (time.time() - start_time)
+            if remaining <= 0.1:
+                break
+            step_limit = min(step_time_limit, remaining)
+
+            # One neighbourhood per worker, from the same incumbent
+            tasks = []
+            for k in range(max_workers):
+                kind = neighborhoods[(len(history) + k) % len(neighborhoods)]
+                free_planes = _pick_neighborhood(kind, rng, size, times, runways, num_runways, neighbors)
+                tasks.append((kind, free_planes,
+                              _neighborhood_instance(instance, windows, between, reach, times, runways, free_planes)))
+            if executor is None:
+                results = [_solve_neighborhood(sub, num_runways, sub_between, step_limit, search_workers,
+                                               fixed_runways, hint, options)
+                           for _, _, (_, sub, sub_between, fixed_runways, hint) in tasks]
+            else:
+                futures = [executor.submit(_solve_neighborhood, sub, num_runways, sub_between, step_limit,
+                                           search_workers, fixed_runways, hint, options)
+                           for _, _, (_, sub, sub_between, fixed_runways, hint) in tasks]
+                results = [future.result() for future in futures]
+
+            # Best neighbourhood first; the others are merged only if they still fit
+            candidates = []
+            for (kind, free_planes, (planes, *_)), (step_status, sub_times, sub_runways) in zip(tasks, results):
+                if sub_times is None:
+                    continue
+                new_times = times.copy()
+                new_runways = runways.copy()
+                new_times[planes] = np.round(sub_times).astype(np.int64)
+                new_runways[planes] = sub_runways
+                candidates.append((schedule_cost(instance, new_times), kind, free_planes, step_status,
+                                   new_times[free_planes], new_runways[free_planes]))
+            candidates.sort(key=lambda candidate: candidate[0])
+
+            for candidate_cost, kind, free_planes, step_status, free_times, free_runways in candidates:
+                new_times = times.copy()
+                new_runways = runways.copy()
+                new_times[free_planes] = free_times
+                new_runways[free_planes] = free_runways
+                new_cost = schedule_cost(instance, new_times)
+                if new_cost < cost - 1e-6 and is_feasible_schedule(instance, new_times, new_runways, between):
+                    times, runways, cost = new_times, new_runways, new_cost
+                    num_improvements += 1
+                if len(free_planes) == num_planes and step_status == "OPTIMAL":
+                    status = "OPTIMAL"
+                history.append(LNSStep(elapsed=time.time() - start_time, cost=cost, neighborhood=kind,
+                                       size=len(free_planes), status=step_status))
+
+            # Neighbourhoods the solver closes grow, those it cannot finish shrink
+            statuses = [result[0] for result in results]
+            if all(step_status == "OPTIMAL" for step_status in statuses):
+                size = min(num_planes, max(size + 1, int(size * 1.25)))
+            elif not any(step_status == "OPTIMAL" for step_status in statuses):
+                size = max(2, int(size * 0.8))
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    wall_time = time.time() - start_time
+    print(f"-> Status: {status} | Cost: {cost:.2f} | {num_improvements} improvements in "
+          f"{len(history) - 1} neighbourhoods | Wall time: {wall_time:.4f}s ({max_workers} processes)")
+    return LNSSolution(status=status, cost=cost, times=times.tolist(), runways=runways.tolist(), history=history,
+                       num_improvements=num_improvements, wall_time=wall_time)
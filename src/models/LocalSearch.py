@@ -0,0 +1,343 @@
+import bisect
+import math
+import time
+from dataclasses import dataclass
+
+import numpy as np
+
+from others.heuristic import greedy_schedule, is_feasible_schedule
+from others.timing import chain_timing
+from others.utils import as_instance, save_solution
+
+METHODS = ("annealing", "tabu")
+MOVES = ("swap", "insert", "runway")
+
+
+# Sequence-based local search
+# A schedule is one landing sequence per runway. Moves swap two nearby planes,
+# move a plane a few positions along its runway, or move it to another
+# runway. A move only re-times the planes around it: the runs of planes
+# pushed together by their separation (blocks) that touch the changed
+# positions. They are timed optimally with chain_timing while every plane
+# outside keeps its time and bounds the window through its separations, so a
+# move costs O(window log window) whatever the number of planes. Separations
+# between non-consecutive planes inside the window are folded into the gaps,
+# which is exact when S satisfies the triangle inequality and safe otherwise.
+# The search starts from the constructive heuristic and is driven by
+# simulated annealing or tabu search within a wall-clock budget.
+@dataclass
+class LocalSearchSolution:
+    status: str
+    cost: float
+    times: list         # landing time of every plane
+    runways: list       # 0-based runway of every plane
+    history: list       # [(elapsed seconds, best cost)] at every new best
+    iterations: int
+    accepted: int
+    wall_time: float
+
+
+class _Schedule:
+    def __init__(self, instance, num_runways, between, times, runways, max_window):
+        self.E = instance.earliest.astype(np.int64)
+        self.T = instance.target.astype(np.int64)
+        self.L = instance.latest.astype(np.int64)
+        self.pe = instance.penalty_early
+        self.pl = instance.penalty_late
+        self.S = instance.separation.astype(np.int64)
+        S = self.S.copy()
+        np.fill_diagonal(S, 0)
+        self.reach = int(S.max()) if instance.num_planes > 1 else 0
+        self.between = between
+        self.check_between = between is not None and bool((between > 0).any())
+        self.between_reach = int(between.max()) if self.check_between else 0
+        self.max_window = max_window
+
+        self.times = np.asarray(times, dtype=np.int64).copy()
+        self.runways = np.asarray(runways, dtype=np.int64).copy()
+        self.seqs = [np.flatnonzero(self.runways == r)[np.argsort(self.times[self.runways == r], kind="stable")].tolist()
+                     for r in range(num_runways)]
+        self.cost = self.window_cost(np.arange(instance.num_planes), self.times)
+
+    def window_cost(self, planes, x):
+        return float(np.dot(self.pe[planes], np.maximum(self.T[planes] - x, 0))
+                     + np.dot(self.pl[planes], np.maximum(x - self.T[planes], 0)))
+
+    def _tight(self, seq, k):
+        # Plane k is pushed against plane k - 1
+        return self.times[seq[k]] - self.times[seq[k - 1]] <= self.S[seq[k - 1], seq[k]]
+
+    def window(self, r, lo, hi):
+        """Old positions [a, b) to re-time when positions [lo, hi) change: one
+        plane on each side and the blocks they belong to."""
+        seq = self.seqs[r]
+        a, b = max(lo - 1, 0), min(hi + 1, len(seq))
+        while a > 0 and lo - a < self.max_window and self._tight(seq, a):
+            a -= 1
+        while b < len(seq) and b - hi < self.max_window and self._tight(seq, b):
+            b += 1
+        return a, b
+
+    def retime(self, r, a, b, planes):
+        """Optimal times for planes landing in that order between the fixed
+        planes seq[:a] and seq[b:] of runway r, or None."""
+        if not planes:
+            return np.empty(0, dtype=np.int64)
+        seq = self.seqs[r]
+        W = np.asarray(planes, dtype=np.int64)
+        lb = self.E[W].copy()
+        ub = self.L[W].copy()
+
+        # Fixed planes before and after the window, as far as a separation reaches
+        m = a - 1
+        while m >= 0 and self.times[seq[a - 1]] - self.times[seq[m]] < self.reach:
+            m -= 1
+        before = np.asarray(seq[m + 1:a], dtype=np.int64)
+        if len(before):
+            lb = np.maximum(lb, (self.times[before][:, None] + self.S[before[:, None], W[None, :]]).max(axis=0))
+        m = b
+        while m < len(seq) and self.times[seq[m]] - self.times[seq[b]] < self.reach:
+            m += 1
+        after = np.asarray(seq[b:m], dtype=np.int64)
+        if len(after):
+            ub = np.minimum(ub, (self.times[after][None, :] - self.S[W[:, None], after[None, :]]).min(axis=1))
+
+        # Consecutive gaps large enough for every pair inside the window; the
+        # fold is only needed where S breaks the triangle inequality
+        gaps = self.S[W[:-1], W[1:]].copy()
+        position = np.concatenate(([0], np.cumsum(gaps)))
+        if np.all(np.triu(position[None, :] - position[:, None] - self.S[W[:, None], W[None, :]], 1) >= 0):
+            return chain_timing(lb, self.T[W], ub, self.pe[W], self.pl[W], gaps)
+        for k in range(1, len(W) - 1):
+            cum = 0
+            for p in range(k - 1, -1, -1):
+                cum += gaps[p]
+                if cum >= self.reach:
+                    break
+                gaps[k] = max(gaps[k], self.S[W[p], W[k + 1]] - cum)
+        return chain_timing(lb, self.T[W], ub, self.pe[W], self.pl[W], gaps)
+
+    def cross_runway_ok(self, changes):
+        # Only needed when planes on different runways must be separated
+        times = self.times.copy()
+        runways = self.runways.copy()
+        for r, _, _, planes, x in changes:
+            times[planes] = x
+            runways[planes] = r
+        for r, _, _, planes, x in changes:
+            for i, t in zip(planes, x.tolist()):
+                other = (runways != r) & (np.abs(times - t) < self.between_reach)
+                js = np.flatnonzero(other)
+                if len(js) and not np.all((t - times[js] >= self.between[js, i]) | (times[js] - t >= self.between[i, js])):
+                    return False
+        return True
+
+    def evaluate(self, move):
+        """(delta, changes) of a move, or None if it cannot be timed."""
+        kind = move[0]
+        if kind == "runway":
+            _, r1, p, r2, q = move
+            seq1, seq2 = self.seqs[r1], self.seqs[r2]
+            a1, b1 = self.window(r1, p, p + 1)
+            a2, b2 = self.window(r2, q, q)
+            plane = seq1[p]
+            planes1 = seq1[a1:p] + seq1[p + 1:b1]
+            planes2 = seq2[a2:q] + [plane] + seq2[q:b2]
+            parts = [(r1, a1, b1, planes1), (r2, a2, b2, planes2)]
+            old_planes = seq1[a1:b1] + seq2[a2:b2]
+        else:
+            _, r, p, q = move
+            seq = self.seqs[r]
+            a, b = self.window(r, min(p, q), max(p, q) + 1)
+            planes = seq[a:b]
+            if kind == "swap":
+                planes[p - a], planes[q - a] = planes[q - a], planes[p - a]
+            else:
+                planes.insert(q - a, planes.pop(p - a))
+            parts = [(r, a, b, planes)]
+            old_planes = seq[a:b]
+
+        changes = []
+        new_cost = 0.0
+        for r, a, b, planes in parts:
+            x = self.retime(r, a, b, planes)
+            if x is None:
+                return None
+            changes.append((r, a, b, planes, x))
+            new_cost += self.window_cost(np.asarray(planes, dtype=np.int64), x)
+        if self.check_between and not self.cross_runway_ok(changes):
+            return None
+        old_planes = np.asarray(old_planes, dtype=np.int64)
+        return new_cost - self.window_cost(old_planes, self.times[old_planes]), changes
+
+    def apply(self, delta, changes):
+        # Windows of different runways never overlap, so their positions stay valid
+        for r, a, b, planes, x in changes:
+            self.seqs[r][a:b] = planes
+            self.times[planes] = x
+            self.runways[planes] = r
+        self.cost += delta
+
+
+def _random_move(state, rng, moves, max_shift):
+    n = len(state.times)
+    kind = moves[int(rng.integers(len(moves)))]
+    r = int(state.runways[int(rng.integers(n))])
+    seq = state.seqs[r]
+    p = int(rng.integers(len(seq)))
+
+    if kind == "runway":
+        r2 = int(rng.integers(len(state.seqs) - 1))
+        r2 += r2 >= r
+        # Next to the planes landing at about the same time on the other runway
+        t = state.times[seq[p]]
+        q = bisect.bisect_left(state.seqs[r2], t, key=lambda j: state.times[j]) + int(rng.integers(-1, 2))
+        return ("runway", r, p, r2, min(max(q, 0), len(state.seqs[r2])))
+
+    if len(seq) < 2:
+        return None
+    q = p + int(rng.integers(1, max_shift + 1)) * (1 if rng.random() < 0.5 else -1)
+    q = min(max(q, 0), len(seq) - 1)
+    if q == p:
+        return None
+    if kind == "swap":
+        p, q = min(p, q), max(p, q)
+    return (kind, r, p, q)
+
+
+def _moved_planes(state, move):
+    if move[0] == "runway":
+        return [state.seqs[move[1]][move[2]]]
+    if move[0] == "swap":
+        return [state.seqs[move[1]][move[2]], state.seqs[move[1]][move[3]]]
+    return [state.seqs[move[1]][move[2]]]
+
+
+def solve_local_search(num_planes, num_runways, planes_data, separation_times, separation_between_runways=None,
+                       method="annealing", time_budget=10, max_iterations=None, moves=MOVES, max_shift=5,
+                       max_window=50, initial_solution=None, initial_temperature=None, final_temperature=None,
+                       tabu_tenure=None, tabu_candidates=20, seed=0, solution_file=None, dataset_name=None,
+                       tag=None):
+    """Improves the constructive schedule (or initial_solution, a (times,
+    runways) schedule with runways numbered from 0) by simulated annealing or
+    tabu search within time_budget seconds. The annealing temperature decays
+    geometrically with time from initial_temperature (by default the smallest
+    uphill move of a sample) to final_temperature (1000 times lower by
+    default). With solution_file and dataset_name the best schedule is stored
+    with save_solution (runways numbered from 1, as the Hybrid does)."""
+    if method not in METHODS:
+        raise ValueError(f"Unknown method '{method}', expected one of {list(METHODS)}.")
+    for kind in moves:
+        if kind not in MOVES:
+            raise ValueError(f"Unknown move '{kind}', expected one of {list(MOVES)}.")
+    if num_runways == 1:
+        moves = tuple(kind for kind in moves if kind != "runway")
+    if not moves:
+        raise ValueError("No move left: 'runway' moves need more than one runway.")
+
+    start_time = time.time()
+    instance = as_instance(planes_data, separation_times)
+    between = None
+    if num_runways > 1:
+        between = (np.zeros((num_planes, num_planes), dtype=np.int64) if separation_between_runways is None
+                   else np.asarray(separation_between_runways, dtype=np.int64))
+    rng = np.random.default_rng(seed)
+
+    print("\n" + "=" * 60)
+    print(f"\t\tRunning Local Search ({method}, {num_runways} runways)")
+    print("=" * 60, "\n")
+
+    if initial_solution is None:
+        schedule = greedy_schedule(instance, num_runways, between)
+        if schedule is None:
+            print("-> No initial solution")
+            return LocalSearchSolution(status="NOT_SOLVED", cost=None, times=None, runways=None, history=[],
+                                       iterations=0, accepted=0, wall_time=time.time() - start_time)
+        initial_solution = schedule[:2]
+    state = _Schedule(instance, num_runways, between, np.round(initial_solution[0]), initial_solution[1], max_window)
+    best_cost, best_times, best_runways = state.cost, state.times.copy(), state.runways.copy()
+    history = [(time.time() - start_time, best_cost)]
+    print(f"-> Initial cost: {best_cost:.2f}")
+
+    # Runway loads only change with runway moves; without them, and with no
+    # runway holding two planes, no move exists and the initial schedule stays
+    frozen = "runway" not in moves and all(len(seq) < 2 for seq in state.seqs)
+    if frozen:
+        print("-> No move possible, keeping the initial schedule")
+        max_iterations = 0
+
+    def sample():
+        while True:
+            move = _random_move(state, rng, moves, max_shift)
+            if move is not None:
+                return move
+
+    if method == "annealing":
+        if initial_temperature is None:
+            uphill = [result[0] for result in (state.evaluate(sample()) for _ in range(0 if frozen else 100))
+                      if result is not None and result[0] > 0]
+            # Most uphill moves shift planes far from their target; accepting
+            # only the mildest ones keeps the walk close to good schedules
+            initial_temperature = float(min(uphill)) if uphill else 1.0
+        if final_temperature is None:
+            final_temperature = initial_temperature / 1000
+    if tabu_tenure is None:
+        tabu_tenure = max(1, min(10, num_planes // 4))
+    tabu_until = np.zeros(num_planes, dtype=np.int64)
+
+    iterations = accepted = 0
+    while max_iterations is None or iterations < max_iterations:
+        elapsed = time.time() - start_time
+        if elapsed >= time_budget:
+            break
+        iterations += 1
+
+        if method == "annealing":
+            result = state.evaluate(sample())
+            if result is None:
+                continue
+            delta, changes = result
+            temperature = initial_temperature * (final_temperature / initial_temperature) ** (elapsed / time_budget)
+            if delta > 0 and rng.random() >= math.exp(-delta / temperature):
+                continue
+        else:
+            # Best non-tabu candidate, or a tabu one that beats the best schedule
+            best_move = None
+            for _ in range(tabu_candidates):
+                move = sample()
+                result = state.evaluate(move)
+                if result is None:
+                    continue
+                planes = _moved_planes(state, move)
+                if (tabu_until[planes] > iterations).any() and state.cost + result[0] >= best_cost - 1e-9:
+                    continue
+                if best_move is None or result[0] < best_move[1][0]:
+                    best_move = (planes, result)
+            if best_move is None:
+                continue
+            planes, (delta, changes) = best_move
+            tabu_until[planes] = iterations + tabu_tenure
+
+        state.apply(delta, changes)
+        accepted += 1
+        if state.cost < best_cost - 1e-9:
+            best_cost, best_times, best_runways = state.cost, state.times.copy(), state.runways.copy()
+            history.append((time.time() - start_time, best_cost))
+
+    status = "FEASIBLE" if is_feasible_schedule(instance, best_times, best_runways, between) else "INFEASIBLE"
+    # Recomputed from the times, free of the rounding the deltas accumulate
+    best_cost = state.window_cost(np.arange(num_planes), best_times)
+    wall_time = time.time() - start_time
+    print(f"-> Status: {status} | Cost: {best_cost:.2f} | {accepted} of {iterations} moves accepted | "
+          f"Wall time: {wall_time:.4f}s")
+
+    if solution_file is not None and dataset_name is not None:
+        if tag is None:
+            tag = f"LocalSearch {'Single' if num_runways == 1 else 'Multiple'}"
+        save_solution(None, None, num_planes, instance, solution_file, tag, dataset_name,
+                      num_runways if num_runways > 1 else None, landing_times_override=best_times.tolist(),
+                      fixed_runways=(best_runways + 1).tolist())
+
+    return LocalSearchSolution(status=status, cost=best_cost, times=best_times.tolist(),
+                               runways=best_runways.tolist(), history=history, iterations=iterations,
+                               accepted=accepted, wall_time=wall_time)
@@ -1,10 +1,15 @@
 import tracemalloc, time
+import numpy as np
 from ortools.linear_solver import pywraplp
 from others.performance import PerformanceMIP
+from others.utils import as_instance
+from others.presolve import presolve_windows
+from others.heuristic import greedy_schedule, schedule_hints
+from others.pairs import pair_separations
 
 # Single Runway
 # Model
-def create_mip_model_single_runway(num_planes, planes_data, separation_times):
+def create_mip_model_single_runway(num_planes, planes_data, separation_times, presolve=True):
     print("=" * 60)
     print("\t\tCreating Single Runway MIP Model")
     print("=" * 60, "\n")
@@ -12,84 +17,74 @@ def create_mip_model_single_runway(num_planes, planes_data, separation_times):
     solver = pywraplp.Solver.CreateSolver('SCIP')
     variables = {}
 
+    instance = as_instance(planes_data, separation_times)
+    E = instance.earliest.tolist()
+    T = instance.target.tolist()
+    L = instance.latest.tolist()
+    cost_e = instance.penalty_early.tolist()
+    cost_l = instance.penalty_late.tolist()
+
+    # Tighten [E, L] along the mandatory precedence chains before building bounds
+    windows = presolve_windows(instance, tighten=presolve)
+    E = windows.earliest.tolist()
+    L = windows.latest.tolist()
+
     # Decision Variables
     # x_i: landing times
     landing_times = [
-        solver.NumVar(planes_data[i]["earliest_landing_time"], planes_data[i]["latest_landing_time"], f"x_{i}")
+        solver.NumVar(E[i], L[i], f"x_{i}")
         for i in range(num_planes)
     ]
     variables["landing_time"] = landing_times
 
-    # delta_ij: binary order variables
-    landing_order = {}
-    for i in range(num_planes):
-        for j in range(num_planes):
-            if i != j:
-                landing_order[(i, j)] = solver.BoolVar(f"delta_{i}_{j}")
-    variables["landing_order"] = landing_order
-
     # alpha_i: early deviation
     early_deviation = [
-        solver.NumVar(0, max(planes_data[i]["target_landing_time"] - planes_data[i]["earliest_landing_time"], 0), f"alpha_{i}")
+        solver.NumVar(0, max(T[i] - E[i], 0), f"alpha_{i}")
         for i in range(num_planes)
     ]
     variables["early_deviation"] = early_deviation
 
     # beta_i: late deviation
     late_deviation = [
-        solver.NumVar(0, max(planes_data[i]["latest_landing_time"] - planes_data[i]["target_landing_time"], 0), f"beta_{i}")
+        solver.NumVar(0, max(L[i] - T[i], 0), f"beta_{i}")
         for i in range(num_planes)
     ]
     variables["late_deviation"] = late_deviation
 
     # Sets W, U, V for constraints
-    W, U, V = [], [], []
-    for i in range(num_planes):
-        for j in range(num_planes):
-            if i != j:
-                E_i, L_i = planes_data[i]['earliest_landing_time'], planes_data[i]['latest_landing_time']
-                E_j, L_j = planes_data[j]['earliest_landing_time'], planes_data[j]['latest_landing_time']
-                S_ij = separation_times[i][j]
-
-                if L_i < E_j and L_i + S_ij <= E_j:
-                    W.append((i, j))
-                elif L_i < E_j and L_i + S_ij > E_j:
-                    V.append((i, j))
-                elif (E_j <= E_i <= L_j) or (E_j <= L_i <= L_j) or (E_i <= E_j <= L_i) or (E_i <= L_j <= L_i):
-                    U.append((i, j))
+    pairs = windows.pairs
+    V = pairs.V.tolist()
+    U = pairs.U.tolist()
+    S_V = pair_separations(instance.separation, pairs.V)
+    S_U = pair_separations(instance.separation, pairs.U)
+    S_U_reverse = pair_separations(instance.separation, pairs.U[:, ::-1])
+
+    # delta_ij: binary order variables, only for U pairs (i < j).
+    # delta_ji is 1 - delta_ij; W and V pairs always land in the order i -> j.
+    landing_order = {(i, j): solver.BoolVar(f"delta_{i}_{j}") for i, j in U}
+    variables["landing_order"] = landing_order
 
     # Constraints
-    # Each pair must satisfy delta_ij + delta_ji = 1
-    for i in range(num_planes):
-        for j in range(i + 1, num_planes):
-            solver.Add(landing_order[(i, j)] + landing_order[(j, i)] == 1)
-
-    # W constraints: fixed order
-    for i, j in W:
-        solver.Add(landing_order[(i, j)] == 1)
-
     # V constraints: fixed order + separation time
-    for i, j in V:
-        solver.Add(landing_order[(i, j)] == 1)
-        solver.Add(landing_times[j] >= landing_times[i] + separation_times[i][j])
+    for (i, j), S_ij in zip(V, S_V):
+        solver.Add(landing_times[j] >= landing_times[i] + S_ij)
 
     # U constraints: conditional separation
-    for i, j in U:
+    for (i, j), S_ij, S_ji in zip(U, S_U, S_U_reverse):
         delta_ij = landing_order[(i, j)]
-        delta_ji = landing_order[(j, i)]
-        L_i, E_j = planes_data[i]["latest_landing_time"], planes_data[j]["earliest_landing_time"]
-        solver.Add(landing_times[j] >= landing_times[i] + separation_times[i][j] * delta_ij - (L_i - E_j) * delta_ji)
+        solver.Add(landing_times[j] >= landing_times[i] + S_ij * delta_ij - (L[i] - E[j]) * (1 - delta_ij))
+        solver.Add(landing_times[i] >= landing_times[j] + S_ji * (1 - delta_ij) - (L[j] - E[i]) * delta_ij)
 
     # Early/Late deviation constraints
     for i in range(num_planes):
-        E_i, L_i, T_i = planes_data[i]["earliest_landing_time"], planes_data[i]["latest_landing_time"], planes_data[i]["target_landing_time"]
+        E_i, L_i, T_i = E[i], L[i], T[i]
         solver.Add(early_deviation[i] >= T_i - landing_times[i])
         solver.Add(early_deviation[i] >= 0)
-        solver.Add(early_deviation[i] <= T_i - E_i)
+        solver.Add(early_deviation[i] <= max(T_i - E_i, 0))
 
         solver.Add(late_deviation[i] >= landing_times[i] - T_i)
         solver.Add(late_deviation[i] >= 0)
-        solver.Add(late_deviation[i] <= L_i - T_i)
+        solver.Add(late_deviation[i] <= max(L_i - T_i, 0))
 
         # Link landing time with deviations
         solver.Add(landing_times[i] == T_i - early_deviation[i] + late_deviation[i])
@@ -97,8 +92,8 @@ def create_mip_model_single_runway(num_planes, planes_data, separation_times):
     # Objective Function: minimize penalties
     objective = solver.Objective()
     for i in range(num_planes):
-        objective.SetCoefficient(early_deviation[i], planes_data[i]["penalty_early"])
-        objective.SetCoefficient(late_deviation[i], planes_data[i]["penalty_late"])
+        objective.SetCoefficient(early_deviation[i], cost_e[i])
+        objective.SetCoefficient(late_deviation[i], cost_l[i])
     objective.SetMinimization()
 
     print("-> Decision variables:", solver.NumVariables())
@@ -107,13 +102,18 @@ def create_mip_model_single_runway(num_planes, planes_data, separation_times):
     return solver, variables
 
 # Solver
-def solve_single_runway_mip(num_planes, planes_data, separation_times, hint=False, performance=False):
-    solver, variables = create_mip_model_single_runway(num_planes, planes_data, separation_times)
+def solve_single_runway_mip(num_planes, planes_data, separation_times, hint=False, performance=False, presolve=True):
+    instance = as_instance(planes_data, separation_times)
+    planes_data = instance.planes
+    solver, variables = create_mip_model_single_runway(num_planes, instance, None, presolve=presolve)
 
     if hint:
-        target_times = [planes_data[i]["target_landing_time"] for i in range(num_planes)]
-        for i in range(num_planes):
-            solver.SetHint(variables["landing_time"], target_times)
+        # Complete warm start (and upper bound) from the constructive heuristic, set once
+        schedule = greedy_schedule(instance)
+        if schedule is not None:
+            hints = schedule_hints(variables, instance, schedule[0], schedule[1])
+            solver.SetHint([var for var, _ in hints], [float(value) for _, value in hints])
+            print(f"-> Heuristic upper bound: {schedule[2]:.2f}")
 
     print("\n" + "=" * 60)
     print("\t\t\tSolving MIP")
@@ -234,7 +234,10 @@ def solve_single_runway_mip(num_planes, planes_data, separation_times, hint=Fals
 
 # Multiples Runways
 # Model
-def create_mip_model_multiple_runways(num_planes, planes_data, separation_times, separation_times_between_runways, num_runways):
+def create_mip_model_multiple_runways(num_planes, planes_data, separation_times, separation_times_between_runways, num_runways, presolve=True, big_m="pairwise"):
+    if big_m not in ("pairwise", "global"):
+        raise ValueError("big_m must be 'pairwise' or 'global'.")
+
     print("=" * 60)
     print("\t\tCreating Multiple Runways MIP Solver")
     print("=" * 60, "\n")
@@ -242,101 +245,108 @@ def create_mip_model_multiple_runways(num_planes, planes_data, separation_times,
     solver = pywraplp.Solver.CreateSolver('SCIP')
     variables = {}
 
+    instance = as_instance(planes_data, separation_times)
+    E = instance.earliest.tolist()
+    T = instance.target.tolist()
+    L = instance.latest.tolist()
+    cost_e = instance.penalty_early.tolist()
+    cost_l = instance.penalty_late.tolist()
+    separation_times_between_runways = np.asarray(separation_times_between_runways, dtype=np.int32)
+
+    # Tighten [E, L] along the mandatory precedence chains before building bounds
+    windows = presolve_windows(instance, separation_times_between_runways, tighten=presolve)
+    E = windows.earliest.tolist()
+    L = windows.latest.tolist()
+
     # Decision Variables
     landing_times = [
-        solver.NumVar(planes_data[i]["earliest_landing_time"], planes_data[i]["latest_landing_time"], f"x_{i}")
+        solver.NumVar(E[i], L[i], f"x_{i}")
         for i in range(num_planes)
     ]
     variables["landing_time"] = landing_times
 
-    landing_order = {}
-    for i in range(num_planes):
-        for j in range(num_planes):
-            if i != j:
-                landing_order[(i, j)] = solver.BoolVar(f"delta_{i}_{j}")
-    variables["landing_order"] = landing_order
-
     early_deviation = [
-        solver.NumVar(0, max(planes_data[i]["target_landing_time"] - planes_data[i]["earliest_landing_time"], 0), f"alpha_{i}")
+        solver.NumVar(0, max(T[i] - E[i], 0), f"alpha_{i}")
         for i in range(num_planes)
     ]
     variables["early_deviation"] = early_deviation
 
     late_deviation = [
-        solver.NumVar(0, max(planes_data[i]["latest_landing_time"] - planes_data[i]["target_landing_time"], 0), f"beta_{i}")
+        solver.NumVar(0, max(L[i] - T[i], 0), f"beta_{i}")
         for i in range(num_planes)
     ]
     variables["late_deviation"] = late_deviation
 
     landing_runway = {}
-    same_runway = {}
     for i in range(num_planes):
         for r in range(num_runways):
             landing_runway[(i, r)] = solver.BoolVar(f"y_{i}_{r}")
-        for j in range(num_planes):
-            if i != j:
-                same_runway[(i, j)] = solver.BoolVar(f"z_{i}_{j}")
     variables["landing_runway"] = landing_runway
-    variables["same_runway"] = same_runway
 
     # Sets U, V, W
-    W, U, V = [], [], []
-    for i in range(num_planes):
-        for j in range(num_planes):
-            if i != j:
-                E_i, L_i = planes_data[i]['earliest_landing_time'], planes_data[i]['latest_landing_time']
-                E_j, L_j = planes_data[j]['earliest_landing_time'], planes_data[j]['latest_landing_time']
-                S_ij = separation_times[i][j]
-
-                if L_i < E_j and L_i + S_ij <= E_j:
-                    W.append((i, j))
-                elif L_i < E_j and L_i + S_ij > E_j:
-                    V.append((i, j))
-                elif (E_j <= E_i <= L_j) or (E_j <= L_i <= L_j) or (E_i <= E_j <= L_i) or (E_i <= L_j <= L_i):
-                    U.append((i, j))
+    pairs = windows.pairs
+    V = pairs.V.tolist()
+    U = pairs.U.tolist()
+    S_V = pair_separations(instance.separation, pairs.V)
+    S_U = pair_separations(instance.separation, pairs.U)
+    S_U_reverse = pair_separations(instance.separation, pairs.U[:, ::-1])
+    s_V = pair_separations(separation_times_between_runways, pairs.V)
+    s_U = pair_separations(separation_times_between_runways, pairs.U)
+    s_U_reverse = pair_separations(separation_times_between_runways, pairs.U[:, ::-1])
+
+    # delta_ij only for U pairs (i < j), delta_ji = 1 - delta_ij
+    landing_order = {(i, j): solver.BoolVar(f"delta_{i}_{j}") for i, j in U}
+    variables["landing_order"] = landing_order
+
+    # z_ij only for pairs that carry a separation constraint, keyed with i < j
+    same_runway = {}
+    for i, j in U + [sorted(p) for p in V]:
+        if (i, j) not in same_runway:
+            same_runway[(i, j)] = solver.BoolVar(f"z_{i}_{j}")
+    variables["same_runway"] = same_runway
+
+    def z(i, j):
+        return same_runway[(i, j)] if i < j else same_runway[(j, i)]
 
     # Constraints
-    for i in range(num_planes):
-        for j in range(i+1, num_planes):
-            solver.Add(landing_order[(i, j)] + landing_order[(j, i)] == 1)
-            solver.Add(same_runway[(i,j)] == same_runway[(j,i)])
-            for r in range(num_runways):
-                solver.Add(same_runway[(i,j)] >= landing_runway[(i,r)] + landing_runway[(j,r)] -1)
+    for (i, j), z_ij in same_runway.items():
+        for r in range(num_runways):
+            solver.Add(z_ij >= landing_runway[(i,r)] + landing_runway[(j,r)] -1)
 
     for i in range(num_planes):
         solver.Add(solver.Sum([landing_runway[(i, r)] for r in range(num_runways)]) == 1)
 
-    for i,j in W:
-        solver.Add(landing_order[(i, j)] == 1)
-
-    for i,j in V:
-        solver.Add(landing_order[(i,j)] == 1)
-        solver.Add(landing_times[j] >= landing_times[i] + separation_times[i][j] * same_runway[(i,j)] +
-                   separation_times_between_runways[i][j] * (1 - same_runway[(i,j)]))
+    for (i, j), S_ij, s_ij in zip(V, S_V, s_V):
+        solver.Add(landing_times[j] >= landing_times[i] + S_ij * z(i, j) + s_ij * (1 - z(i, j)))
 
-    BIG_M = max(p["latest_landing_time"] for p in planes_data) + 1000
-    for i, j in U:
+    BIG_M = max(L) + 1000
+    for (i, j), S_ij, S_ji, s_ij, s_ji in zip(U, S_U, S_U_reverse, s_U, s_U_reverse):
         delta_ij = landing_order[(i, j)]
-        delta_ji = landing_order[(j, i)]
+        z_ij = same_runway[(i, j)]
+
+        if big_m == "pairwise":
+            # Smallest M that relaxes each side: x_i - x_j + sep is at most L_i - E_j + max(S_ij, s_ij)
+            M_ij = max(L[i] - E[j] + max(S_ij, s_ij), 0)
+            M_ji = max(L[j] - E[i] + max(S_ji, s_ji), 0)
+        else:
+            M_ij = M_ji = BIG_M
 
         # Make sure only one of the two constraints is active
         solver.Add(
-            landing_times[j] >= landing_times[i] + separation_times[i][j] * same_runway[(i,j)]
-            + separation_times_between_runways[i][j] * (1 - same_runway[(i,j)]) - BIG_M * delta_ji)
+            landing_times[j] >= landing_times[i] + S_ij * z_ij + s_ij * (1 - z_ij) - M_ij * (1 - delta_ij))
 
         solver.Add(
-            landing_times[i] >= landing_times[j] + separation_times[j][i] * same_runway[(i,j)]
-            + separation_times_between_runways[j][i] * (1 - same_runway[(i,j)]) - BIG_M * delta_ij)
+            landing_times[i] >= landing_times[j] + S_ji * z_ij + s_ji * (1 - z_ij) - M_ji * delta_ij)
 
     for i in range(num_planes):
-        E_i, L_i, T_i = planes_data[i]["earliest_landing_time"], planes_data[i]["latest_landing_time"], planes_data[i]["target_landing_time"]
+        E_i, L_i, T_i = E[i], L[i], T[i]
         solver.Add(early_deviation[i] >= T_i - landing_times[i])
         solver.Add(early_deviation[i] >= 0)
-        solver.Add(early_deviation[i] <= T_i - E_i)
+        solver.Add(early_deviation[i] <= max(T_i - E_i, 0))
 
         solver.Add(late_deviation[i] >= landing_times[i] - T_i)
         solver.Add(late_deviation[i] >= 0)
-        solver.Add(late_deviation[i] <= L_i - T_i)
+        solver.Add(late_deviation[i] <= max(L_i - T_i, 0))
 
         solver.Add(landing_times[i] == T_i - early_deviation[i] + late_deviation[i])
 
@@ -344,8 +354,8 @@ def create_mip_model_multiple_runways(num_planes, planes_data, separation_times,
     objective = solver.Objective()
 
     for i in range(num_planes):
-        objective.SetCoefficient(early_deviation[i], planes_data[i]["penalty_early"])
-        objective.SetCoefficient(late_deviation[i], planes_data[i]["penalty_late"])
+        objective.SetCoefficient(early_deviation[i], cost_e[i])
+        objective.SetCoefficient(late_deviation[i], cost_l[i])
 
     objective.SetMinimization()
 
@@ -355,15 +365,21 @@ def create_mip_model_multiple_runways(num_planes, planes_data, separation_times,
     return solver, variables
 
 # Solver
-def solve_multiple_runways_mip(num_planes, num_runways, planes_data, separation_times, separation_times_between_runways, hint=False, performance=False):
+def solve_multiple_runways_mip(num_planes, num_runways, planes_data, separation_times, separation_times_between_runways, hint=False, performance=False, presolve=True, big_m="pairwise"):
+    instance = as_instance(planes_data, separation_times)
+    planes_data = instance.planes
     solver, variables = create_mip_model_multiple_runways(
-        num_planes, planes_data, separation_times, separation_times_between_runways, num_runways
+        num_planes, instance, None, separation_times_between_runways, num_runways, presolve=presolve, big_m=big_m
     )
 
     if hint:
-        target_times = [planes_data[i]["target_landing_time"] for i in range(num_planes)]
-        for i in range(num_planes):
-            solver.SetHint(variables["landing_time"], target_times)
+        # Complete warm start (and upper bound) from the constructive heuristic, set once
+        schedule = greedy_schedule(instance, num_runways, separation_times_between_runways)
+        if schedule is not None:
+            hints = schedule_hints(variables, instance, schedule[0], schedule[1],
+                                   separation_times_between_runways)
+            solver.SetHint([var for var, _ in hints], [float(value) for _, value in hints])
+            print(f"-> Heuristic upper bound: {schedule[2]:.2f}")
 
     print("\n" + "=" * 60)
     print("\t\t\tSolving MIP")
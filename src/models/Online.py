@@ -0,0 +1,150 @@
+import contextlib
+import io
+import time
+from dataclasses import dataclass, replace
+
+import numpy as np
+
+from models.Engines import ENGINES, schedule_cost, solve_with_engine
+from others.utils import as_instance
+
+
+# Rolling-horizon online scheduling
+# Planes become known at their appearance time. At every appearance event the
+# planes planned to land within freeze_time of now are frozen (time and
+# runway), and the known planes that are not frozen are re-optimised with any
+# engine, together with the frozen planes whose separations can still reach
+# them. Every re-optimisation is warm-started from the previous plan.
+@dataclass
+class OnlineEvent:
+    time: int
+    num_released: int   # planes known at this event
+    num_active: int     # planes re-optimised
+    num_frozen: int     # planes frozen so far
+    status: str
+    latency: float      # seconds from the event to the new plan
+
+
+@dataclass
+class OnlineSolution:
+    status: str
+    cost: float
+    times: list         # final landing time of every plane
+    runways: list       # 0-based runway of every plane
+    events: list        # [OnlineEvent]
+    offline_status: str = None
+    offline_cost: float = None
+
+
+def _separation_reach(instance, separation_between_runways=None):
+    # Largest separation every plane imposes on another one
+    S = instance.separation.astype(np.int64)
+    if separation_between_runways is not None:
+        S = np.maximum(S, separation_between_runways)
+    np.fill_diagonal(S, 0)
+    return S.max(axis=1) if instance.num_planes > 1 else np.zeros(instance.num_planes, dtype=np.int64)
+
+
+def solve_online(num_planes, num_runways, planes_data, separation_times, separation_between_runways=None,
+                 engine="cp", freeze_time=None, time_limit=None, offline=True, presolve=True, **options):
+    """Replays the instance event by event (appearance times) and returns the
+    resulting schedule with the decision latency of every event. freeze_time
+    defaults to the instance's; time_limit applies to every re-optimisation.
+    With offline=True the full instance is also solved with the same engine
+    to report the cost of deciding online."""
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown engine '{engine}', expected one of {list(ENGINES)}.")
+
+    instance = as_instance(planes_data, separation_times)
+    if freeze_time is None:
+        freeze_time = instance.freeze_time
+    between = None
+    if num_runways > 1:
+        between = (np.zeros((num_planes, num_planes), dtype=np.int32) if separation_between_runways is None
+                   else np.asarray(separation_between_runways, dtype=np.int32))
+    reach = _separation_reach(instance, between)
+
+    print("\n" + "=" * 60)
+    print(f"\t\tRunning Online Scheduler ({engine.upper()}, freeze time {freeze_time})")
+    print("=" * 60, "\n")
+
+    plan_times = np.full(num_planes, np.nan)
+    plan_runways = np.zeros(num_planes, dtype=np.int64)
+    frozen = np.zeros(num_planes, dtype=bool)
+    events = []
+    status = "OPTIMAL"
+
+    for t in np.unique(instance.appearance).tolist():
+        event_start = time.time()
+
+        # Landings planned inside the freeze window can no longer move
+        frozen |= ~np.isnan(plan_times) & (plan_times <= t + freeze_time)
+        released = instance.appearance <= t
+        active = released & ~frozen
+        if not active.any():
+            continue
+
+        # Frozen planes only matter while their separations reach past now
+        blocking = frozen & (plan_times + reach >= t)
+        planes = np.flatnonzero(active | blocking)
+        sub = instance.subset(planes)
+        frozen_times = np.round(np.nan_to_num(plan_times[planes])).astype(np.int64)
+        is_frozen = frozen[planes]
+        # Nothing lands in the past
+        earliest = np.where(is_frozen, frozen_times, np.maximum(sub.earliest, t))
+        latest = np.where(is_frozen, frozen_times, sub.latest)
+        sub = replace(sub, earliest=earliest, latest=latest)
+
+        # Warm start: the previous plan, new planes as close to their target as allowed
+        planned = ~np.isnan(plan_times[planes])
+        hint_times = np.where(planned, frozen_times, np.clip(sub.target, earliest, latest))
+        hint = (hint_times.tolist(), plan_runways[planes].tolist())
+        fixed_runways = {k: int(plan_runways[i]) for k, i in enumerate(planes.tolist()) if frozen[i]}
+
+        sub_between = None if between is None else between[np.ix_(planes, planes)]
+        with contextlib.redirect_stdout(io.StringIO()):
+            event_status, times, runways = solve_with_engine(
+                engine, sub, num_runways, sub_between, time_limit, presolve,
+                fixed_runways=fixed_runways, hint=hint, **options
+            )
+        latency = time.time() - event_start
+
+        events.append(OnlineEvent(time=t, num_released=int(released.sum()), num_active=int(active.sum()),
+                                  num_frozen=int(frozen.sum()), status=event_status, latency=latency))
+        print(f"t={t:>6} | released {int(released.sum()):>4} | active {int(active.sum()):>4} | "
+              f"frozen {int(frozen.sum()):>4} | {event_status} | {latency:.4f}s")
+
+        if times is None:
+            status = event_status
+            break
+        if event_status != "OPTIMAL":
+            status = "FEASIBLE"
+
+        for k, i in enumerate(planes.tolist()):
+            if active[i]:
+                plan_times[i] = times[k]
+                plan_runways[i] = runways[k]
+
+    if status in ("OPTIMAL", "FEASIBLE"):
+        times = plan_times.tolist()
+        runways = plan_runways.tolist()
+        cost = schedule_cost(instance, plan_times)
+    else:
+        times, runways, cost = None, None, None
+
+    solution = OnlineSolution(status=status, cost=cost, times=times, runways=runways, events=events)
+    latencies = [event.latency for event in events]
+    print(f"\n-> Online cost: {cost if cost is None else round(cost, 2)} | {len(events)} events | "
+          f"mean latency {np.mean(latencies) if latencies else 0:.4f}s | max latency {max(latencies, default=0):.4f}s")
+
+    if offline:
+        with contextlib.redirect_stdout(io.StringIO()):
+            offline_status, offline_times, _ = solve_with_engine(
+                engine, instance, num_runways, between, time_limit, presolve, **options
+            )
+        solution.offline_status = offline_status
+        if offline_times is not None:
+            solution.offline_cost = schedule_cost(instance, offline_times)
+            print(f"-> Offline cost: {solution.offline_cost:.2f} ({offline_status})")
+
+    return solution
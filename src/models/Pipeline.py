@@ -0,0 +1,109 @@
+import contextlib
+import io
+import time
+from dataclasses import dataclass
+
+import numpy as np
+
+from models.Engines import ENGINES, EngineSolution, check_engine_options, run_engine, schedule_cost
+from others.heuristic import greedy_schedule, is_feasible_schedule
+from others.utils import as_instance
+
+STAGES = ENGINES + ("heuristic", "local_search")
+
+
+# Staged solving with solution handoff
+# Stages run one after the other and every stage starts from the best
+# schedule found so far: the constructive heuristic or the local search
+# produce one in (milli)seconds, CP and MIP receive it as a complete hint
+# (every variable) and the Hybrid as master hints and first incumbent, so
+# its bound closes against it. A stage that proves optimality ends the
+# pipeline.
+@dataclass
+class PipelineSolution:
+    status: str
+    cost: float
+    times: list         # landing time of every plane
+    runways: list       # 0-based runway of every plane
+    stages: list        # [EngineSolution], in order
+    wall_time: float
+
+
+def _run_stage(engine, instance, num_runways, between, time_limit, presolve, best, options):
+    start_time = time.time()
+    if engine == "heuristic":
+        schedule = greedy_schedule(instance, num_runways, between)
+        if schedule is None:
+            return EngineSolution(engine, "NOT_SOLVED", None, None, None, time.time() - start_time)
+        times, runways, cost = schedule
+        return EngineSolution(engine, "FEASIBLE", cost, times.tolist(), runways.tolist(), time.time() - start_time)
+
+    if engine == "local_search":
+        from models.LocalSearch import solve_local_search
+
+        n = instance.num_planes
+        solution = solve_local_search(n, num_runways, instance, None, between, time_budget=time_limit or 10,
+                                      initial_solution=None if best is None else best.schedule, **options)
+        return EngineSolution(engine, solution.status, solution.cost, solution.times, solution.runways,
+                              time.time() - start_time)
+
+    if best is not None:
+        options = dict(options, hint=best.schedule)
+        if engine == "hybrid":
+            options["incumbent"] = best.schedule
+    return run_engine(engine, instance, num_runways, between, time_limit, presolve, **options)
+
+
+def solve_pipeline(num_planes, num_runways, planes_data, separation_times, separation_between_runways=None,
+                   stages=(("heuristic", None), ("cp", 10), ("mip", 60)), presolve=True, verbose=False):
+    """Runs the stages in order, each one seeded with the best schedule so
+    far. A stage is (engine, time_limit) or (engine, time_limit, options);
+    engines are "mip", "cp", "hybrid" (time_limit per master solve),
+    "heuristic" and "local_search" (time_limit is its budget). With
+    verbose=False the engines' own reports are silenced."""
+    stages = [tuple(stage) + ({},) * (3 - len(stage)) for stage in stages]
+    for engine, _, options in stages:
+        if engine not in STAGES:
+            raise ValueError(f"Unknown engine '{engine}', expected one of {list(STAGES)}.")
+        if engine in ENGINES:
+            check_engine_options(engine, options)
+
+    start_time = time.time()
+    instance = as_instance(planes_data, separation_times)
+    between = None
+    if num_runways > 1:
+        between = (np.zeros((num_planes, num_planes), dtype=np.int32) if separation_between_runways is None
+                   else np.asarray(separation_between_runways, dtype=np.int32))
+
+    print("\n" + "=" * 60)
+    print(f"\t\tRunning Pipeline ({' -> '.join(engine for engine, _, _ in stages)})")
+    print("=" * 60, "\n")
+
+    best = None
+    status = "NOT_SOLVED"
+    results = []
+    for engine, time_limit, options in stages:
+        output = contextlib.nullcontext() if verbose else contextlib.redirect_stdout(io.StringIO())
+        with output:
+            result = _run_stage(engine, instance, num_runways, between, time_limit, presolve, best, options)
+        results.append(result)
+
+        # Only schedules that hold for the whole instance are handed on
+        feasible = result.times is not None and is_feasible_schedule(instance, result.times, result.runways, between)
+        improved = feasible and (best is None or result.cost < best.cost - 1e-9)
+        if improved:
+            best = result
+        print(f"-> {engine:<12} | {result.status:<10} | Cost: {result.cost if result.cost is None else round(result.cost, 2)}"
+              f"{' (new best)' if improved else ''} | {result.solve_time:.4f}s")
+
+        if feasible and result.status == "OPTIMAL":
+            status = "OPTIMAL"
+            break
+        if best is not None:
+            status = "FEASIBLE"
+
+    wall_time = time.time() - start_time
+    cost = None if best is None else schedule_cost(instance, best.times)
+    print(f"-> Status: {status} | Cost: {cost if cost is None else round(cost, 2)} | Wall time: {wall_time:.4f}s")
+    return PipelineSolution(status=status, cost=cost, times=None if best is None else best.times,
+                            runways=None if best is None else best.runways, stages=results, wall_time=wall_time)
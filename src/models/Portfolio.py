@@ -0,0 +1,192 @@
+import contextlib
+import math
+import multiprocessing
+import os
+import queue
+import time
+from dataclasses import dataclass
+
+import numpy as np
+from ortools.sat.python import cp_model
+
+from models.Engines import EngineSolution, run_engine, schedule_cost
+from others.heuristic import greedy_schedule, is_feasible_schedule
+from others.utils import as_instance
+
+# (name, engine, options) of every member; the CP variants differ in their
+# search branching or formulation
+DEFAULT_MEMBERS = (
+    ("mip", "mip", {}),
+    ("cp", "cp", {}),
+    ("cp-pseudo-cost", "cp", {"search_strategy": cp_model.PSEUDO_COST_SEARCH}),
+    ("cp-quick-restart", "cp", {"search_strategy": cp_model.PORTFOLIO_WITH_QUICK_RESTART_SEARCH}),
+    ("cp-interval", "cp", {"formulation": "interval"}),
+    ("hybrid", "hybrid", {}),
+)
+
+
+# Parallel solver portfolio
+# Every member runs in its own process until one of them proves optimality
+# or the deadline hits; the others are then terminated. The parent is the
+# only writer of the shared incumbent (shared memory, seeded with the
+# constructive heuristic): members report their schedules on a queue and the
+# parent keeps the best feasible one. Every member starts from it as a
+# complete hint; during the run the Hybrid re-reads it at every iteration
+# (incumbent and theta bound of its master) and the CP members only report
+# solutions that beat it. MIP members report their final schedule.
+@dataclass
+class PortfolioSolution:
+    status: str
+    cost: float
+    times: list         # landing time of every plane
+    runways: list       # 0-based runway of every plane
+    winner: str         # member that found the returned schedule
+    incumbents: list    # [(elapsed seconds, member, cost)] at every new best
+    members: dict       # member -> EngineSolution (None if it was terminated)
+    wall_time: float
+
+
+def _shared_schedule(shared):
+    with shared["lock"]:
+        if math.isinf(shared["cost"].value):
+            return None
+        return list(shared["times"]), list(shared["runways"])
+
+
+def _run_member(name, engine, instance, num_runways, between, end_time, presolve, search_workers, options,
+                shared, messages):
+    # Runs in a worker process; the engines' own reports are silenced
+    time_limit = end_time - time.time()
+    if time_limit <= 0:
+        messages.put(("done", name, EngineSolution(engine, "NOT_SOLVED", None, None, None, 0.0)))
+        return
+    best = _shared_schedule(shared)
+    options = dict(options)
+    if best is not None:
+        options["hint"] = best
+        if engine == "hybrid":
+            options["incumbent"] = best
+    if engine == "hybrid":
+        options["poll_incumbent"] = lambda: _shared_schedule(shared)
+    if engine == "cp":
+        def on_solution(times, runways):
+            cost = schedule_cost(instance, times)
+            with shared["lock"]:
+                improves = cost < shared["cost"].value - 1e-9
+            if improves:
+                messages.put(("incumbent", name, cost, times, runways))
+        options["on_solution"] = on_solution
+
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        try:
+            result = run_engine(engine, instance, num_runways, between, time_limit, presolve,
+                                search_workers=search_workers if engine != "hybrid" else None, **options)
+        except Exception as error:
+            result = EngineSolution(engine, f"ERROR: {error}", None, None, None, 0.0)
+    messages.put(("done", name, result))
+
+
+def solve_portfolio(instance, num_runways, deadline, separation_between_runways=None, members=DEFAULT_MEMBERS,
+                    presolve=True):
+    """Races the members (name, engine, options) in separate processes and
+    returns the best schedule as soon as one proves optimality, or when
+    deadline seconds have passed. instance is an AirlandInstance (e.g. from
+    read_airland_file); every member gets the time left when it starts."""
+    start_time = time.time()
+    instance = as_instance(instance)
+    n = instance.num_planes
+    between = None
+    if num_runways > 1:
+        between = (np.zeros((n, n), dtype=np.int32) if separation_between_runways is None
+                   else np.asarray(separation_between_runways, dtype=np.int32))
+
+    print("\n" + "=" * 60)
+    print(f"\t\tRunning Portfolio ({len(members)} members, deadline {deadline}s)")
+    print("=" * 60, "\n")
+
+    context = multiprocessing.get_context()
+    shared = {
+        "lock": context.Lock(),
+        "cost": context.Value("d", math.inf, lock=False),
+        "times": context.Array("q", n, lock=False),
+        "runways": context.Array("q", n, lock=False),
+    }
+    messages = context.Queue()
+
+    best_cost, best_times, best_runways, winner = None, None, None, None
+    incumbents = []
+
+    def offer(name, cost, times, runways):
+        nonlocal best_cost, best_times, best_runways, winner
+        if times is None or (best_cost is not None and cost >= best_cost - 1e-9):
+            return
+        times = [int(round(t)) for t in times]
+        if not is_feasible_schedule(instance, times, runways, between):
+            return
+        best_cost, best_times, best_runways, winner = cost, times, list(runways), name
+        with shared["lock"]:
+            shared["cost"].value = cost
+            shared["times"][:] = times
+            shared["runways"][:] = best_runways
+        incumbents.append((time.time() - start_time, name, cost))
+        print(f"-> {time.time() - start_time:8.3f}s | {name:<16} | new best {cost:.2f}")
+
+    schedule = greedy_schedule(instance, num_runways, between)
+    if schedule is not None:
+        offer("heuristic", schedule[2], schedule[0].tolist(), schedule[1].tolist())
+
+    # The cores are shared between the members instead of every solver taking all of them
+    search_workers = max(1, (os.cpu_count() or 1) // len(members))
+    processes = {}
+    for name, engine, options in members:
+        process = context.Process(
+            target=_run_member,
+            args=(name, engine, instance, num_runways, between, start_time + deadline, presolve, search_workers,
+                  options, shared, messages),
+            daemon=True,
+        )
+        process.start()
+        processes[name] = process
+
+    results = {name: None for name, _, _ in members}
+    status = "FEASIBLE" if best_cost is not None else "NOT_SOLVED"
+    try:
+        while any(result is None for result in results.values()):
+            remaining = deadline - (time.time() - start_time)
+            if remaining <= 0:
+                break
+            try:
+                message = messages.get(timeout=min(remaining, 0.1))
+            except queue.Empty:
+                if not any(process.is_alive() for process in processes.values()) and messages.empty():
+                    break
+                continue
+
+            if message[0] == "incumbent":
+                _, name, cost, times, runways = message
+                offer(name, cost, times, runways)
+                continue
+            _, name, result = message
+            results[name] = result
+            print(f"-> {time.time() - start_time:8.3f}s | {name:<16} | {result.status} "
+                  f"({result.cost if result.cost is None else round(result.cost, 2)})")
+            offer(name, result.cost, result.times, result.runways)
+            if result.status == "OPTIMAL" and result.times is not None:
+                # Its cost is the optimum, whichever member reported that schedule first
+                status = "OPTIMAL"
+                break
+            if best_cost is not None:
+                status = "FEASIBLE"
+    finally:
+        for process in processes.values():
+            if process.is_alive():
+                process.terminate()
+        for process in processes.values():
+            process.join(timeout=1)
+        messages.cancel_join_thread()
+
+    wall_time = time.time() - start_time
+    print(f"-> Status: {status} | Cost: {best_cost if best_cost is None else round(best_cost, 2)} | "
+          f"Winner: {winner} | Wall time: {wall_time:.4f}s")
+    return PortfolioSolution(status=status, cost=best_cost, times=best_times, runways=best_runways, winner=winner,
+                             incumbents=incumbents, members=results, wall_time=wall_time)
@@ -0,0 +1,189 @@
+import contextlib
+import io
+import os
+import time
+
+from ortools.linear_solver import pywraplp
+from ortools.sat.python import cp_model
+
+from others.performance import PerformanceMIP
+from others.utils import generate_separation_between_runways, read_airland_file
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+AIRLAND_FILES = [f"airland{k}.txt" for k in range(1, 14)]
+LARGE_AIRLAND_FILES = [f"airland{k}.txt" for k in range(9, 14)]
+
+
+MIP_STATUS = {
+    pywraplp.Solver.OPTIMAL: "OPTIMAL",
+    pywraplp.Solver.FEASIBLE: "FEASIBLE",
+    pywraplp.Solver.INFEASIBLE: "INFEASIBLE",
+    pywraplp.Solver.UNBOUNDED: "UNBOUNDED",
+    pywraplp.Solver.ABNORMAL: "ABNORMAL",
+    pywraplp.Solver.NOT_SOLVED: "NOT_SOLVED",
+}
+
+
+def _load(file_name, data_dir, num_runways, default_between_runways=0):
+    instance = read_airland_file(os.path.join(data_dir, file_name))
+    separation_between_runways = generate_separation_between_runways(
+        instance.num_planes, num_runways, default_between_runways=default_between_runways
+    )
+    return instance, separation_between_runways
+
+
+def _print_records(records, columns):
+    widths = {c: max(len(c), *(len(str(r.get(c, ""))) for r in records)) for c in columns}
+    header = " | ".join(f"{c:>{widths[c]}}" for c in columns)
+    print(header)
+    print("-" * len(header))
+    for r in records:
+        print(" | ".join(f"{str(r.get(c, '')):>{widths[c]}}" for c in columns))
+
+
+# Big-M comparison for the multi-runway MIP
+def benchmark_big_m(files=None, num_runways=2, time_limit=60, data_dir=DATA_DIR, default_between_runways=0):
+    from models.MIP import create_mip_model_multiple_runways
+
+    records = []
+    for file_name in files or AIRLAND_FILES:
+        instance, separation_between_runways = _load(file_name, data_dir, num_runways, default_between_runways)
+
+        for big_m in ("global", "pairwise"):
+            with contextlib.redirect_stdout(io.StringIO()):
+                solver, _ = create_mip_model_multiple_runways(
+                    instance.num_planes, instance, None, separation_between_runways, num_runways, big_m=big_m
+                )
+            if time_limit is not None:
+                solver.SetTimeLimit(int(time_limit * 1000))
+
+            start_time = time.time()
+            status = solver.Solve()
+            exec_time = time.time() - start_time
+
+            perf = PerformanceMIP(solver)
+            records.append({
+                "file": file_name,
+                "num_runways": num_runways,
+                "big_m": big_m,
+                "status": MIP_STATUS.get(status, str(status)),
+                "execution_time": round(exec_time, 4),
+                "total_penalty": round(abs(perf.get_total_penalty()), 2),
+                "num_branch_and_bound_nodes": perf.get_num_branch_and_bound_nodes(),
+            })
+
+    _print_records(records, ["file", "big_m", "status", "execution_time", "total_penalty", "num_branch_and_bound_nodes"])
+    return records
+
+
+# Pairwise vs interval/NoOverlap CP formulation
+def benchmark_cp_formulations(files=None, num_runways=2, time_limit=60, data_dir=DATA_DIR, default_between_runways=0):
+    from models.CP import CP_FORMULATIONS
+
+    records = []
+    for file_name in files or LARGE_AIRLAND_FILES:
+        instance, separation_between_runways = _load(file_name, data_dir, num_runways, default_between_runways)
+
+        for formulation, (create_single, create_multiple) in CP_FORMULATIONS.items():
+            build_start = time.time()
+            with contextlib.redirect_stdout(io.StringIO()):
+                if num_runways == 1:
+                    model, _ = create_single(instance.num_planes, instance, None)
+                else:
+                    model, _ = create_multiple(
+                        instance.num_planes, num_runways, instance, None, separation_between_runways
+                    )
+            build_time = time.time() - build_start
+
+            solver = cp_model.CpSolver()
+            if time_limit is not None:
+                solver.parameters.max_time_in_seconds = time_limit
+
+            start_time = time.time()
+            status = solver.Solve(model)
+            exec_time = time.time() - start_time
+
+            solved = status in (cp_model.OPTIMAL, cp_model.FEASIBLE)
+            records.append({
+                "file": file_name,
+                "num_runways": num_runways,
+                "formulation": formulation,
+                "status": solver.StatusName(status),
+                "build_time": round(build_time, 4),
+                "execution_time": round(exec_time, 4),
+                "objective": round(solver.ObjectiveValue(), 2) if solved else None,
+                "best_bound": round(solver.BestObjectiveBound(), 2) if solved else None,
+                "num_variables": len(model.Proto().variables),
+                "num_constraints": len(model.Proto().constraints),
+            })
+
+    _print_records(records, ["file", "formulation", "status", "build_time", "execution_time",
+                             "objective", "best_bound", "num_variables", "num_constraints"])
+    return records
+
+
+# Hybrid master with and without warm starts (hints + incumbent bound)
+def benchmark_hybrid_warm_start(files=None, num_runways=2, max_iterations=20, master_time_limit=60,
+                                data_dir=DATA_DIR, default_between_runways=0, subproblem="timing"):
+    from models.Hybrid import solve_hybrid_lbbd
+
+    records = []
+    for file_name in files or LARGE_AIRLAND_FILES:
+        instance, separation_between_runways = _load(file_name, data_dir, num_runways, default_between_runways)
+
+        for warm_start in (False, True):
+            with contextlib.redirect_stdout(io.StringIO()):
+                *_, metrics = solve_hybrid_lbbd(
+                    instance.num_planes, num_runways, instance, None, separation_between_runways,
+                    max_iterations=max_iterations, performance=True, subproblem=subproblem,
+                    warm_start=warm_start, master_time_limit=master_time_limit,
+                )
+
+            master_times = [it["master_time"] for it in metrics["iterations"]]
+            records.append({
+                "file": file_name,
+                "num_runways": num_runways,
+                "warm_start": warm_start,
+                "converged": metrics["converged"],
+                "num_iterations": metrics["num_iterations"],
+                "best_cost": metrics["total_best_objective_bound"],
+                "cp_time": round(metrics["cp_time"], 4),
+                "mean_master_time": round(sum(master_times) / len(master_times), 4) if master_times else None,
+                "iterations": metrics["iterations"],
+            })
+
+    _print_records(records, ["file", "warm_start", "converged", "num_iterations", "best_cost", "cp_time", "mean_master_time"])
+    return records
+
+
+# Hybrid iterations-to-convergence with block/no-good cuts vs LP dual cuts
+def benchmark_hybrid_cuts(files=None, num_runways=2, max_iterations=20, master_time_limit=60,
+                          data_dir=DATA_DIR, default_between_runways=0):
+    from models.Hybrid import solve_hybrid_lbbd
+
+    records = []
+    for file_name in files or AIRLAND_FILES[:8]:
+        instance, separation_between_runways = _load(file_name, data_dir, num_runways, default_between_runways)
+
+        for cut_mode in ("block", "dual"):
+            with contextlib.redirect_stdout(io.StringIO()):
+                *_, metrics = solve_hybrid_lbbd(
+                    instance.num_planes, num_runways, instance, None, separation_between_runways,
+                    max_iterations=max_iterations, performance=True, subproblem="lp",
+                    master_time_limit=master_time_limit, cut_mode=cut_mode,
+                )
+
+            records.append({
+                "file": file_name,
+                "num_runways": num_runways,
+                "cut_mode": cut_mode,
+                "converged": metrics["converged"],
+                "num_iterations": metrics["num_iterations"],
+                "best_cost": metrics["total_best_objective_bound"],
+                "num_cuts": metrics["num_cuts"],
+                "cp_time": round(metrics["cp_time"], 4),
+                "mip_time": round(metrics["mip_time"], 4),
+            })
+
+    _print_records(records, ["file", "cut_mode", "converged", "num_iterations", "best_cost", "num_cuts", "cp_time", "mip_time"])
+    return records
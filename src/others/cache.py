@@ -0,0 +1,61 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+
+# Bounded LRU cache
+# Shared between solver threads (one lock around every access). Its users
+# keep one per instance and run, so keys only need to tell apart the
+# decisions made within that run.
+class LRUCache:
+    def __init__(self, maxsize=4096):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=None):
+        with self.lock:
+            if key not in self.entries:
+                self.misses += 1
+                return default
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return self.entries[key]
+
+    def put(self, key, value):
+        with self.lock:
+            self.entries[key] = value
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+
+def digest(*arrays):
+    """16-byte hash of a sequence of integer/float arrays (shape and dtype included)."""
+    h = hashlib.blake2b(digest_size=16)
+    for a in arrays:
+        a = np.ascontiguousarray(a)
+        h.update(str((a.dtype.str, a.shape)).encode())
+        h.update(a.tobytes())
+    return h.digest()
+
+
+def sequences_digest(sequences):
+    """Hash of a list of plane sequences, independent of the order of the list
+    (runways are interchangeable). Sequences are separated by -1 markers."""
+    ordered = sorted(tuple(int(i) for i in seq) for seq in sequences if len(seq))
+    flat = [i for seq in ordered for i in seq + (-1,)]
+    return digest(np.asarray(flat, dtype=np.int64))
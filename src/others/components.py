@@ -0,0 +1,35 @@
+import numpy as np
+
+from others.presolve import presolve_windows
+from others.utils import AirlandInstance
+
+
+# Conflict-graph decomposition
+# Planes are linked when their pair is in V or U, i.e. when a separation can
+# bind between them. W pairs are always separated by their (presolved)
+# windows, whatever the runways, so two connected components of this graph
+# never interact and can be scheduled on their own, each one with every
+# runway available.
+def _find(parent, i):
+    while parent[i] != i:
+        parent[i] = parent[parent[i]]
+        i = parent[i]
+    return i
+
+
+def conflict_components(instance: AirlandInstance, separation_between_runways=None, presolve=True):
+    """Returns (components, windows): the plane indices of every connected
+    component of the V/U graph, ordered by their earliest time, and the
+    presolved windows the classification was made with."""
+    windows = presolve_windows(instance, separation_between_runways, tighten=presolve)
+    parent = list(range(instance.num_planes))
+    for pairs in (windows.pairs.V, windows.pairs.U):
+        for i, j in pairs.tolist():
+            ri, rj = _find(parent, i), _find(parent, j)
+            if ri != rj:
+                parent[max(ri, rj)] = min(ri, rj)
+
+    roots = np.array([_find(parent, i) for i in range(instance.num_planes)], dtype=np.int64)
+    components = [np.flatnonzero(roots == root) for root in np.unique(roots)]
+    components.sort(key=lambda planes: (int(windows.earliest[planes].min()), int(planes[0])))
+    return components, windows
@@ -0,0 +1,123 @@
+import numpy as np
+
+from others.timing import sequence_timing
+from others.utils import AirlandInstance
+
+
+# Constructive heuristic
+# Planes are taken in order of target (or earliest) time and each one goes to
+# the runway where it can land first, after every plane already placed,
+# pushed forward only as far as the separations require. Landing after all
+# placed planes keeps the order of every pair explicit, so the schedule can
+# be written as a complete hint for the CP and MIP models (times, deviations,
+# orders, runways) and its cost is an upper bound from the start. The
+# runway sequences are then re-timed optimally when that stays feasible.
+def is_feasible_schedule(instance: AirlandInstance, times, runways=None, separation_between_runways=None):
+    """Checks the windows and the separation of every pair (S on the same
+    runway, separation_between_runways across runways)."""
+    times = np.asarray(times, dtype=np.int64)
+    if np.any(times < instance.earliest) or np.any(times > instance.latest):
+        return False
+    S = instance.separation.astype(np.int64)
+    if separation_between_runways is not None and runways is not None:
+        runways = np.asarray(runways, dtype=np.int64)
+        S = np.where(runways[:, None] == runways[None, :], S, separation_between_runways)
+    gap = times[None, :] - times[:, None]
+    ok = (gap >= S) | (gap.T >= S.T)
+    np.fill_diagonal(ok, True)
+    return bool(ok.all())
+
+
+def _place(instance, order, num_runways, between, E, L, at_target):
+    n = instance.num_planes
+    S = instance.separation.astype(np.int64)
+    off_diagonal = S[~np.eye(n, dtype=bool)]
+    reach = max(int(off_diagonal.max()) if n > 1 else 0, int(between.max()) if between is not None else 0)
+    times = np.zeros(n, dtype=np.int64)
+    runways = np.zeros(n, dtype=np.int64)
+    placed = np.empty(n, dtype=np.int64)
+    first = 0
+    for k, i in enumerate(order.tolist()):
+        # Planes land in the order they are placed, so the ones a full
+        # separation before the last placed plane can no longer bind
+        while first < k and times[placed[first]] + reach <= times[placed[k - 1]]:
+            first += 1
+        recent = placed[first:k]
+        best = None
+        for r in range(num_runways):
+            lower = int(E[i])
+            if k:
+                sep = S[recent, i] if between is None else np.where(runways[recent] == r, S[recent, i], between[recent, i])
+                lower = max(lower, int((times[recent] + sep).max()))
+            t = max(lower, int(instance.target[i])) if at_target else lower
+            if t <= L[i] and (best is None or t < best[0]):
+                best = (t, r)
+        if best is None:
+            return None
+        times[i], runways[i] = best
+        placed[k] = i
+    return times, runways
+
+
+def greedy_schedule(instance: AirlandInstance, num_runways=1, separation_between_runways=None,
+                    earliest=None, latest=None):
+    """Returns (times, runways, cost) with runways numbered from 0, or None if
+    no order fits in the windows. earliest/latest override the instance
+    windows, e.g. with presolved ones. Without separation_between_runways,
+    planes on different runways are not separated."""
+    E = instance.earliest if earliest is None else earliest
+    L = instance.latest if latest is None else latest
+    between = None
+    if num_runways > 1:
+        n = instance.num_planes
+        between = (np.zeros((n, n), dtype=np.int64) if separation_between_runways is None
+                   else np.asarray(separation_between_runways, dtype=np.int64))
+
+    # Close to the targets first; as early as possible if that overflows a window
+    schedule = _place(instance, np.lexsort((E, instance.target)), num_runways, between, E, L, True)
+    if schedule is None:
+        schedule = _place(instance, np.lexsort((instance.target, E)), num_runways, between, E, L, False)
+    if schedule is None:
+        return None
+    times, runways = schedule
+    cost = float(np.dot(instance.penalty_early, np.maximum(instance.target - times, 0))
+                 + np.dot(instance.penalty_late, np.maximum(times - instance.target, 0)))
+
+    # Optimal timing of the runway sequences only separates consecutive planes
+    sequences = [np.flatnonzero(runways == r)[np.argsort(times[runways == r], kind="stable")]
+                 for r in range(num_runways)]
+    timed = sequence_timing(instance, sequences, E, L)
+    if timed is not None and timed[1] < cost and is_feasible_schedule(instance, timed[0], runways, between):
+        times, cost = timed
+    return times, runways, cost
+
+
+def schedule_hints(variables, instance: AirlandInstance, times, runways=None, separation_between_runways=None):
+    """(variable, value) pairs hinting every variable of a CP or MIP model
+    with the given schedule."""
+    n = instance.num_planes
+    times = np.round(np.asarray(times, dtype=np.float64)).astype(np.int64)
+    runways = np.zeros(n, dtype=np.int64) if runways is None else np.asarray(runways, dtype=np.int64)
+    S = instance.separation.astype(np.int64)
+    if separation_between_runways is not None:
+        S = np.where(runways[:, None] == runways[None, :], S, separation_between_runways)
+
+    def lands_first(i, j):
+        # Equal times only fit the order whose separation is not positive
+        return times[i] < times[j] or (times[i] == times[j] and S[i, j] <= 0)
+
+    hints = []
+    for i in range(n):
+        hints.append((variables["landing_time"][i], int(times[i])))
+        hints.append((variables["early_deviation"][i], int(max(instance.target[i] - times[i], 0))))
+        hints.append((variables["late_deviation"][i], int(max(times[i] - instance.target[i], 0))))
+    for key in ("before_ij", "landing_order"):
+        for (i, j), var in variables.get(key, {}).items():
+            hints.append((var, int(lands_first(i, j))))
+    for (i, j), var in variables.get("same_runway", {}).items():
+        hints.append((var, int(runways[i] == runways[j])))
+    for i, var in enumerate(variables.get("runway_i", [])):
+        hints.append((var, int(runways[i])))
+    for (i, r), var in variables.get("landing_runway", {}).items():
+        hints.append((var, int(runways[i] == r)))
+    return hints
@@ -0,0 +1,96 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+from others.utils import AirlandInstance
+
+
+# Plane pair classification
+#   W: i must land before j and the windows already imply the separation
+#   V: i must land before j but the separation has to be enforced
+#   U: the windows overlap, so the order is open
+# W pairs never need a constraint, so only V and U are materialised.
+@dataclass
+class PairSets:
+    V: np.ndarray   # (k, 2) ordered pairs (i, j), i lands before j
+    U: np.ndarray   # (k, 2) unordered pairs (i, j) with i < j
+
+
+def _row_reduce_off_diagonal(S: np.ndarray, s=None, reduce=np.max, chunk: int = 1024) -> np.ndarray:
+    # Row-wise max/min of the separations a plane imposes on the others, ignoring S_ii
+    n = S.shape[0]
+    out = np.zeros(n, dtype=np.int64)
+    if n < 2:
+        return out
+    fill = np.iinfo(np.int64).min if reduce is np.max else np.iinfo(np.int64).max
+    for r0 in range(0, n, chunk):
+        r1 = min(n, r0 + chunk)
+        block = S[r0:r1].astype(np.int64)
+        if s is not None:
+            block = np.maximum(block, s[r0:r1])
+        rows = np.arange(r1 - r0)
+        block[rows, r0 + rows] = fill
+        out[r0:r1] = reduce(block, axis=1)
+    return out
+
+
+def min_separation(instance: AirlandInstance) -> np.ndarray:
+    # Smallest separation plane i imposes on any follower on its runway
+    return _row_reduce_off_diagonal(instance.separation, reduce=np.min)
+
+
+def candidate_pairs(instance: AirlandInstance, separation_between_runways=None, earliest=None, latest=None):
+    """Sweep over the windows sorted by earliest time and return every pair
+    (a, b), E_a <= E_b, that can need a constraint: b starts before a's latest
+    time plus the largest separation a imposes. Runs in O(n log n + k)."""
+    n = instance.num_planes
+    E = instance.earliest if earliest is None else earliest
+    L = instance.latest if latest is None else latest
+    s = None if separation_between_runways is None else np.asarray(separation_between_runways, dtype=np.int32)
+
+    order = np.argsort(E, kind="stable")
+    E_sorted = E[order]
+
+    reach = L + np.maximum(_row_reduce_off_diagonal(instance.separation, s), 1)
+    hi = np.searchsorted(E_sorted, reach[order], side="left")
+    start = np.arange(1, n + 1)
+    counts = np.maximum(hi - start, 0)
+
+    total = int(counts.sum())
+    first = np.repeat(start, counts)
+    offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+
+    a = np.repeat(order, counts)
+    b = order[first + offsets]
+    return a, b
+
+
+def classify_pairs(instance: AirlandInstance, separation_between_runways=None, earliest=None, latest=None) -> PairSets:
+    # earliest/latest override the instance windows, e.g. with presolved ones
+    E = instance.earliest if earliest is None else earliest
+    L = instance.latest if latest is None else latest
+    a, b = candidate_pairs(instance, separation_between_runways, E, L)
+
+    S_ab = instance.separation[a, b].astype(np.int64)
+    if separation_between_runways is not None:
+        # With several runways a pair only counts as W if neither separation can bind
+        s = np.asarray(separation_between_runways, dtype=np.int32)
+        S_ab = np.maximum(S_ab, s[a, b])
+
+    overlap = E[b] <= L[a]
+    v_mask = ~overlap & (L[a] + S_ab > E[b])
+
+    V = np.stack([a[v_mask], b[v_mask]], axis=1)
+    U = np.stack([np.minimum(a[overlap], b[overlap]), np.maximum(a[overlap], b[overlap])], axis=1)
+
+    # Deterministic order, same as the dense row-major enumeration
+    V = V[np.lexsort((V[:, 1], V[:, 0]))]
+    U = U[np.lexsort((U[:, 1], U[:, 0]))]
+
+    return PairSets(V=V, U=U)
+
+
+def pair_separations(S, pairs: np.ndarray) -> list:
+    # S[i, j] of every pair (i, j) in a single gather, as Python ints for the model builders
+    pairs = np.asarray(pairs, dtype=np.int64).reshape(-1, 2)
+    return np.asarray(S)[pairs[:, 0], pairs[:, 1]].tolist()
@@ -69,6 +69,15 @@ class PerformanceHybrid:
         self.mip_total_time = 0.0
         self.mip_num_calls = 0
 
+        # Subproblem cache (whole assignments / single runways)
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.runway_cache_hits = 0
+        self.runway_cache_misses = 0
+
+        # Per-iteration master/subproblem statistics
+        self.iteration_stats = []
+
         # Memory
         self.memory_start = 0.0
         self.memory_end = 0.0
@@ -106,6 +115,15 @@ class PerformanceHybrid:
         self.mip_total_time += time
         self.update_memory_peak()
 
+    def update_cache_metrics(self, hits=0, misses=0, runway_hits=0, runway_misses=0):
+        self.cache_hits += hits
+        self.cache_misses += misses
+        self.runway_cache_hits += runway_hits
+        self.runway_cache_misses += runway_misses
+
+    def record_iteration(self, **stats):
+        self.iteration_stats.append(stats)
+
     def return_metrics(self, iterations, converged):
         self.num_iterations = iterations
         self.converged = converged
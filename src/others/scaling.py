@@ -0,0 +1,55 @@
+import math
+from dataclasses import dataclass
+
+import numpy as np
+
+from others.utils import AirlandInstance
+
+
+# Integer objective scaling
+# CP-SAT only optimises integer objectives and the airland penalties carry
+# decimals (e.g. 1.70). Multiplying all penalties by the least power of ten
+# that makes them integral gives an exact integer objective; costs are divided
+# by the same factor on the way out.
+@dataclass
+class ObjectiveScale:
+    factor: int
+    penalty_early: np.ndarray   # int64 (n,), penalty_early * factor
+    penalty_late: np.ndarray    # int64 (n,), penalty_late * factor
+
+    def unscale(self, value):
+        return value / self.factor
+
+    def scale_cost(self, cost, tol=1e-6):
+        # Smallest scaled integer that is not below cost (LP costs carry round-off)
+        return math.ceil(cost * self.factor - tol)
+
+    def scale_bound(self, cost, tol=1e-6):
+        # Largest scaled integer that is not above cost, for lower bounds summed from parts
+        return math.floor(cost * self.factor + tol)
+
+
+def decimal_scale(values, max_decimals=6, tol=1e-9) -> int:
+    values = np.asarray(values, dtype=np.float64)
+    factor = 1
+    for _ in range(max_decimals + 1):
+        scaled = values * factor
+        if np.all(np.abs(scaled - np.round(scaled)) <= tol * np.maximum(1.0, np.abs(scaled))):
+            return factor
+        factor *= 10
+    raise ValueError(f"Penalties need more than {max_decimals} decimals to be scaled exactly.")
+
+
+def scale_objective(instance: AirlandInstance, max_decimals=6) -> ObjectiveScale:
+    factor = decimal_scale(np.concatenate([instance.penalty_early, instance.penalty_late]), max_decimals)
+    return ObjectiveScale(
+        factor=factor,
+        penalty_early=np.round(instance.penalty_early * factor).astype(np.int64),
+        penalty_late=np.round(instance.penalty_late * factor).astype(np.int64),
+    )
+
+
+def set_objective_scaling(model, scale: ObjectiveScale):
+    # CP-SAT multiplies the reported objective and bound by scaling_factor,
+    # so ObjectiveValue() comes back in the original units
+    model.Proto().objective.scaling_factor = 1.0 / scale.factor
@@ -0,0 +1,129 @@
+import heapq
+
+import numpy as np
+
+from others.utils import AirlandInstance
+
+
+# Optimal timing of a fixed landing sequence
+# Once the runway and the order of the planes are fixed, every runway is a
+# chain x_{k+1} >= x_k + d_k with a convex piecewise-linear cost per plane
+# (early/late penalty around T, hard window [E, L]). The forward pass keeps
+# the decreasing part of the cost-to-go as a heap of slope breakpoints
+# ("slope trick"), so a chain of k planes is timed in O(k log k).
+def chain_timing(E, T, L, penalty_early, penalty_late, gaps):
+    """Optimal landing times for planes that land in the given order on one
+    runway, plane k+1 at least gaps[k] after plane k. Returns the times as an
+    int64 array, or None when the chain does not fit in the windows."""
+    k = len(E)
+    x = np.empty(k, dtype=np.int64)
+    if k == 0:
+        return x
+
+    lo = [0] * k            # earliest feasible time of plane m given the chain before it
+    opt = [0.0] * k         # smallest minimiser of the cost-to-go of plane m
+    left = []               # max-heap of (-(breakpoint - shift), slope change)
+    shift = 0               # breakpoints are stored relative to the sum of the gaps so far
+
+    for m in range(k):
+        if m == 0:
+            lo[m] = int(E[m])
+        else:
+            # Prefix minimum (the right part is dropped) shifted by the gap
+            shift += int(gaps[m - 1])
+            lo[m] = max(lo[m - 1] + int(gaps[m - 1]), int(E[m]))
+        if lo[m] > L[m]:
+            return None
+
+        t = int(T[m]) - shift
+
+        # pe * (T - x)+ only adds slope to the decreasing part
+        if penalty_early[m] > 0:
+            heapq.heappush(left, (-t, float(penalty_early[m])))
+
+        # pl * (x - T)+ moves the last pl units of slope to the right part
+        w = float(penalty_late[m])
+        if w > 0:
+            heapq.heappush(left, (-t, w))
+            while w > 0:
+                key, weight = heapq.heappop(left)
+                if weight > w:
+                    heapq.heappush(left, (key, weight - w))
+                    w = 0
+                else:
+                    w -= weight
+
+        # x <= L: breakpoints past the latest time collapse onto it
+        cap = int(L[m]) - shift
+        moved = 0.0
+        while left and -left[0][0] > cap:
+            moved += heapq.heappop(left)[1]
+        if moved > 0:
+            heapq.heappush(left, (-cap, moved))
+
+        opt[m] = -left[0][0] + shift if left else lo[m]
+
+    # Backtrack: each plane as close to its own optimum as the successor allows
+    x[k - 1] = max(lo[k - 1], min(opt[k - 1], int(L[k - 1])))
+    for m in range(k - 2, -1, -1):
+        x[m] = max(lo[m], min(opt[m], x[m + 1] - int(gaps[m])))
+    return x
+
+
+def sequence_timing(instance: AirlandInstance, sequences, earliest=None, latest=None):
+    """Times every runway sequence (lists of plane indices in landing order)
+    with chain_timing. Returns (times, cost) or None if a chain is infeasible.
+    earliest/latest override the instance windows, e.g. with presolved ones.
+    Only consecutive planes are separated, which is exact when S satisfies the
+    triangle inequality; callers check the remaining pairs themselves."""
+    E = instance.earliest if earliest is None else earliest
+    L = instance.latest if latest is None else latest
+    times = np.zeros(instance.num_planes, dtype=np.int64)
+    for seq in sequences:
+        if len(seq) == 0:
+            continue
+        seq = np.asarray(seq, dtype=np.int64)
+        gaps = instance.separation[seq[:-1], seq[1:]]
+        x = chain_timing(
+            E[seq], instance.target[seq], L[seq],
+            instance.penalty_early[seq], instance.penalty_late[seq], gaps,
+        )
+        if x is None:
+            return None
+        times[seq] = x
+
+    cost = float(
+        np.dot(instance.penalty_early, np.maximum(instance.target - times, 0))
+        + np.dot(instance.penalty_late, np.maximum(times - instance.target, 0))
+    )
+    return times, cost
+
+
+def chain_blocks(instance: AirlandInstance, seq, earliest=None, latest=None):
+    """Times one runway sequence and splits it where consecutive planes are
+    not pushed together by their separation. Every block is then optimal on
+    its own, and its cost is a lower bound for any schedule that keeps those
+    planes on one runway in the same order (extra planes only add constraints
+    and cost). Returns [(planes, cost)] in landing order, or None if the
+    sequence cannot be timed."""
+    E = instance.earliest if earliest is None else earliest
+    L = instance.latest if latest is None else latest
+    seq = np.asarray(seq, dtype=np.int64)
+    if len(seq) == 0:
+        return []
+
+    gaps = instance.separation[seq[:-1], seq[1:]].astype(np.int64)
+    x = chain_timing(
+        E[seq], instance.target[seq], L[seq],
+        instance.penalty_early[seq], instance.penalty_late[seq], gaps,
+    )
+    if x is None:
+        return None
+
+    cost = (instance.penalty_early[seq] * np.maximum(instance.target[seq] - x, 0)
+            + instance.penalty_late[seq] * np.maximum(x - instance.target[seq], 0))
+    cuts = np.flatnonzero(np.diff(x) > gaps) + 1
+    return [
+        (planes.tolist(), float(c.sum()))
+        for planes, c in zip(np.split(seq, cuts), np.split(cost, cuts))
+    ]
@@ -1,59 +1,141 @@
 import json, os
+from dataclasses import dataclass
+
+import numpy as np
+
+@dataclass
+class AirlandInstance:
+    num_planes: int
+    freeze_time: int
+    appearance: np.ndarray      # int64 (n,)
+    earliest: np.ndarray        # int64 (n,)
+    target: np.ndarray          # int64 (n,)
+    latest: np.ndarray          # int64 (n,)
+    penalty_early: np.ndarray   # float64 (n,)
+    penalty_late: np.ndarray    # float64 (n,)
+    separation: np.ndarray      # int32 (n, n)
+
+    def __post_init__(self):
+        self._planes = None
+        self._separation_times = None
+
+    # Compatibility view: the per-plane dicts the models used to receive
+    @property
+    def planes(self):
+        if self._planes is None:
+            self._planes = [
+                {
+                    'id': i,
+                    'appearance_time': int(self.appearance[i]),
+                    'earliest_landing_time': int(self.earliest[i]),
+                    'target_landing_time': int(self.target[i]),
+                    'latest_landing_time': int(self.latest[i]),
+                    'penalty_early': float(self.penalty_early[i]),
+                    'penalty_late': float(self.penalty_late[i]),
+                }
+                for i in range(self.num_planes)
+            ]
+        return self._planes
+
+    @property
+    def separation_times(self):
+        if self._separation_times is None:
+            self._separation_times = self.separation.tolist()
+        return self._separation_times
+
+    # Keeps data['p'], data['planes'], ... working for existing callers
+    def __getitem__(self, key):
+        if key == 'p':
+            return self.num_planes
+        if key in ('freeze_time', 'planes', 'separation_times'):
+            return getattr(self, key)
+        raise KeyError(key)
+
+    # Restriction to the given planes, re-indexed 0..k-1 in that order
+    def subset(self, planes):
+        planes = np.asarray(planes, dtype=np.int64)
+        return AirlandInstance(
+            num_planes=len(planes),
+            freeze_time=self.freeze_time,
+            appearance=self.appearance[planes],
+            earliest=self.earliest[planes],
+            target=self.target[planes],
+            latest=self.latest[planes],
+            penalty_early=self.penalty_early[planes],
+            penalty_late=self.penalty_late[planes],
+            separation=self.separation[np.ix_(planes, planes)],
+        )
+
+    def as_dict(self):
+        return {
+            'p': self.num_planes,
+            'freeze_time': self.freeze_time,
+            'planes': self.planes,
+            'separation_times': self.separation_times
+        }
+
+def as_instance(planes_data, separation_times=None, freeze_time=0):
+    if isinstance(planes_data, AirlandInstance):
+        if separation_times is None or separation_times is planes_data.separation_times:
+            return planes_data
+        return AirlandInstance(
+            num_planes=planes_data.num_planes,
+            freeze_time=planes_data.freeze_time,
+            appearance=planes_data.appearance,
+            earliest=planes_data.earliest,
+            target=planes_data.target,
+            latest=planes_data.latest,
+            penalty_early=planes_data.penalty_early,
+            penalty_late=planes_data.penalty_late,
+            separation=np.asarray(separation_times, dtype=np.int32),
+        )
+
+    if separation_times is None:
+        raise ValueError("separation_times is required when planes_data is a list of dicts.")
+
+    return AirlandInstance(
+        num_planes=len(planes_data),
+        freeze_time=freeze_time,
+        appearance=np.array([p.get('appearance_time', 0) for p in planes_data], dtype=np.int64),
+        earliest=np.array([p['earliest_landing_time'] for p in planes_data], dtype=np.int64),
+        target=np.array([p['target_landing_time'] for p in planes_data], dtype=np.int64),
+        latest=np.array([p['latest_landing_time'] for p in planes_data], dtype=np.int64),
+        penalty_early=np.array([p['penalty_early'] for p in planes_data], dtype=np.float64),
+        penalty_late=np.array([p['penalty_late'] for p in planes_data], dtype=np.float64),
+        separation=np.asarray(separation_times, dtype=np.int32),
+    )
 
 def read_airland_file(filename):
     with open(filename, 'r') as file:
-        lines = [line.strip() for line in file if line.strip()]
-    p, freeze_time = map(int, lines[0].split())
-
-    planes = []
-    index = 1
-    separation_times = [[0] * p for _ in range(p)]
-
-    for i in range(p):
-        data = lines[index].split()
-        index += 1
-
-        plane = {
-            'id': index,
-            'appearance_time': int(data[0]),
-            'earliest_landing_time': int(data[1]),
-            'target_landing_time': int(data[2]),
-            'latest_landing_time': int(data[3]),
-            'penalty_early': float(data[4]),
-            'penalty_late': float(data[5]),
-        }
-        planes.append(plane)
-        separation_values = []
-        while len(separation_values) < p :
-            separation_values.extend(map(int, lines[index].split()))
-            index += 1
-        for j in range(p):
-            separation_times[i][j] = separation_values[j]
-
-    return {
-        'p': p,
-        'freeze_time': freeze_time,
-        'planes': planes,
-        'separation_times': separation_times
-    }
+        tokens = file.read().split()
+    p, freeze_time = int(tokens[0]), int(tokens[1])
+
+    # Each plane is 6 fields followed by its row of the separation matrix
+    rows = np.array(tokens[2:2 + p * (6 + p)], dtype=np.float64).reshape(p, 6 + p)
+
+    return AirlandInstance(
+        num_planes=p,
+        freeze_time=freeze_time,
+        appearance=rows[:, 0].astype(np.int64),
+        earliest=rows[:, 1].astype(np.int64),
+        target=rows[:, 2].astype(np.int64),
+        latest=rows[:, 3].astype(np.int64),
+        penalty_early=rows[:, 4].copy(),
+        penalty_late=rows[:, 5].copy(),
+        separation=rows[:, 6:].astype(np.int32),
+    )
 
 def generate_separation_between_runways(num_planes, num_runways, separation_same_runway=None, default_between_runways=0):
-    separation_between_runways = [[0 for _ in range(num_planes)] for _ in range(num_planes)]
-
-    for i in range(num_planes):
-        for j in range(num_planes):
-            if i == j:
-                separation_between_runways[i][j] = 0
-            else:
-                if separation_same_runway:
-                    separation_between_runways[i][j] = default_between_runways
-                else:
-                    separation_between_runways[i][j] = default_between_runways
+    separation_between_runways = np.full((num_planes, num_planes), default_between_runways, dtype=np.int32)
+    np.fill_diagonal(separation_between_runways, 0)
 
     return separation_between_runways
 
 def save_solution(solver, variables, num_planes, data, solution_file, tag, dataset_name, num_runways=None, landing_times_override=None, fixed_runways = None):
 
+    if isinstance(data, AirlandInstance):
+        data = data.planes
+
     if landing_times_override is None:
         landing_time_vars = variables["landing_time"]
 
@@ -139,3 +221,23 @@ def save_solution(solver, variables, num_planes, data, solution_file, tag, datas
     with open(solution_file, "w") as f:
         json.dump(solutions, f, indent=4)
 
+
+def load_solution(solution_file, tag, dataset_name, num_runways=None):
+    """Last schedule stored by save_solution under tag for dataset_name (and
+    num_runways, if given) as (landing times, runways numbered from 0)."""
+    with open(solution_file, "r") as f:
+        solutions = json.load(f)
+
+    entries = [
+        entry for entry in solutions.get(tag, [])
+        if entry["file"] == dataset_name and (num_runways is None or entry.get("num_runways") == num_runways)
+    ]
+    if not entries:
+        raise KeyError(f"No solution for '{dataset_name}' under tag '{tag}'.")
+
+    landing_times = sorted(entries[-1]["landing_times"], key=lambda p: p["plane"])
+    times = [p["landing_time"] for p in landing_times]
+    # MIP/CP runways are stored from 0, the Hybrid's (fixed_runways) from 1
+    offset = 0 if tag.startswith(("MIP", "CP")) else 1
+    runways = [p["runway"] - offset if entries[-1].get("num_runways") else 0 for p in landing_times]
+    return times, runways
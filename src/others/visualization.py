@@ -1,58 +1,17 @@
 import json
 import os
 import ast
-from dataclasses import dataclass
 from typing import Any, Dict, List, Optional, Tuple
 
 from matplotlib.lines import Line2D
 import matplotlib.pyplot as plt
 
-
-# TXT parsing (Airland / ALP)
-@dataclass
-class PlaneWindow:
-    idx: int
-    appearance: float
-    earliest: float
-    target: float
-    latest: float
-    g: float
-    h: float
-
-
-@dataclass
-class AirlandInstance:
-    n: int
-    header2: int
-    planes: List[PlaneWindow]
-    sep: List[List[float]]
+from others.utils import AirlandInstance, read_airland_file
 
 
+# TXT parsing (Airland / ALP)
 def read_airland_txt(txt_path: str) -> AirlandInstance:
-    with open(txt_path, "r", encoding="utf-8") as f:
-        tokens = f.read().split()
-
-    pos = 0
-    n = int(tokens[pos]); pos += 1
-    header2 = int(tokens[pos]); pos += 1
-
-    planes: List[PlaneWindow] = []
-    sep = [[0.0 for _ in range(n)] for _ in range(n)]
-
-    for i in range(n):
-        appearance = float(tokens[pos]); pos += 1
-        earliest = float(tokens[pos]); pos += 1
-        target = float(tokens[pos]); pos += 1
-        latest = float(tokens[pos]); pos += 1
-        g = float(tokens[pos]); pos += 1
-        h = float(tokens[pos]); pos += 1
-
-        planes.append(PlaneWindow(i, appearance, earliest, target, latest, g, h))
-
-        for j in range(n):
-            sep[i][j] = float(tokens[pos]); pos += 1
-
-    return AirlandInstance(n=n, header2=header2, planes=planes, sep=sep)
+    return read_airland_file(txt_path)
 
 
 # Robust JSON loading
@@ -156,7 +115,7 @@ def build_runway_mapping(
             prev_p = planes[i - 1]
             p = planes[i]
             gap = landing_times[p] - landing_times[prev_p]
-            required = instance.sep[prev_p][p]
+            required = instance.separation[prev_p, p]
             if gap < required:
                 violations.append((prev_p, p))
 
@@ -243,9 +202,8 @@ def landing_color(t: float, target: float, eps: float = 1e-9) -> str:
 
 def compute_zoom_limits(instance: AirlandInstance, landing_times: Dict[int, float], pad: float = 25.0) -> Tuple[float, float]:
     xs: List[float] = []
-    for i in range(instance.n):
-        pw = instance.planes[i]
-        xs.append(pw.target)
+    for i in range(instance.num_planes):
+        xs.append(float(instance.target[i]))
         if i in landing_times:
             xs.append(landing_times[i])
 
@@ -313,25 +271,27 @@ def plot_landing_gantt_multi_runway(
 
     for p, t in landing_times.items():
         y = y_positions[p]
-        pw = instance.planes[p]
+        earliest = float(instance.earliest[p])
+        target = float(instance.target[p])
+        latest = float(instance.latest[p])
 
         ax.hlines(
             y=y,
-            xmin=pw.earliest,
-            xmax=pw.latest,
+            xmin=earliest,
+            xmax=latest,
             linewidth=7,
             alpha=0.35,
             zorder=1,
             color=WINDOW_COLOR,
         )
 
-        if abs(t - pw.target) > 1e-9:
-            seg_color = EARLY_SEG if t < pw.target else LATE_SEG
+        if abs(t - target) > 1e-9:
+            seg_color = EARLY_SEG if t < target else LATE_SEG
 
             ax.hlines(
                 y=y,
-                xmin=min(t, pw.target),
-                xmax=max(t, pw.target),
+                xmin=min(t, target),
+                xmax=max(t, target),
                 linewidth=7,
                 alpha=0.90,
                 zorder=2,
@@ -339,7 +299,7 @@ def plot_landing_gantt_multi_runway(
             )
 
             ax.scatter(
-                [pw.target], [y],
+                [target], [y],
                 marker="x",
                 s=80,
                 linewidths=2,
@@ -351,7 +311,7 @@ def plot_landing_gantt_multi_runway(
             [t], [y],
             marker=r"$✈$",
             s=240,
-            c=landing_color(t, pw.target),
+            c=landing_color(t, target),
             zorder=5,
         )
 
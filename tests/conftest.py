@@ -0,0 +1,64 @@
+import contextlib
+import io
+import os
+import sys
+
+import numpy as np
+import pytest
+
+# The modules import each other as `models.X` / `others.X`, relative to src/
+SRC = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+sys.path.insert(0, SRC)
+
+from models.Engines import schedule_cost, solve_with_engine  # noqa: E402
+from others.heuristic import is_feasible_schedule  # noqa: E402
+from others.utils import read_airland_file  # noqa: E402
+
+
+@pytest.fixture
+def airland():
+    # airland(k) reads src/data/airland{k}.txt
+    def load(dataset):
+        return read_airland_file(os.path.join(SRC, "data", f"airland{dataset}.txt"))
+    return load
+
+
+@pytest.fixture
+def small_instance(airland):
+    # small_instance(k, n): the first n planes of airland{k}, few enough for an exact reference
+    def load(dataset, num_planes=10):
+        return airland(dataset).subset(range(num_planes))
+    return load
+
+
+@pytest.fixture
+def no_separation():
+    # n x n between-runway matrix without separation
+    def make(instance):
+        return np.zeros((instance.num_planes, instance.num_planes), dtype=np.int32)
+    return make
+
+
+@pytest.fixture
+def optimum():
+    # Optimal cost from the MIP, the reference for every front-end
+    def solve(instance, num_runways=1, separation_between_runways=None):
+        with contextlib.redirect_stdout(io.StringIO()):
+            status, times, _ = solve_with_engine("mip", instance, num_runways, separation_between_runways)
+        assert status == "OPTIMAL"
+        return schedule_cost(instance, times)
+    return solve
+
+
+@pytest.fixture
+def check_schedule():
+    # Asserts that (times, runways) is feasible and costs cost; returns the cost
+    def check(instance, times, runways=None, separation_between_runways=None, cost=None):
+        assert times is not None
+        assert len(times) == instance.num_planes
+        assert is_feasible_schedule(instance, np.round(times), runways, separation_between_runways)
+        actual = schedule_cost(instance, times)
+        if cost is not None:
+            assert cost == pytest.approx(actual, abs=1e-6)
+        return actual
+    return check
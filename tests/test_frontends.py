@@ -0,0 +1,108 @@
+import contextlib
+import io
+
+import pytest
+
+from models.Decomposition import solve_decomposed
+from models.Engines import solve_with_engine
+from models.Incremental import apply_changes, reoptimize
+from models.LNS import solve_lns
+from models.LocalSearch import solve_local_search
+from models.Online import solve_online
+from models.Portfolio import solve_portfolio
+from others.heuristic import greedy_schedule
+
+
+# Every front-end on an instance small enough for the MIP reference: exact
+# ones must reach the optimum, heuristic ones a feasible schedule between
+# the optimum and their starting point.
+@pytest.mark.parametrize("engine", ["cp", "mip"])
+def test_solve_decomposed_reaches_the_optimum(small_instance, no_separation, check_schedule, optimum, engine):
+    instance = small_instance(3, 15)
+    between = no_separation(instance)
+    result = solve_decomposed(instance.num_planes, 2, instance, None, between, engine=engine, num_workers=1)
+    assert result.status == "OPTIMAL"
+    assert sorted(p for component in result.components for p in component.planes) == list(range(15))
+    cost = check_schedule(instance, result.times, result.runways, between, result.cost)
+    assert cost == pytest.approx(optimum(instance, 2, between), abs=1e-6)
+
+
+def test_reoptimize_after_a_target_change(small_instance, no_separation, check_schedule, optimum):
+    instance = small_instance(2, 15)
+    between = no_separation(instance)
+    with contextlib.redirect_stdout(io.StringIO()):
+        _, times, runways = solve_with_engine("cp", instance, 2, between)
+    plane = 5
+    changed = apply_changes(instance, {plane: {"target": int(instance.latest[plane])}})
+    assert changed.target[plane] == instance.latest[plane]
+    assert instance.target[plane] != changed.target[plane]
+    best = optimum(changed, 2, between)
+
+    fixed = reoptimize(15, 2, changed, None, between, (times, runways), [plane], keep="fix")
+    assert plane in fixed.neighborhood
+    assert check_schedule(changed, fixed.times, fixed.runways, between, fixed.cost) >= best - 1e-6
+
+    hinted = reoptimize(15, 2, changed, None, between, (times, runways), [plane], keep="hint")
+    assert hinted.status == "OPTIMAL"
+    assert check_schedule(changed, hinted.times, hinted.runways, between, hinted.cost) == pytest.approx(best, abs=1e-6)
+
+    with pytest.raises(ValueError):
+        apply_changes(instance, {plane: {"speed": 1}})
+
+
+def test_solve_lns_improves_the_heuristic(small_instance, no_separation, check_schedule, optimum):
+    instance = small_instance(3, 20)
+    between = no_separation(instance)
+    times, runways, greedy_cost = greedy_schedule(instance, 2, between)
+    result = solve_lns(20, 2, instance, None, between, time_budget=3, step_time_limit=1, neighborhood_size=8,
+                       num_workers=1, initial_solution=(times.tolist(), runways.tolist()))
+    cost = check_schedule(instance, result.times, result.runways, between, result.cost)
+    assert optimum(instance, 2, between) - 1e-6 <= cost <= greedy_cost + 1e-6
+
+
+@pytest.mark.parametrize("method", ["annealing", "tabu"])
+@pytest.mark.parametrize("num_runways", [1, 2])
+def test_solve_local_search_improves_the_heuristic(small_instance, no_separation, check_schedule, optimum, method,
+                                                   num_runways):
+    instance = small_instance(3, 20)
+    between = no_separation(instance) if num_runways > 1 else None
+    greedy_cost = greedy_schedule(instance, num_runways, between)[2]
+    result = solve_local_search(20, num_runways, instance, None, between, method=method, time_budget=1)
+    assert result.status == "FEASIBLE"
+    cost = check_schedule(instance, result.times, result.runways, between, result.cost)
+    assert optimum(instance, num_runways, between) - 1e-6 <= cost <= greedy_cost + 1e-6
+
+
+@pytest.mark.parametrize("method", ["annealing", "tabu"])
+def test_solve_local_search_with_one_plane(small_instance, check_schedule, method):
+    # No move exists: the initial schedule comes back at once
+    instance = small_instance(1, 1)
+    result = solve_local_search(1, 1, instance, None, method=method, time_budget=30)
+    assert result.iterations == 0
+    assert result.wall_time < 5
+    assert check_schedule(instance, result.times, result.runways, cost=result.cost) == 0
+
+    with pytest.raises(ValueError):
+        solve_local_search(1, 1, instance, None, moves=("runway",), time_budget=1)
+
+
+def test_solve_online_against_the_offline_optimum(small_instance, no_separation, check_schedule, optimum):
+    instance = small_instance(1)
+    between = no_separation(instance)
+    result = solve_online(10, 2, instance, None, between, engine="cp")
+    assert result.offline_status == "OPTIMAL"
+    assert result.offline_cost == pytest.approx(optimum(instance, 2, between), abs=1e-6)
+    assert len(result.events) > 0
+    cost = check_schedule(instance, result.times, result.runways, between, result.cost)
+    assert cost >= result.offline_cost - 1e-6
+
+
+def test_solve_portfolio_reaches_the_optimum(small_instance, no_separation, check_schedule, optimum):
+    instance = small_instance(2, 15)
+    between = no_separation(instance)
+    members = (("mip", "mip", {}), ("cp", "cp", {}))
+    result = solve_portfolio(instance, 2, 60, between, members=members)
+    assert result.status == "OPTIMAL"
+    assert result.winner is not None
+    cost = check_schedule(instance, result.times, result.runways, between, result.cost)
+    assert cost == pytest.approx(optimum(instance, 2, between), abs=1e-6)
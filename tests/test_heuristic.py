@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+
+from others.heuristic import greedy_schedule, is_feasible_schedule
+
+
+@pytest.mark.parametrize("dataset", [1, 3, 8])
+@pytest.mark.parametrize("num_runways,between_runways", [(1, 0), (2, 0), (2, 20), (3, 0)])
+def test_greedy_schedule_is_feasible(airland, check_schedule, dataset, num_runways, between_runways):
+    instance = airland(dataset)
+    n = instance.num_planes
+    between = np.full((n, n), between_runways, dtype=np.int32) if num_runways > 1 else None
+    times, runways, cost = greedy_schedule(instance, num_runways, between)
+    assert runways.min() >= 0 and runways.max() < num_runways
+    check_schedule(instance, times, runways, between, cost)
+
+
+def test_greedy_schedule_bounds_the_optimum(small_instance, no_separation, check_schedule, optimum):
+    instance = small_instance(2, 15)
+    between = no_separation(instance)
+    times, runways, cost = greedy_schedule(instance, 2, between)
+    assert check_schedule(instance, times, runways, between, cost) >= optimum(instance, 2, between) - 1e-6
+
+
+def test_is_feasible_schedule_rejects_violations(airland, no_separation):
+    instance = airland(1)
+    times, runways, _ = greedy_schedule(instance, 2)
+    between = no_separation(instance)
+    assert is_feasible_schedule(instance, times, runways, between)
+
+    # Outside a window
+    late = times.copy()
+    late[0] = instance.latest[0] + 1
+    assert not is_feasible_schedule(instance, late, runways, between)
+
+    # Two planes of one runway at the same time
+    planes = np.flatnonzero(runways == runways[0])
+    assert len(planes) > 1
+    clash = times.copy()
+    clash[planes[1]] = clash[planes[0]]
+    assert not is_feasible_schedule(instance, clash, runways, between)
+
+    # Planes on different runways only clash through the between-runway separation
+    assert len(np.unique(runways)) > 1
+    assert not is_feasible_schedule(instance, times, runways, between + 99999)
@@ -0,0 +1,21 @@
+import pytest
+
+from models.Hybrid import solve_hybrid_lbbd
+
+
+def solve_hybrid(instance, num_runways, between, **options):
+    _, _, runways, times, metrics = solve_hybrid_lbbd(instance.num_planes, num_runways, instance, None, between,
+                                                      performance=True, **options)
+    return [rw - 1 for rw in runways], times, metrics
+
+
+def test_hybrid_caches_do_not_leak_between_instances(small_instance, no_separation, check_schedule, optimum):
+    # Two different instances with the same plane numbering, solved one after
+    # the other in the same process, each reach their own optimum
+    for dataset in (1, 2, 1):
+        instance = small_instance(dataset)
+        between = no_separation(instance)
+        runways, times, metrics = solve_hybrid(instance, 2, between)
+        assert metrics["converged"]
+        cost = check_schedule(instance, times, runways, between)
+        assert cost == pytest.approx(optimum(instance, 2, between), abs=1e-6)
@@ -0,0 +1,73 @@
+import contextlib
+import io
+
+import numpy as np
+import pytest
+
+from models.Engines import schedule_cost, solve_with_engine
+from others.components import conflict_components
+from others.pairs import classify_pairs
+from others.presolve import presolve_windows
+
+
+def dense_pairs(instance, between=None):
+    # Reference classification over every pair, ordered by earliest time
+    E, L, S = instance.earliest, instance.latest, instance.separation.astype(np.int64)
+    if between is not None:
+        S = np.maximum(S, between)
+    V, U = [], []
+    for i in range(instance.num_planes):
+        for j in range(i + 1, instance.num_planes):
+            a, b = (i, j) if E[i] <= E[j] else (j, i)
+            if E[b] <= L[a]:
+                U.append((i, j))
+            elif L[a] + S[a, b] > E[b]:
+                V.append((a, b))
+    return sorted(V), sorted(U)
+
+
+@pytest.mark.parametrize("dataset", [1, 3, 8])
+@pytest.mark.parametrize("between_runways", [None, 0, 20])
+def test_classify_pairs_matches_dense_enumeration(airland, dataset, between_runways):
+    instance = airland(dataset)
+    n = instance.num_planes
+    between = None if between_runways is None else np.full((n, n), between_runways, dtype=np.int32)
+    pairs = classify_pairs(instance, between)
+    V, U = dense_pairs(instance, between)
+    assert [tuple(p) for p in pairs.V.tolist()] == V
+    assert [tuple(p) for p in pairs.U.tolist()] == U
+
+
+@pytest.mark.parametrize("dataset,num_planes,num_runways", [(1, 10, 1), (2, 15, 1), (3, 15, 2)])
+def test_presolve_windows_keep_the_optimum(small_instance, no_separation, optimum, dataset, num_planes, num_runways):
+    instance = small_instance(dataset, num_planes)
+    between = no_separation(instance) if num_runways > 1 else None
+    windows = presolve_windows(instance, between)
+    assert not windows.infeasible
+    assert np.all(windows.earliest >= instance.earliest)
+    assert np.all(windows.latest <= instance.latest)
+    assert np.all(windows.earliest <= windows.latest)
+
+    # The tightened windows cut off no optimal schedule
+    with contextlib.redirect_stdout(io.StringIO()):
+        status, times, _ = solve_with_engine("mip", instance, num_runways, between, presolve=False)
+    assert status == "OPTIMAL"
+    assert optimum(instance, num_runways, between) == pytest.approx(schedule_cost(instance, times), abs=1e-6)
+
+
+@pytest.mark.parametrize("dataset", [1, 3, 8])
+def test_conflict_components_partition_the_planes(airland, dataset):
+    instance = airland(dataset)
+    components, windows = conflict_components(instance)
+    planes = np.sort(np.concatenate(components))
+    assert planes.tolist() == list(range(instance.num_planes))
+
+    # No V or U pair links two components
+    label = np.empty(instance.num_planes, dtype=np.int64)
+    for k, component in enumerate(components):
+        label[component] = k
+    for pairs in (windows.pairs.V, windows.pairs.U):
+        assert np.all(label[pairs[:, 0]] == label[pairs[:, 1]])
+
+    firsts = [int(windows.earliest[component].min()) for component in components]
+    assert firsts == sorted(firsts)
@@ -0,0 +1,23 @@
+import pytest
+from ortools.sat.python import cp_model
+
+from others.scaling import scale_objective, set_objective_scaling
+
+
+def test_set_objective_scaling_reports_original_units(small_instance):
+    # airland9 penalties carry decimals
+    instance = small_instance(9)
+    scale = scale_objective(instance)
+    assert scale.factor > 1
+    assert scale.penalty_early == pytest.approx(instance.penalty_early * scale.factor)
+
+    model = cp_model.CpModel()
+    deviation = [model.NewIntVar(i + 1, 20, f"d_{i}") for i in range(instance.num_planes)]
+    model.Minimize(sum(int(scale.penalty_early[i]) * deviation[i] for i in range(instance.num_planes)))
+    set_objective_scaling(model, scale)
+    solver = cp_model.CpSolver()
+    assert solver.Solve(model) == cp_model.OPTIMAL
+
+    expected = sum(float(instance.penalty_early[i]) * (i + 1) for i in range(instance.num_planes))
+    assert solver.ObjectiveValue() == pytest.approx(expected, abs=1e-6)
+    assert solver.BestObjectiveBound() == pytest.approx(expected, abs=1e-6)
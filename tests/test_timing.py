@@ -0,0 +1,87 @@
+import numpy as np
+import pytest
+from ortools.linear_solver import pywraplp
+
+from models.Hybrid import SubproblemLP, SubproblemTiming, calculate_sets
+from others.timing import chain_timing
+from others.utils import generate_separation_between_runways
+
+
+def glop_chain(E, T, L, penalty_early, penalty_late, gaps):
+    # Reference LP for one chain: (status, cost)
+    solver = pywraplp.Solver.CreateSolver("GLOP")
+    k = len(E)
+    x = [solver.NumVar(float(E[m]), float(L[m]), f"x_{m}") for m in range(k)]
+    alpha = [solver.NumVar(0, solver.infinity(), f"alpha_{m}") for m in range(k)]
+    beta = [solver.NumVar(0, solver.infinity(), f"beta_{m}") for m in range(k)]
+    for m in range(k):
+        solver.Add(x[m] + alpha[m] - beta[m] == float(T[m]))
+    for m in range(k - 1):
+        solver.Add(x[m + 1] - x[m] >= float(gaps[m]))
+    solver.Minimize(sum(float(penalty_early[m]) * alpha[m] + float(penalty_late[m]) * beta[m] for m in range(k)))
+    status = solver.Solve()
+    if status == pywraplp.Solver.INFEASIBLE:
+        return "INFEASIBLE", None
+    assert status == pywraplp.Solver.OPTIMAL
+    return "OPTIMAL", solver.Objective().Value()
+
+
+def random_chain(rng, k):
+    E = np.sort(rng.integers(0, 10 * k, size=k))
+    L = E + rng.integers(0, 40, size=k)
+    T = E + rng.integers(0, L - E + 1)
+    # Some planes pay nothing on one side, as in the airland files
+    penalty_early = rng.integers(0, 5, size=k) * rng.random(size=k)
+    penalty_late = rng.integers(0, 5, size=k) * rng.random(size=k)
+    gaps = rng.integers(0, 15, size=max(k - 1, 0))
+    return E, T, L, penalty_early, penalty_late, gaps
+
+
+@pytest.mark.parametrize("seed", range(200))
+def test_chain_timing_matches_glop(seed):
+    rng = np.random.default_rng(seed)
+    E, T, L, penalty_early, penalty_late, gaps = random_chain(rng, int(rng.integers(1, 25)))
+    status, cost = glop_chain(E, T, L, penalty_early, penalty_late, gaps)
+
+    x = chain_timing(E, T, L, penalty_early, penalty_late, gaps)
+    if status == "INFEASIBLE":
+        assert x is None
+        return
+    assert x is not None
+    assert np.all(x >= E) and np.all(x <= L)
+    assert np.all(np.diff(x) >= gaps)
+    timing_cost = float(np.dot(penalty_early, np.maximum(T - x, 0)) + np.dot(penalty_late, np.maximum(x - T, 0)))
+    assert timing_cost == pytest.approx(cost, abs=1e-6)
+
+
+def random_assignment(rng, windows, U, num_runways):
+    # Landing times drawn in the (presolved) windows order every V/W pair as
+    # the windows do; the U pairs take that order too
+    times = rng.integers(windows.earliest, windows.latest + 1)
+    fixed_before = {(i, j): int(times[i] < times[j] or (times[i] == times[j] and i < j)) for i, j in U}
+    fixed_runways = rng.integers(1, num_runways + 1, size=len(times)).tolist()
+    return fixed_runways, fixed_before
+
+
+# airland8's separations break the triangle inequality, so the timing
+# routine has to notice the violated rows and hand those cases to the LP
+@pytest.mark.parametrize("dataset", [3, 8])
+@pytest.mark.parametrize("num_runways,between_runways", [(1, 0), (2, 0), (2, 3), (3, 0)])
+def test_subproblem_timing_matches_lp(airland, dataset, num_runways, between_runways):
+    instance = airland(dataset)
+    n = instance.num_planes
+    between = generate_separation_between_runways(n, num_runways, default_between_runways=between_runways)
+    V, U, windows = calculate_sets(n, instance, None, between)
+    lp = SubproblemLP(n, instance, None, between, V, U, windows.earliest, windows.latest)
+    timing = SubproblemTiming(n, instance, None, between, V, U, windows.earliest, windows.latest)
+
+    rng = np.random.default_rng(dataset * 100 + num_runways * 10 + between_runways)
+    for _ in range(30):
+        fixed_runways, fixed_before = random_assignment(rng, windows, U, num_runways)
+        lp_status, lp_cost, _ = lp.solve(fixed_runways, fixed_before)
+        status, cost, times = timing.solve(fixed_runways, fixed_before)
+        assert status == lp_status
+        if status == "OPTIMAL":
+            assert cost == pytest.approx(lp_cost, rel=1e-9, abs=1e-6)
+            assert np.all(np.asarray(times) >= windows.earliest - 1e-6)
+            assert np.all(np.asarray(times) <= windows.latest + 1e-6)